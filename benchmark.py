@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Dieses Modul `benchmark` misst die Laufzeit der wichtigsten Rechenwege der Simulation.
+
+Gemessen werden:
+- World.update_odor_world (Neuaufbau und Umsetzen eines Futters) bei verschiedenen Welt-/Futtergrößen
+- Ein kompletter Simulationsschritt (World.update) mit 10 bis 10000 Ameisen je Strategie
+- Brain.q_learning_calculate, monte_carlo_calculate, perzeptron_calculate, policy_network_calculate
+- Laden und Speichern der Brain-CSV-Dateien
+- Bild-Export ohne Bildschirm (view.FrameExporter), mit Prüfung des geschriebenen PNG
+
+Die Ergebnisse (Ticks/s bzw. Operationen/s und Latenzen je Operation) werden als JSON
+gespeichert und können mit einem früheren Lauf verglichen werden, um Rückschritte zu finden.
+
+Aufruf:
+    python benchmark.py --out bench.json
+    python benchmark.py --quick --compare bench.json     # Rückgabewert 1 bei Rückschritt
+
+Autor: Artur Lamparter <arturlamparter@web.de>
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import model
+import runner
+
+view = model.LazyModule("view")     # Nur für die Messgruppe "frames" (pygame, tkinter)
+
+STRATEGIES = [("random", "Keine"), ("odor", "Keine"), ("brain", "Monte-Carlo"),
+              ("brain", "Q-Learning"), ("brain", "Perzeptron"), ("brain", "Policy-Network")]
+ANT_COUNTS = [10, 100, 1000, 10000]
+ODOR_SIZES = [(100, 100, 100), (500, 500, 300), (2000, 2000, 300), (10000, 10000, 300)]  # (Breite, Höhe, Futter)
+
+
+class Benchmark:
+    """
+    Führt die Messungen aus und sammelt die Ergebnisse.
+
+    Jede Messung wiederholt eine Operation, bis `repeat` Durchläufe erreicht sind oder
+    das Zeitbudget `budget` (Sekunden) aufgebraucht ist (mindestens ein Durchlauf).
+    """
+    def __init__(self, budget=2.0, repeat=1000, ant_counts=None, odor_sizes=None, strategies=None):
+        self.budget = budget
+        self.repeat = repeat
+        self.ant_counts = ant_counts or ANT_COUNTS
+        self.odor_sizes = odor_sizes or ODOR_SIZES
+        self.strategies = strategies or STRATEGIES
+        self.results = []
+
+    def measure(self, name, func, params=None, setup=None, teardown=None):
+        """
+        Misst `func` mehrfach einzeln und speichert Durchsatz und Latenzen.
+
+        Args:
+            name (str): Name der Messung.
+            func: Zu messende Operation (ohne Argumente).
+            params (dict): Parameter der Messung (für Bericht und Vergleich).
+            setup: Wird vor jedem Durchlauf ungemessen aufgerufen.
+            teardown: Wird nach jedem Durchlauf ungemessen aufgerufen.
+        """
+        if setup: setup()                                      # Aufwärmen (z.B. verzögerte Importe)
+        func()
+        if teardown: teardown()
+        latencies = []
+        start = time.perf_counter()
+        while len(latencies) < self.repeat and (not latencies or time.perf_counter() - start < self.budget):
+            if setup: setup()
+            t0 = time.perf_counter()
+            func()
+            latencies.append(time.perf_counter() - t0)
+            if teardown: teardown()
+        latencies = np.array(latencies) * 1e6                  # Mikrosekunden
+        result = {"name": name,
+                  "params": params or {},
+                  "runs": int(latencies.size),
+                  "ops_per_sec": round(1e6 / latencies.mean(), 2),
+                  "latency_us_mean": round(float(latencies.mean()), 2),
+                  "latency_us_p50": round(float(np.percentile(latencies, 50)), 2),
+                  "latency_us_p95": round(float(np.percentile(latencies, 95)), 2)}
+        self.results.append(result)
+        print(f"{self.key(result):<70} {result['ops_per_sec']:>12.2f} /s  "
+              f"p50 {result['latency_us_p50']:>12.1f} us  p95 {result['latency_us_p95']:>12.1f} us")
+        return result
+
+    @staticmethod
+    def key(result):
+        """Eindeutiger Name einer Messung inklusive Parameter."""
+        params = ",".join(f"{k}={v}" for k, v in sorted(result["params"].items()))
+        return f"{result['name']}[{params}]"
+
+    @staticmethod
+    def seed(seed=0):
+        random.seed(seed)
+        np.random.seed(seed)
+
+    def bench_odor(self):
+        """World.update_odor_world: Neuaufbau des Geruchsfeldes und Umsetzen eines Futters."""
+        for width, height, foods in self.odor_sizes:
+            self.seed()
+            world = model.World(grid_width=width, grid_height=height)
+            world.foods.generate_food(foods)
+            params = {"width": width, "height": height, "foods": foods}
+
+            def rebuild():
+                world.world_array = world.create_grid(world.world_array.dtype, 0)
+                world.state_array = world.create_grid(np.uint8, model.STATE_NEUTRAL)
+                world.odor_foods.clear()
+                world.update_odor_world()
+            self.measure("update_odor_world.rebuild", rebuild, params)
+
+            foods_list = list(world.foods)
+            self.measure("update_odor_world.move_food", world.update_odor_world, params,
+                         setup=lambda: random.choice(foods_list).set_new_position(width, height))
+
+    def bench_tick(self):
+        """Kompletter Simulationsschritt (wie PyGameController.update) je Strategie und Ameisenanzahl."""
+        for strategy, machine_learning in self.strategies:
+            for ants in self.ant_counts:
+                headless = runner.HeadlessRunner({"ANTS": ants, "FOODS": 100, "ANT_STRATEGY": strategy,
+                                                  "ANT_MACHINE_LEARNING": machine_learning, "CSV_LOAD": 1})
+                result = self.measure("tick", headless.world.update,
+                                      {"ants": ants, "strategy": strategy, "ml": machine_learning})
+                result["ticks_per_sec"] = result["ops_per_sec"]
+                result["ant_moves_per_sec"] = round(result["ops_per_sec"] * ants, 2)
+
+    def bench_brain(self):
+        """Lernberechnungen der einzelnen Brain-Verfahren (eine Aktualisierung je Durchlauf)."""
+        states = model.STATES
+
+        def brain(machine_learning):
+            self.seed()
+            return model.Brain("000", "brain", ant_machine_learning=machine_learning, csv_load=True)
+
+        q = brain("Q-Learning")
+        self.measure("q_learning_calculate",
+                     lambda: q.q_learning_calculate(random.choice(states), random.choice(model.ACTIONS),
+                                                    -0.2, random.choice(states)),
+                     teardown=q.log_collector.add_new_period)
+
+        mc = brain("Monte-Carlo")
+        for length in (10, 100):
+            def fill(length=length):
+                mc.episode = [(random.choice(states), random.choice(model.ACTIONS), -0.2) for _ in range(length)]
+            self.measure("monte_carlo_calculate", mc.monte_carlo_calculate, {"episode": length}, setup=fill)
+
+        p = brain("Perzeptron")
+        self.measure("perzeptron_calculate",
+                     lambda: p.perzeptron_calculate(random.choice(states), random.choice(model.ACTIONS), 0),
+                     teardown=p.log_collector.add_new_period)
+
+        pn = brain("Policy-Network")
+        self.measure("policy_network_calculate",
+                     lambda: pn.policy_network_calculate(random.choice(states), random.randrange(4), -0.0001),
+                     teardown=pn.log_collector.add_new_period)
+
+    def bench_csv(self):
+        """Laden und Speichern der Brain-Daten (CSV) in einem temporären Verzeichnis."""
+        folder = tempfile.mkdtemp(prefix="ant_bench_")
+        try:
+            for machine_learning in ("Q-Learning", "Monte-Carlo", "Perzeptron"):
+                brain = model.Brain("000", "brain", ant_machine_learning=machine_learning, csv_load=True)
+                file = os.path.join(folder, os.path.basename(brain.data_file))
+                self.measure("brain_csv_save", lambda: brain.save_brain_data(file), {"ml": machine_learning})
+                self.measure("brain_csv_load", lambda: brain.load_brain_data(file), {"ml": machine_learning})
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    def bench_frames(self):
+        """Bild-Export: Zeichnen und Kopieren im Simulations-Thread, PNG schreiben (Schreib-Thread)."""
+        folder = tempfile.mkdtemp(prefix="ant_bench_")
+        try:
+            self.seed()
+            headless = runner.HeadlessRunner({"ANTS": 100, "FOODS": 100})
+            window = view.PyGameWindow(headless.world, offscreen=True)
+            size = window.screen.get_size()
+            params = {"width": size[0], "height": size[1]}
+            pixels = []
+            self.measure("frame_capture", lambda: pixels.append(view.pygame.image.tobytes(window.screen, "RGBA")),
+                         params, setup=window.render, teardown=pixels.clear)
+            window.render()
+            pixels = view.pygame.image.tobytes(window.screen, "RGBA")
+            file = os.path.join(folder, "frame.png")
+            self.measure("frame_write_png", lambda: view.FrameExporter.write_png(file, pixels, size), params)
+            check_frame(file, window.world.get_screen_color())
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    def run(self, groups=None):
+        """
+        Führt die gewählten Messgruppen aus ("odor", "tick", "brain", "csv", "frames").
+        """
+        for group in groups or ["odor", "brain", "csv", "frames", "tick"]:
+            getattr(self, f"bench_{group}")()
+        return self.results
+
+
+def check_frame(file, background):
+    """
+    Prüft ein exportiertes Bild: Alle Pixel deckend und nicht nur Hintergrund (Ameisen/Futter sichtbar).
+
+    Raises:
+        RuntimeError: Wenn das Bild durchsichtig ist oder nur aus Hintergrund besteht.
+    """
+    image = view.pygame.image.load(file)
+    alpha = view.pygame.surfarray.array_alpha(image)
+    if (alpha != 255).any():
+        raise RuntimeError(f"{file}: {int((alpha != 255).sum())} Pixel nicht deckend")
+    rgb = view.pygame.surfarray.array3d(image)
+    if (rgb == tuple(view.pygame.Color(background))[:3]).all(axis=2).all():
+        raise RuntimeError(f"{file}: Nur Hintergrund, keine Ameisen oder Futter")
+
+
+def meta():
+    """Angaben zur Umgebung, damit Ergebnisse verschiedener Commits vergleichbar sind."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"commit": commit, "time": time.strftime("%Y-%m-%d %H:%M:%S"), "python": platform.python_version(),
+            "numpy": np.__version__, "platform": platform.platform()}
+
+
+def compare(results, baseline_file, tolerance):
+    """
+    Vergleicht Ergebnisse mit einem früheren Lauf.
+
+    Returns:
+        bool: True, wenn keine Messung um mehr als `tolerance` (Anteil) langsamer ist.
+    """
+    with open(baseline_file, "r", encoding="utf-8") as file:
+        baseline = {Benchmark.key(r): r for r in json.load(file)["results"]}
+    ok = True
+    print(f"\nVergleich mit {baseline_file} (Toleranz {tolerance:.0%}):")
+    for result in results:
+        old = baseline.get(Benchmark.key(result))
+        if old is None: continue
+        ratio = result["ops_per_sec"] / old["ops_per_sec"]
+        status = "RÜCKSCHRITT" if ratio < 1 - tolerance else ""
+        if status: ok = False
+        print(f"{Benchmark.key(result):<70} {ratio:>7.2f}x {status}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark der Ameisen-Simulation")
+    parser.add_argument("groups", nargs="*", help="Messgruppen: odor, tick, brain, csv, frames (Standard: alle)")
+    parser.add_argument("--quick", action="store_true", help="Kleinere Größen und kürzere Messzeit")
+    parser.add_argument("--budget", type=float, default=None, help="Zeitbudget je Messung in Sekunden")
+    parser.add_argument("--out", default="bench.json", help="Ergebnisdatei (JSON)")
+    parser.add_argument("--compare", default=None, help="Frühere Ergebnisdatei zum Vergleich")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Erlaubte Verlangsamung (Anteil)")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)                # Lademeldungen würden die Messung stören
+    if args.quick:
+        bench = Benchmark(budget=args.budget or 0.5, repeat=200, ant_counts=ANT_COUNTS[:3], odor_sizes=ODOR_SIZES[:2])
+    else:
+        bench = Benchmark(budget=args.budget or 2.0)
+    results = bench.run(args.groups)
+    with open(args.out, "w", encoding="utf-8") as file:
+        json.dump({"meta": meta(), "results": results}, file, indent=2)
+    print(f"Ergebnisse gespeichert in {args.out}")
+    if args.compare and not compare(results, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,10 +10,12 @@ import threading
 
 import pygame
 
-import main
 import view
 import model
 
+PROFILER_DUMP_FILE = "profiler.json"     # Ziel für F8 bzw. "Speichern" im Profiler-Fenster
+ANT_PICKER_LIMIT = 50                    # Höchstens so viele Einträge in der Ameisenauswahl
+
 class PyGameController:
     """
     Steuert die PyGame-Ansicht in einem separaten Thread und synchronisiert
@@ -40,6 +42,9 @@ class PyGameController:
         self.game_view = None                           # Hier Läuft die Matrix im PyGameFenster
         self.running = False                            # Beenden von PyGameFenster durch "False"
         self.clock = pygame.time.Clock()                # Objekt zum Zeit verzögern
+        self.autosaver = model.BrainAutosaver(world)    # Speichert Gehirne regelmäßig im Hintergrund
+        self.metrics = model.MetricsRecorder(world)     # Kennzahlen je Tick (METRICS_FILE, "" = aus)
+        self.trajectory = model.TrajectoryRecorder(world)   # Bewegungen für die Wiedergabe (TRAJECTORY_FILE)
 
     def start_daemon(self):             # Pygame in Neben-Thread wird hier gestartet
         """
@@ -56,7 +61,13 @@ class PyGameController:
         """
         pygame.init()      # Initialisiert alle benötigten Pygame-Module (Fenster, Grafik, Eingabe ...).
         self.game_view = view.PyGameWindow(self.world)    # Hier Läuft die Matrix im PyGameFenster
+        self.autosaver.start()                  # Hintergrund-Thread zum Speichern
+        self.metrics.start()
+        self.trajectory.start()
         self.loop()                             # Hauptschleife
+        self.trajectory.stop()
+        self.metrics.stop()                     # Angefangener Block wird noch geschrieben
+        self.autosaver.stop()                   # Letzter Stand wird noch gespeichert
         pygame.quit()                           # Beendet alle Pygame-Module ordentlich.
 
     def loop(self):
@@ -64,26 +75,45 @@ class PyGameController:
         Die Hauptschleife, die Events verarbeitet, die Welt aktualisiert
         und die Darstellung rendert, solange `self.running` True ist.
         """
+        profiler = model.profiler
         while self.running:
-            self.handle_events()
+            profiler.begin_tick()                       # Phasenzeiten messen
+            with profiler.phase("events"):
+                self.handle_events()
             if not self.world.world_pause:              # Pause
                 self.update()
-                self.game_view.render()
+                with profiler.phase("metrics"):
+                    self.metrics.record()
+                    self.trajectory.record()
+                with profiler.phase("render"):
+                    self.game_view.render()
+                with profiler.phase("autosave"):
+                    self.autosaver.tick()               # Nur Kopie, Schreiben im Hintergrund
 
             if self.world.step:                         # Schritt
                 self.world.step = False
                 self.world.world_pause = True
 
-            self.clock.tick(self.world.clock_tick)  # Nur 10 Bilder pro Sekunde
+            with profiler.phase("sleep"):
+                self.clock.tick(self.world.clock_tick)  # Nur 10 Bilder pro Sekunde
+            profiler.end_tick()
 
     def handle_events(self):
         """
         Verarbeitet eingehende PyGame-Events, wie z.B. das Schließen
         des Fensters und setzt `self.running` entsprechend.
+        F9 zeichnet die nächsten Ticks mit cProfile auf, F8 speichert die Profiler-Daten.
+        Maus und W/A/S/D, +/-, 0 steuern die Kamera (PyGameWindow.handle_camera_event).
         """
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F9:
+                model.profiler.request_profile()        # cProfile der nächsten Ticks
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F8:
+                model.profiler.dump(PROFILER_DUMP_FILE) # Profiler-Tabelle speichern
+            else:
+                self.game_view.handle_camera_event(event)   # Zoom, Verschieben
 
     def update(self):
         """
@@ -91,25 +121,9 @@ class PyGameController:
         mit Futter, aktualisiert die Geruchswelt und synchronisiert
         die UI mit der aktuellen Ameisenanzahl.
         """
-        for ant in self.world.ants:
-            # if ant.orka <= 0:                                               # Nach bedarf: Ameisen können sterben
-            #     # del self.world.ants[self.world.ants.index(ant)]           # Entferne Ameise
-            # else:
-            if not ant.out_of_action: ant.move()                                                      # Bewege Ameise
-            for food in self.world.foods:                                   # Gehe Foods durch
-                if food.get_position() == ant.get_position():               # Ameise hat Futter gefunden
-                    ant.orka += food.calories         # Nach bedarf: Ameisen erhalten Energie vom Futter
-                    ant.food_found += 1                                     # Futter gefunden Zähler
-                    if self.world.foods.set_food >= len(self.world.foods):  # Wenn Futter gebraucht wird
-                        food.set_new_position()                             # Setze Food an neue Position
-                    else:
-                        del self.world.foods[self.world.foods.index(food)]  # Oder entferne es
-            if ant.orka <= 0:
-                ant.out_of_action = True
-            else:
-                ant.orka -= 1
-            self.world.update_odor_world()                          # Aktualisiere Geruchsmatrix
-        self.update_ant()                                                   # Updates Ant bezogen
+        self.world.update()                                                 # Simulationsschritt
+        with model.profiler.phase("tk"):
+            self.update_ant()                                               # Updates Ant bezogen
 
     def update_ant(self):
         """
@@ -117,6 +131,72 @@ class PyGameController:
         """
         self.settings_controller.tk_settings_window.update_ants_label(len(self.world.ants)) # Setze die Ameisenanzahl im Tk Settings
 
+class ReplayController:
+    """
+    Spielt eine Aufzeichnung des model.TrajectoryRecorder im PyGame-Fenster ab, ohne zu simulieren.
+
+    Tasten: Leertaste Pause, Links/Rechts Richtung (in der Pause ein Tick), Hoch/Runter Geschwindigkeit
+    (Ticks je Bild verdoppeln/halbieren), Bild hoch/runter 1000 Ticks springen, Pos1/Ende Anfang/Ende.
+    Kamera wie im Simulationsfenster (Mausrad, Ziehen, W/A/S/D, +/-, 0).
+    """
+    FPS = 60                                    # Bilder pro Sekunde
+    JUMP_TICKS = 1000
+
+    def __init__(self, file):
+        self.reader = model.TrajectoryReader(file)
+        self.game_view = None
+        self.running = False
+        self.paused = False
+        self.index = 0                          # Aktueller Frame
+        self.speed = 1                          # Ticks je Bild
+        self.direction = 1                      # 1 vorwärts, -1 rückwärts
+        self.clock = pygame.time.Clock()
+
+    def run(self):
+        pygame.init()
+        self.game_view = view.PyGameWindow(self.reader.world())
+        self.running = True
+        last = len(self.reader) - 1
+        while self.running and last >= 0:
+            self.handle_events()
+            if not self.paused:
+                self.seek(self.index + self.direction * self.speed)
+                if self.index in (0, last): self.paused = True      # Am Anfang bzw. Ende anhalten
+            state = "Pause" if self.paused else f"{self.direction * self.speed:+d} Ticks/Bild"
+            self.game_view.render_frame(self.reader.frame(self.index),
+                                        f"Wiedergabe {self.reader.file}: Tick {self.reader.ticks[self.index]} "
+                                        f"({self.index + 1}/{last + 1}) {state}")
+            self.clock.tick(self.FPS)
+        pygame.quit()
+
+    def seek(self, index):
+        self.index = max(0, min(index, len(self.reader) - 1))
+
+    def handle_events(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif self.game_view.handle_camera_event(event):
+                pass
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    self.paused = not self.paused
+                elif event.key in (pygame.K_RIGHT, pygame.K_LEFT):
+                    self.direction = 1 if event.key == pygame.K_RIGHT else -1
+                    if self.paused: self.seek(self.index + self.direction)     # Einzelschritt
+                elif event.key == pygame.K_UP:
+                    self.speed = min(self.speed * 2, 4096)
+                elif event.key == pygame.K_DOWN:
+                    self.speed = max(self.speed // 2, 1)
+                elif event.key == pygame.K_PAGEUP:
+                    self.seek(self.index + self.JUMP_TICKS)
+                elif event.key == pygame.K_PAGEDOWN:
+                    self.seek(self.index - self.JUMP_TICKS)
+                elif event.key == pygame.K_HOME:
+                    self.seek(0)
+                elif event.key == pygame.K_END:
+                    self.seek(len(self.reader) - 1)
+
 class TkSettingsController:                                             # HauptController (Tk Settings)
     """
     Hauptcontroller für die Tkinter-Settings-Oberfläche.
@@ -148,6 +228,7 @@ class TkSettingsController:                                             # HauptC
         self.ant_strategy = model.ANT_STRATEGY  # Unterschiedliche Food suche Strategien ["random" ,"odor", "brain"]
         self.ant_machine_learning = model.ANT_MACHINE_LEARNING  # Bestimte brain Methode
         self.cmb_ant_selected = "000"
+        self.inspected_ant = None               # Nur diese Ameise aktualisiert das Log-Textfeld
 
         # Setze Callbacks für UI-Elemente auf Methoden
         self.tk_settings_window.set_btn_random_cb(self.btn_random)
@@ -166,8 +247,11 @@ class TkSettingsController:                                             # HauptC
         self.tk_settings_window.set_show_csv_btn_callback(self.show_csv_btn)
         self.tk_settings_window.set_btn_show_log_callback(self.btn_show_log)
         self.tk_settings_window.set_btn_reset(self.btn_reset)
+        self.tk_settings_window.set_btn_profiler_cb(self.btn_profiler)
+        self.tk_settings_window.set_btn_memory_cb(self.btn_memory)
         self.tk_settings_window.set_btn_training_cb(self.btn_training)
         self.tk_settings_window.set_btn_save_ants_callback(self.btn_save_ants)
+        self.tk_settings_window.set_ant_search_cb(self.search_ants)
 
         # Initialisiere Standardwerte und UI-Status
         self.world.clock_tick = 60                                   # Simulationsgeschwindigkeit
@@ -258,7 +342,7 @@ class TkSettingsController:                                             # HauptC
                                "MONTE_CARLO_COLOR": model.MONTE_CARLO_COLOR,
                                "Q_LEARNING_COLOR": model.Q_LEARNING_COLOR,
                                "ORKA": model.ORKA,
-                               "GENERATION": False}
+                               "GENERATION": model.GENERATION}
         ant_settings_obj.update_settings(ant_settings_values)
         ant_settings_obj.set_btn_save_cb(lambda: model.DataStorage().save_settings(ant_settings_obj.get_settings()))
 
@@ -267,15 +351,13 @@ class TkSettingsController:                                             # HauptC
         Fügt zusätzliche Ameisen entsprechend des Eingabefeldes hinzu,
         aktualisiert die Anzeige und gibt Debug-Infos aus, setzt Callback.
         """
-        self.world.ants.generate_ants(int(self.tk_settings_window.get_ent_ant_add_value()), self.ant_strategy,
-                                      self.ant_machine_learning, self.tk_settings_window.get_csv_load())
-        if len(self.world.ants.show_ants()) > 0:            # Wenn Ameisen vorhanden sind
-            self.cmb_ant_selected = self.world.ants.show_ants()[-1].name
+        new_ants = self.world.ants.generate_ants(int(self.tk_settings_window.get_ent_ant_add_value()), self.ant_strategy,
+                                                 self.ant_machine_learning, self.tk_settings_window.get_csv_load())
+        if new_ants:                                        # Wenn Ameisen erzeugt wurden
+            self.cmb_ant_selected = new_ants[-1].name
         self.tk_settings_window.update_ent_ant_add(1)                              # Setze Ant Entry auf Eins
         self.update_settings_window()
-        for ant in self.world.ants.show_ants():                         # Hier wird der Callback für Textfeld gesetzt
-            ant.log_collector.update_log_collector_callback(self.update_log_collector_text)
-        self.cmb_selected_ant_set()
+        self.cmb_selected_ant_set()                                     # Callback für Textfeld nur an gewählter Ameise
 
     def btn_food_settings(self):
         food_settings_obj = view.FoodSettingsWindow(self.tk_settings_window)
@@ -329,12 +411,15 @@ class TkSettingsController:                                             # HauptC
 
     def btn_show_log(self):
         """
-        Öffnet ein neues Fenster zur Anzeige der Ereignissen die stattgefunden haben.
+        Öffnet ein neues Fenster zur seitenweisen Anzeige der Ereignissen die stattgefunden haben.
         """
         self.world.world_pause = True
-        if int(self.cmb_ant_selected) > 0:
-            inhalt = self.world.ants.show_ants()[int(self.cmb_ant_selected) - 1].log_collector.get_all_periods()
-            view.TextEditor(inhalt).mainloop()
+        ant = self.world.ants.get_ant(self.cmb_ant_selected)
+        if ant:
+            log_collector = ant.log_collector
+            log_viewer = view.LogViewerWindow(self.tk_settings_window)
+            log_viewer.title(f"Log Ameise {ant.name}")
+            log_viewer.set_log_cbs(log_collector.period_count, log_collector.get_periods, log_collector.find_period)
         else:
             print("Keine Daten Vorhanden")
 
@@ -344,12 +429,32 @@ class TkSettingsController:                                             # HauptC
         """
         self.world.world_pause = True           # Setze Pause
         self.world.ants.clear()                 # Lösche alle Ameisen
+        self.inspected_ant = None
         self.tk_settings_window.update_ent_set_food(0)     # Setze Food entry auf Null
         self.world.foods.clear()                # Lösche alle Foods
         self.set_btn_food()                     # Aktualisiere Foods
         self.world.world_pause = False          # Starte wieder
         self.update_settings_window()
 
+    def btn_profiler(self):
+        """
+        Öffnet die rollende Profiler-Tabelle (Zeit je Tick-Phase).
+        """
+        profiler_obj = view.ProfilerWindow(self.tk_settings_window)
+        profiler_obj.set_table_cb(model.profiler.format_table)
+        profiler_obj.set_btn_save_cb(lambda: model.profiler.dump(PROFILER_DUMP_FILE))
+        profiler_obj.set_btn_cprofile_cb(model.profiler.request_profile)
+        profiler_obj.set_btn_reset_cb(model.profiler.reset)
+
+    def btn_memory(self):
+        """
+        Zeigt den Speicherbedarf (Welt, Ameisen, Logs, Q-Tabellen, Netze) und den
+        tracemalloc-Zuwachs seit dem letzten Klick an.
+        """
+        self.world.world_pause = True
+        inhalt = self.world.memory_report() + "\n\n" + model.memory_tracer.diff()
+        view.TextEditor(inhalt).mainloop()
+
     def btn_training(self):
         brain_trainings_obj = view.BrainTrainingsWindow(self.tk_settings_window)
         brain_trainings_obj.set_btn_go_cb(lambda: self.train_brain(brain_trainings_obj.get_settings()))
@@ -379,16 +484,40 @@ class TkSettingsController:                                             # HauptC
         Ändert die ausgewählte Ameise für die Textanzeige
         anhand der ComboBox-Auswahl und aktualisiert die ComboBox.
         """
-        self.cmb_ant_selected = self.tk_settings_window.get_cmb_selected_ant()
+        name = self.tk_settings_window.get_cmb_selected_ant()
+        ant = self.world.ants.get_ant(name)
+        if ant is None: return          # Unbekannt: bisherige Auswahl behalten
+        self.cmb_ant_selected = name
+        self.inspect_ant(ant)
+        self.tk_settings_window.update_cmb_selected_ant(ant.name, self.cmb_selected_ant_set)
         self.update_log_collector_text()
 
         # Tastenereignisse verbinden
-        ant = self.world.ants.get_ant(self.cmb_ant_selected)
         self.tk_settings_window.bind("<Left>", ant.move_self)  # Pfeiltaste links
         self.tk_settings_window.bind("<Right>", ant.move_self)  # Pfeiltaste rechts
         self.tk_settings_window.bind("<Up>", ant.move_self)  # Pfeiltaste oben
         self.tk_settings_window.bind("<Down>", ant.move_self)  # Pfeiltaste unten
 
+    def inspect_ant(self, ant):
+        """
+        Hängt den Log-Callback (Textfeld) nur an die angezeigte Ameise, bei der vorherigen wird er entfernt.
+        """
+        if self.inspected_ant is ant: return
+        if self.inspected_ant: self.inspected_ant.log_collector.update_log_collector_callback(None)
+        ant.log_collector.update_log_collector_callback(self.update_log_collector_text)
+        self.inspected_ant = ant
+
+    def search_ants(self, query):
+        """
+        Einträge der Ameisenauswahl zum Suchtext (siehe model.Ants.search), z.B. "007  brain/Q-Learning  Futter: 12".
+        """
+        entries = []
+        for ant in self.world.ants.search(query, ANT_PICKER_LIMIT):
+            strategy = ant.brain.ant_strategy
+            if ant.brain.ant_machine_learning not in (None, "Keine"): strategy += f"/{ant.brain.ant_machine_learning}"
+            entries.append(f"{ant.name}  {strategy}  Futter: {ant.food_found}" + ("  (ohne Energie)" if ant.out_of_action else ""))
+        return entries
+
     def btn_save_ants(self):
         """
         Speichert den Lernerfolg der Ameisen (Q-Werte) in eine CSV-Datei,
@@ -406,7 +535,7 @@ class TkSettingsController:                                             # HauptC
         self.tk_settings_window.update_ants_label(len(self.world.ants))        # Setze Ameisenanzahl Label
         self.tk_settings_window.update_food_label(self.world.foods.set_food)   # Setze Futteranzahl Label
         self.tk_settings_window.update_lbl_set_brain(self.ant_strategy)        # Setze label für Strategie
-        self.tk_settings_window.update_cmb_selected_ant([ant.name for ant in self.world.ants], self.cmb_ant_selected, self.cmb_selected_ant_set)
+        self.tk_settings_window.update_cmb_selected_ant(self.cmb_ant_selected, self.cmb_selected_ant_set)
         if self.ant_strategy == "brain":
             self.tk_settings_window.update_lbl_set_machine_learning(self.ant_machine_learning) # Setze label für Machine Learning
             self.tk_settings_window.update_cmb_ant_machine_learning(self.machine_learning_methods, self.ant_machine_learning, self.cmb_ant_machine_learning)
@@ -421,10 +550,11 @@ class TkSettingsController:                                             # HauptC
         if self.cmb_ant_selected == "None": # Wenn keine Ameisen vorhanden sind
             text = "!!!Keine Ameise ausgewählt!!!"
             self.tk_settings_window.update_log_widget_text(text)
-        else:
-            text = self.world.ants.show_ants()[int(self.cmb_ant_selected) - 1].log_collector.get_formatted_info()
+        elif self.inspected_ant:
+            text = self.inspected_ant.log_collector.get_formatted_info()
             self.tk_settings_window.update_log_widget_text(text)
 
 # === Testpoint ===
 if __name__ == "__main__":
+    import main
     main.main()
\ No newline at end of file
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Dieses Modul `evolution` züchtet Gehirne über viele Generationen ohne Oberfläche.
+
+Jede Generation wird eine feste Anzahl Ticks gerechnet. Die Population wird dazu auf mehrere
+Welten aufgeteilt, die parallel in einem Prozess-Pool laufen (gleicher SEED je Generation, damit
+alle Gruppen dieselbe Futterlage haben). Danach werden die Ameisen nach food_found sortiert und
+model.Breeder erzeugt aus den besten (gelernten) Gehirnen die nächste Generation.
+
+Beispiel:
+    python evolution.py --generations 200 --population 100 --ticks 1000 \\
+                        --set ANT_STRATEGY=brain ANT_MACHINE_LEARNING=Q-Learning --workers 4 \\
+                        --out evolution.csv --save-best
+
+Autor: Artur Lamparter <arturlamparter@web.de>
+"""
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import model
+import runner
+
+pd = model.LazyModule("pandas")     # Nur für die Verlaufstabelle
+
+
+def evaluate_group(task):
+    """
+    Rechnet eine Gruppe der Population in einer eigenen Welt (im Worker-Prozess).
+
+    Args:
+        task (tuple): (Einstellungen, Anzahl Ameisen, Erbgut je Ameise oder None, Ticks)
+
+    Returns:
+        list: [(food_found, gelerntes Erbgut), ...] in der Reihenfolge der Ameisen.
+    """
+    settings, count, genomes, ticks = task
+    headless = runner.HeadlessRunner(dict(settings, ANTS=0, GENERATION=0))  # Generationen steuert die Engine
+    headless.world.ants.generate_ants(count, headless.settings["ANT_STRATEGY"], headless.settings["ANT_MACHINE_LEARNING"],
+                                      bool(int(headless.settings["CSV_LOAD"])), genomes=genomes)
+    headless.run(ticks)
+    return [(ant.food_found, ant.brain.get_genome()) for ant in headless.world.ants.iter_all()]
+
+
+class GenerationEngine:
+    """
+    Führt die Generationen aus und sammelt den Verlauf (bester/mittlerer food_found je Generation).
+    """
+    def __init__(self, settings=None, population=100, generations=100, ticks=1000, groups=None, workers=None):
+        """
+        Args:
+            settings (dict): Einstellungen wie beim runner (ANT_STRATEGY, ANT_MACHINE_LEARNING, FOODS, SEED, ...).
+            population (int): Ameisen je Generation.
+            generations (int): Anzahl Generationen.
+            ticks (int): Simulationsschritte je Generation (Lebensdauer).
+            groups (int): Anzahl Welten je Generation, Standard: Anzahl Prozesse bzw. CPUs.
+            workers (int): Anzahl Prozesse, None = Anzahl CPUs.
+        """
+        self.settings = dict(runner.RUN_DEFAULTS, **(settings or {}))
+        self.population = int(population)
+        self.generations = int(generations)
+        self.ticks = int(ticks)
+        self.workers = workers
+        self.groups = max(1, min(self.population, int(groups or workers or os.cpu_count() or 1)))
+        config = model.WorldConfig({key: value for key, value in self.settings.items() if key in model.WorldConfig.DEFAULTS})
+        self.breeder = model.Breeder(config)
+        self.history = []                   # Eine Zeile je Generation
+        self.best = None                    # (food_found, Erbgut) der besten Ameise der letzten Generation
+
+    def tasks(self, genomes, generation):
+        """
+        Teilt die Population auf die Welten auf. Alle Welten einer Generation haben denselben SEED.
+        """
+        size = math.ceil(self.population / self.groups)
+        settings = dict(self.settings, SEED=int(self.settings["SEED"]) + generation)
+        tasks = []
+        for start in range(0, self.population, size):
+            count = min(size, self.population - start)
+            tasks.append((settings, count, genomes[start:start + count] if genomes else None, self.ticks))
+        return tasks
+
+    def run(self, out=None):
+        """
+        Rechnet alle Generationen.
+
+        Args:
+            out (str): Verlauf nach jeder Generation als CSV speichern (für lange, unbeaufsichtigte Läufe).
+
+        Returns:
+            pd.DataFrame: Eine Zeile je Generation.
+        """
+        machine_learning = self.settings["ANT_MACHINE_LEARNING"]
+        genomes = None                                              # Erste Generation: CSV bzw. leere Gehirne
+        model.logger.info(f"Evolution: {self.generations} Generationen, {self.population} Ameisen, "
+                          f"{self.groups} Welten, Prozesse: {self.workers or 'alle CPUs'}")
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for generation in range(self.generations):
+                start = time.perf_counter()
+                ranked = [result for group in pool.map(evaluate_group, self.tasks(genomes, generation))
+                          for result in group]
+                fitness = np.array([food_found for food_found, _ in ranked])
+                self.best = max(ranked, key=lambda item: item[0])
+                genomes = self.breeder.next_generation(machine_learning, ranked)
+                self.history.append({"generation": generation + 1,
+                                     "food_found_max": int(fitness.max()),
+                                     "food_found_mean": round(float(fitness.mean()), 2),
+                                     "food_found_median": float(np.median(fitness)),
+                                     "seconds": round(time.perf_counter() - start, 3)})
+                model.logger.info(f"Generation {generation + 1}: Bester {fitness.max()}, Mittel {fitness.mean():.2f}")
+                if out: self.save(out)
+        return pd.DataFrame(self.history)
+
+    def save(self, file):
+        """
+        Speichert den Verlauf als CSV-Datei.
+        """
+        model.DataStorage().save_data_to_csv_file(pd.DataFrame(self.history), file)
+
+    def save_best(self):
+        """
+        Speichert das Gehirn der besten Ameise der letzten Generation in die Datei des Lernverfahrens.
+        """
+        if not self.best or self.best[1] is None:
+            model.logger.warning("Kein Gehirn zum Speichern vorhanden.")
+            return
+        config = model.WorldConfig({key: value for key, value in self.settings.items() if key in model.WorldConfig.DEFAULTS})
+        brain = model.Brain("000", self.settings["ANT_STRATEGY"], data={},
+                            ant_machine_learning=self.settings["ANT_MACHINE_LEARNING"], csv_load=False, config=config)
+        brain.set_genome(self.best[1])
+        brain.save_brain_data()
+
+
+def main(argv=None):
+    """
+    Kommandozeile: Generationen rechnen und Verlauf ausgeben.
+    """
+    parser = argparse.ArgumentParser(description="Generationssortierung der Ameisen-Gehirne")
+    parser.add_argument("--generations", type=int, default=100, help="Anzahl Generationen")
+    parser.add_argument("--population", type=int, default=100, help="Ameisen je Generation")
+    parser.add_argument("--ticks", type=int, default=1000, help="Simulationsschritte je Generation")
+    parser.add_argument("--set", nargs="*", metavar="KEY=VALUE", help="Einstellungen (wie runner.py)")
+    parser.add_argument("--groups", type=int, default=None, help="Welten je Generation")
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl Prozesse")
+    parser.add_argument("--out", default=None, help="Verlauf als CSV (nach jeder Generation)")
+    parser.add_argument("--save-best", action="store_true", help="Bestes Gehirn in die Datei des Lernverfahrens speichern")
+    args = parser.parse_args(argv)
+
+    engine = GenerationEngine(runner.parse_settings(args.set), args.population, args.generations, args.ticks,
+                              args.groups, args.workers)
+    history = engine.run(args.out)
+    if args.save_best: engine.save_best()
+    print(history.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ __author__ = "Artur Lamparter <arturlamparter@web.de>"
 __version__ = "0.3.0"
 
 # --- Externe Modulintegration ---
+import argparse
 import sys
 
 import view         # Enthält die GUI-Elemente (Tkinter-Views)
@@ -26,7 +27,15 @@ def main() -> None:
     - Initialisiert das GUI-Fenster
     - Verknüpft Controller mit Model und View
     - Startet die Tkinter Hauptschleife
+
+    Mit --replay DATEI wird stattdessen eine Aufzeichnung (TRAJECTORY_FILE, runner.py --trajectory) abgespielt.
     """
+    parser = argparse.ArgumentParser(description="Lernende Ameise")
+    parser.add_argument("--replay", default=None, help="Aufgezeichnete Bewegungen abspielen (ohne Simulation)")
+    args = parser.parse_args()
+    if args.replay:
+        controller.ReplayController(args.replay).run()
+        sys.exit()
 
     # Erzeuge das GUI-Hauptfenster mit Steuerelementen
     tk_settings_view_obj = view.TkSettingsWindow()
@@ -8,19 +8,28 @@ Autor: Artur Lamparter <arturlamparter@web.de>
 
 Brain v0.8
 """
-import pandas as pd
 import numpy as np
 import random
 import json
 import math
 import logging
-from collections import deque
-import torch
-import torch.nn as nn
-import torch.nn.functional as F
-import torch.optim as optim
-
-import main
+import importlib
+import time
+import threading
+import cProfile
+import pstats
+import io
+import os
+import sys
+import types
+import itertools
+import heapq
+import queue
+import struct
+import bisect
+import tracemalloc
+from collections import deque, Counter, defaultdict
+from collections.abc import Sequence
 
 # Logger configuration
 logging.basicConfig(level=logging.INFO)
@@ -36,6 +45,74 @@ if TEST:
 else:
     logger.setLevel(logging.INFO)            # Standard-Level
 
+class LazyModule:
+    """
+    Platzhalter für ein schweres Modul (z.B. torch, pandas), das erst beim ersten
+    Attributzugriff importiert wird. So startet die Anwendung schnell, solange z.B.
+    nur Random-, Odor- oder Q-Learning-Ameisen benutzt werden.
+    """
+    def __init__(self, name):
+        self.__dict__["_lazy_name"] = name      # Namen ohne Überschneidung mit Modulattributen (z.B. torch.load)
+        self.__dict__["_lazy_module"] = None
+
+    def _lazy_load(self):
+        """Importiert das Modul (einmalig) und gibt es zurück."""
+        if self._lazy_module is None:
+            logger.debug(f"Lade Modul {self._lazy_name}")
+            self.__dict__["_lazy_module"] = importlib.import_module(self._lazy_name)
+        return self._lazy_module
+
+    def __getattr__(self, attr):
+        value = getattr(self._lazy_load(), attr)
+        self.__dict__[attr] = value         # Merken, nächster Zugriff ohne Umweg
+        return value
+
+def deep_sizeof(obj, seen=None):
+    """
+    Ungefährer Speicherbedarf eines Objekts samt Inhalt in Bytes.
+
+    Durchläuft Container, Objekt-Attribute (__dict__/__slots__), NumPy-Arrays und torch-Tensoren.
+    Jedes Objekt wird nur einmal gezählt. Objekte, deren id in `seen` steht, werden übersprungen
+    (z.B. die Welt, damit nicht über Rückverweise alles gezählt wird).
+    """
+    seen = set() if seen is None else seen
+    skip = (type, types.ModuleType, types.FunctionType, types.MethodType, types.BuiltinFunctionType)
+    tensor = sys.modules["torch"].Tensor if "torch" in sys.modules else ()
+    size, stack = 0, [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, skip): continue
+        seen.add(id(o))
+        if isinstance(o, np.ndarray):
+            size += sys.getsizeof(o) + (o.nbytes if o.base is not None else 0)  # Sicht: Daten mitzählen
+            continue
+        if tensor and isinstance(o, tensor):
+            size += o.element_size() * o.nelement()
+            continue
+        size += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset, deque)):
+            stack.extend(o)
+        else:
+            if hasattr(o, "__dict__"): stack.append(o.__dict__)
+            for cls in type(o).__mro__:
+                for name in getattr(cls, "__slots__", ()):
+                    if hasattr(o, name): stack.append(getattr(o, name))
+    return size
+
+def format_bytes(size):
+    """Bytes lesbar formatieren, z.B. 1536 -> '1.5 KB'."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+pd = LazyModule("pandas")
+torch = LazyModule("torch")
+optim = LazyModule("torch.optim")
+
 """ --- Merker ---
 logger.debug("Debug-Meldung")
 logger.info("Info-Meldung")
@@ -47,6 +124,8 @@ logger.critical("Kritischer Fehler")
 GRID_SIZE = config.get('GRID_SIZE', 10)
 GRID_WIDTH = config.get('GRID_WIDTH', 100)                              # X (spalte)
 GRID_HEIGHT = config.get('GRID_HEIGHT', 100)                            # Y (zeile)
+WORLD_TOPOLOGY = config.get('WORLD_TOPOLOGY', "torus")                  # Weltrand: "torus" (durchgehen) oder "walls"
+TOPOLOGIES = ["torus", "walls"]
 ANT_STRATEGY = config.get('ANT_STRATEGY', "random")                     # Food suche Strategie
 ANT_MACHINE_LEARNING = config.get('ANT_MACHINE_LEARNING', None)         # Bestimte brain Methode
 MONTE_CARLO_FILE = config.get('MONTE_CARLO_FILE', "Monte-Carlo-Methode.csv")
@@ -61,7 +140,42 @@ FOOD_RANDOM_COLOR = config.get('FOOD_RANDOM_COLOR', "GREEN")
 FOOD_FIXED_SIZE_COLOR = config.get('FOOD_FIXED_SIZE_COLOR', "GREEN")
 FOOD_RANGE =  config.get('FOOD_RANGE', 100)
 RANDOM_FOOD = config.get('RANDOM_FOOD', 0)
-DIRECTIONS = ['up', 'down', 'left', 'right']
+ANT_ARCHIVE = config.get('ANT_ARCHIVE', 1)                               # Ameisen ohne Energie archivieren (Statistik, Gehirn)
+GENERATION = config.get('GENERATION', 0)                                 # Generationen: Neue Generation, wenn alle Energie 0
+GENERATION_SURVIVORS = config.get('GENERATION_SURVIVORS', 0.2)          # Anteil der Besten, die Eltern werden
+MUTATION_RATE = config.get('MUTATION_RATE', 0.1)                        # Wahrscheinlichkeit je Wert für Mutation
+MUTATION_SIGMA = config.get('MUTATION_SIGMA', 0.05)                     # Standardabweichung der Mutation
+ODOR_SPARSE = config.get('ODOR_SPARSE', "auto")                         # Gekacheltes Geruchsfeld (0, 1, "auto")
+ODOR_SPARSE_CELLS = config.get('ODOR_SPARSE_CELLS', 4_000_000)          # "auto": Ab dieser Zellenanzahl gekachelt
+ODOR_TILE_SIZE = config.get('ODOR_TILE_SIZE', 64)                       # Kantenlänge einer Geruchskachel
+ODOR_DTYPE = config.get('ODOR_DTYPE', "auto")                           # Datentyp Geruchsfeld ("auto", z.B. "uint16")
+POLICY_NETWORK_FILE = config.get('POLICY_NETWORK_FILE', "policy_network.pth")
+ALPHA = config.get('ALPHA', 0.1)                                        # Lernrate (Monte-Carlo, Q-Learning)
+GAMMA = config.get('GAMMA', 0.9)                                        # Diskontierung zukünftiger Belohnungen
+EPS = config.get('EPS', 0.1)                                            # ε-Greedy Exploration
+PROFILER_WINDOW = config.get('PROFILER_WINDOW', 200)                    # Ticks in der rollenden Profiler-Tabelle
+PROFILE_TICKS = config.get('PROFILE_TICKS', 100)                        # cProfile-Mitschnitt: Anzahl Ticks
+PROFILE_FILE = config.get('PROFILE_FILE', "profile.prof")               # cProfile-Mitschnitt: Ausgabedatei
+AUTOSAVE_SECONDS = config.get('AUTOSAVE_SECONDS', 0)                    # Automatisch speichern alle n Sekunden (0 = aus)
+SNAPSHOT_FILE = config.get('SNAPSHOT_FILE', "world_snapshot.npz")        # Gesamtzustand der Welt (World.save_snapshot)
+SNAPSHOT_VERSION = 1                                                    # Formatversion der Snapshot-Datei
+METRICS_FILE = config.get('METRICS_FILE', "")                            # Kennzahlen je Tick (MetricsRecorder), "" = aus
+METRICS_CHUNK_TICKS = config.get('METRICS_CHUNK_TICKS', 1000)           # Ticks je geschriebenem Block
+TRAJECTORY_FILE = config.get('TRAJECTORY_FILE', "")                      # Bewegungen je Tick für die Wiedergabe, "" = aus
+TRAJECTORY_KEYFRAME_TICKS = config.get('TRAJECTORY_KEYFRAME_TICKS', 100)  # Spätestens alle n Ticks volle Positionen
+DIRECTIONS = ['up', 'down', 'left', 'right']                            # Namen (CSV, Anzeige), Index = Richtungscode
+UP, DOWN, LEFT, RIGHT, NO_DIRECTION = range(5)                          # Richtungscodes (intern)
+ACTIONS = (UP, DOWN, LEFT, RIGHT)
+DIRECTION_NAMES = (*DIRECTIONS, 'XXX')                                  # Name je Code, NO_DIRECTION = 'XXX'
+DIRECTION_CODES = {name: code for code, name in enumerate(DIRECTIONS)}  # Name -> Code
+OPPOSITES = (DOWN, UP, RIGHT, LEFT, NO_DIRECTION)                       # Gegenrichtung je Code
+DX = (0, 0, -1, 1, 0)                                                   # Schritt in X je Code
+DY = (-1, 1, 0, 0, 0)                                                   # Schritt in Y je Code
+# Zustände: Geruchsunterschiede (oben, unten, links, rechts) jeweils -1/0/1 -> 3^4 = 81 Zustände
+# Code = 27*(oben+1) + 9*(unten+1) + 3*(links+1) + (rechts+1), STATES[code] ergibt das Zustands-Tupel
+STATES = [(u, d, l, r) for u in (-1, 0, 1) for d in (-1, 0, 1) for l in (-1, 0, 1) for r in (-1, 0, 1)]
+STATE_NEUTRAL = STATES.index((0, 0, 0, 0))  # Zustand ohne Geruchsunterschied
+STATE_INDEX = {state: code for code, state in enumerate(STATES)}    # Zustand -> Zustandscode
 COLORS = ["RED", "BLUE", "YELLOW", "ORANGE", "PURPLE", "CYAN", "PINK", "GRAY", "WHITE", "GREEN", "BLACK"]
 
 """ --- Colors ---
@@ -78,18 +192,75 @@ PINK = (255, 105, 180)
 GRAY = (128, 128, 128)
 """
 
-class PolicyNetwork(nn.Module):
-    def __init__(self, input_size=4, hidden_size=16, output_size=4):
-        super(PolicyNetwork, self).__init__()
-        self.fc1 = nn.Linear(input_size, hidden_size)
-        self.fc2 = nn.Linear(hidden_size, output_size)
+class WorldConfig:
+    """
+    Einstellungen einer Welt (Größe, Energie, Futter, Farben, Dateien, Lernparameter).
 
-    def forward(self, x):
-        x = F.relu(self.fc1(x))
-        return self.fc2(x)  # Ausgabe = Scores für jede Richtung
+    Standardwerte kommen aus config.json. Einzelne Werte werden mit denselben Schlüsseln
+    wie in config.json überschrieben, z.B. WorldConfig({"GRID_WIDTH": 50, "ORKA": 500}) oder
+    WorldConfig(ALPHA=0.2). So können mehrere unterschiedlich eingestellte Welten in einem
+    Prozess laufen.
+    """
+    DEFAULTS = {"GRID_SIZE": GRID_SIZE, "GRID_WIDTH": GRID_WIDTH, "GRID_HEIGHT": GRID_HEIGHT,
+                "WORLD_TOPOLOGY": WORLD_TOPOLOGY, "ORKA": ORKA, "FOOD_RANGE": FOOD_RANGE,
+                "ALPHA": ALPHA, "GAMMA": GAMMA, "EPS": EPS,
+                "RANDOM_COLOR": RANDOM_COLOR, "ODOR_COLOR": ODOR_COLOR,
+                "MONTE_CARLO_COLOR": MONTE_CARLO_COLOR, "Q_LEARNING_COLOR": Q_LEARNING_COLOR,
+                "FOOD_RANDOM_COLOR": FOOD_RANDOM_COLOR, "FOOD_FIXED_SIZE_COLOR": FOOD_FIXED_SIZE_COLOR,
+                "MONTE_CARLO_FILE": MONTE_CARLO_FILE, "Q_LEARNING_FILE": Q_LEARNING_FILE,
+                "PERZEPTRON_FILE": PERZEPTRON_FILE, "POLICY_NETWORK_FILE": POLICY_NETWORK_FILE,
+                "ODOR_SPARSE": ODOR_SPARSE, "ODOR_SPARSE_CELLS": ODOR_SPARSE_CELLS,
+                "ODOR_TILE_SIZE": ODOR_TILE_SIZE, "ODOR_DTYPE": ODOR_DTYPE,
+                "ANT_ARCHIVE": ANT_ARCHIVE, "GENERATION": GENERATION, "GENERATION_SURVIVORS": GENERATION_SURVIVORS,
+                "MUTATION_RATE": MUTATION_RATE, "MUTATION_SIGMA": MUTATION_SIGMA}
+
+    def __init__(self, settings=None, **kwargs):
+        """
+        Args:
+            settings (dict): Zu überschreibende Werte (Schlüssel wie in config.json).
+            **kwargs: Weitere zu überschreibende Werte.
+        """
+        settings = dict(settings or {}, **kwargs)
+        unknown = set(settings) - set(self.DEFAULTS)
+        if unknown:
+            logger.warning(f"Unbekannte Einstellungen werden ignoriert: {sorted(unknown)}")
+        self.settings = {key: settings.get(key, default) for key, default in self.DEFAULTS.items()}
+        values = self.settings
+        self.grid_size = int(values["GRID_SIZE"])
+        self.grid_width = int(values["GRID_WIDTH"])
+        self.grid_height = int(values["GRID_HEIGHT"])
+        self.topology = values["WORLD_TOPOLOGY"]
+        self.orka = int(values["ORKA"])
+        self.food_range = int(values["FOOD_RANGE"])
+        self.alpha = float(values["ALPHA"])
+        self.gamma = float(values["GAMMA"])
+        self.eps = float(values["EPS"])
+        self.random_color = values["RANDOM_COLOR"]
+        self.odor_color = values["ODOR_COLOR"]
+        self.monte_carlo_color = values["MONTE_CARLO_COLOR"]
+        self.q_learning_color = values["Q_LEARNING_COLOR"]
+        self.food_random_color = values["FOOD_RANDOM_COLOR"]
+        self.food_fixed_size_color = values["FOOD_FIXED_SIZE_COLOR"]
+        self.monte_carlo_file = values["MONTE_CARLO_FILE"]
+        self.q_learning_file = values["Q_LEARNING_FILE"]
+        self.perzeptron_file = values["PERZEPTRON_FILE"]
+        self.policy_network_file = values["POLICY_NETWORK_FILE"]
+        self.odor_sparse = values["ODOR_SPARSE"]
+        self.odor_sparse_cells = int(values["ODOR_SPARSE_CELLS"])
+        self.odor_tile_size = int(values["ODOR_TILE_SIZE"])
+        self.odor_dtype = values["ODOR_DTYPE"]
+        self.ant_archive = bool(int(values["ANT_ARCHIVE"]))
+        self.generation = bool(int(values["GENERATION"]))
+        self.generation_survivors = float(values["GENERATION_SURVIVORS"])
+        self.mutation_rate = float(values["MUTATION_RATE"])
+        self.mutation_sigma = float(values["MUTATION_SIGMA"])
+
+    def as_dict(self):
+        """Gibt alle Einstellungen als Dictionary (Schlüssel wie in config.json) zurück."""
+        return dict(self.settings)
 
 class Perzeptron:
-    def __init__(self, n, log_collector):
+    def __init__(self, n, log_collector, data=None):
         self._w = []            # Gewichte
         self.n = n              # Eingängeanzahl
         self._b = -1            # Bias
@@ -97,9 +268,12 @@ class Perzeptron:
         self.eta = 0.1
         self.alpha = 0.01
         self.error_number = 1
-        for _ in range(n):      # Initiire Gewichte
-            w = np.random.normal(0, 1/np.sqrt(n))
-            self._w.append(w)
+        if data is not None:    # Gegebene Gewichte und Bias (siehe load), ohne Zufallszahlen zu verbrauchen
+            self.load(data)
+        else:
+            for _ in range(n):  # Initiire Gewichte
+                w = np.random.normal(0, 1/np.sqrt(n))
+                self._w.append(w)
 
     def update_eta(self, output_error):
         """
@@ -143,6 +317,11 @@ class Perzeptron:
         self._b += 0.01 * self.eta * (mistake / self.error_number)
         self.log_collector.add_log_txt(
             f"Werte nach Anpassung: {self._w[0]:.1f} {self._w[1]:.1f} {self._w[2]:.1f} {self._w[3]:.1f}, Bias: {self._b:.1f}, Eta: {self.eta:.4f}\n")
+        return mistake != 0                     # Gewichte verändert
+
+    def get_weights(self):
+        """Kopie der Gewichte und des Bias (ohne die Werte zu verändern)."""
+        return list(self._w), self._b
 
     def save(self):
         self._w = [round(w, 2) for w in self._w]
@@ -163,22 +342,31 @@ class Brain:        # Hier werden Die daten als auch die Methoden für ML bereit
     - Q-Learning
 
     Q-Werte werden als Dictionary gespeichert mit:
-    key   = (state, action)
+    key   = (state, action)     action = Richtungscode UP, DOWN, LEFT, RIGHT (0..3)
     value = float
+
+    Richtungsnamen ('up', 'down', ...) werden nur in CSV-Dateien und Logtexten verwendet.
     """
-    def __init__(self, name: str, ant_strategy, data=None, ant_machine_learning=None, csv_load = True):
+    def __init__(self, name: str, ant_strategy, data=None, ant_machine_learning=None, csv_load = True, config=None):
         self.name = name
-        self._q = {}        # z.B. {(state, action): value}  (action = 'up', 'down', 'left', 'right')
-        self.episode = []   # z.B. [state, action, reward] z.B. [((-1, +1, 0, -1), 'down', -0.5)]
+        self.config = config or WorldConfig()               # Einstellungen (Dateien, Lernparameter)
+        self._q = {}        # z.B. {(state, action): value}  (action = Richtungscode UP, DOWN, LEFT, RIGHT)
+        self.episode = []   # z.B. [state, action, reward] z.B. [((-1, +1, 0, -1), DOWN, -0.5)]
         self.ant_strategy = ant_strategy                    # Unterschiedliche Food suche Strategien ["random" ,"odor", "brain"]
         self.ant_machine_learning = ant_machine_learning    # Bestimte brain Methode ["Monte-Carlo", "Q-Learning", "Perzeptron"]
-        self.directions = DIRECTIONS  # Mögliche Richtungen
+        self.directions = ACTIONS  # Mögliche Richtungen (Codes)
         self.log_collector = None
         self.output_error = 100
-        self.alpha = 0.1
-        self.gamma = 0.9
+        self.alpha = self.config.alpha
+        self.gamma = self.config.gamma
         self.eta = 0.1
         self.optimizer = None
+        self.last_loss = float("nan")   # Letzter Policy-Gradient-Loss (Kennzahlen)
+        self.learned = False            # Seit dem letzten automatischen Speichern gelernt (BrainAutosaver)
+        self._q_values_cache = {}       # state -> gerundete Q-Werte aller Richtungen
+        self._best_actions_cache = {}   # (state, letzte Richtung) -> beste Richtungen
+        self._perzeptron_cache = {}     # state -> Ausgaben der 4 Perzeptrons
+        self._policy_inference = None   # NumPy-Kopie des Policy-Network (network.NumpyPolicy)
         self.data_file = self.set_file_path()
         self.ant_name = None
         self.log_collector = LogCollector(self.name, self.ant_strategy, self.ant_machine_learning)
@@ -199,15 +387,36 @@ class Brain:        # Hier werden Die daten als auch die Methoden für ML bereit
         """Erlaubt Zugriff auf Q-Werte via brain[(state, action)]."""
         return self._q[index]
 
+    def memory_usage(self, seen=None):
+        """
+        Ungefährer Speicherbedarf des Gehirns in Bytes.
+
+        Returns:
+            dict: {"log": Logtexte, "episode": Episodenpuffer, "q": Q-Tabelle bzw. Perzeptrons,
+                   "network": Policy-Network inkl. Optimizer-Zustand}
+        """
+        seen = set() if seen is None else seen
+        seen.add(id(self.config))
+        usage = {"log": self.log_collector.memory_usage(seen),
+                 "episode": deep_sizeof(self.episode, seen),
+                 "q": 0,
+                 "network": 0}
+        if self.ant_machine_learning == "Policy-Network":
+            usage["network"] = deep_sizeof([self._q, self._policy_inference], seen)
+            if self.optimizer: usage["network"] += deep_sizeof(self.optimizer.state, seen)
+        else:
+            usage["q"] = deep_sizeof(self._q, seen)
+        return usage
+
     def set_file_path(self):
         if self.ant_machine_learning == "Keine":
             return "Keine"
         elif self.ant_machine_learning == "Monte-Carlo":
-            return MONTE_CARLO_FILE
+            return self.config.monte_carlo_file
         elif self.ant_machine_learning == "Q-Learning":
-            return Q_LEARNING_FILE
+            return self.config.q_learning_file
         elif self.ant_machine_learning == "Perzeptron":
-            return PERZEPTRON_FILE
+            return self.config.perzeptron_file
         elif self.ant_machine_learning == "Policy-Network":
             pass
         else:
@@ -242,7 +451,7 @@ class Brain:        # Hier werden Die daten als auch die Methoden für ML bereit
             for row in data.itertuples():
                 state = tuple([int(x) for x in row.state.split(":")])
                 # print(f"{state}, {row.action},  {row.value}")
-                q[(state, row.action)] = row.value
+                q[(state, DIRECTION_CODES[row.action])] = row.value    # Name in der CSV -> Code
             return q
         elif self.ant_machine_learning == "Perzeptron":
             if file is None:
@@ -262,37 +471,109 @@ class Brain:        # Hier werden Die daten als auch die Methoden für ML bereit
 
             return q
         elif self.ant_machine_learning == "Policy-Network":
+            from network import PolicyNetwork   # torch erst hier laden
             network = PolicyNetwork()
-            network.load_state_dict(torch.load('policy_network.pth'))
+            network.load_state_dict(torch.load(self.config.policy_network_file))
             network.eval()      # In den Evaluierungsmodus versetzen
             return network
 
     def save_brain_data(self, file=None):
-        if file is None: file = self.data_file
+        """
+        Speichert die gelernten Daten (CSV bzw. Netzparameter), siehe write_brain_snapshot.
+        """
+        snapshot = self.snapshot_brain_data()
+        if snapshot is None:
+            logger.info("Bei diesem Lernverfahren nicht möglich.")
+            return
+        self.write_brain_snapshot(snapshot, file)
+
+    def snapshot_brain_data(self):
+        """
+        Kopiert die gelernten Daten, damit sie in einem anderen Thread geschrieben werden können.
+        Schnell genug für den Simulations-Thread (Dictionary-/Listenkopie bzw. state_dict-Klon).
+
+        Returns:
+            tuple | None: (Lernverfahren, Daten) oder None, wenn es nichts zu speichern gibt.
+        """
         if self.ant_machine_learning == "Monte-Carlo" or self.ant_machine_learning == "Q-Learning":
-            # Speichert das Q-Dictionary in eine CSV-Datei.
-            array = pd.DataFrame(columns=["state", "action", "value"])  # Beispiel: ["-1:0:-1:0", "up", -0.25],
-            for (state, action), value in self._q.items():  # Fülle Panda DataFrame mit lernerfolgen der ML
-                array.loc[len(array)] = (f"{state[0]}:{state[1]}:{state[2]}:{state[3]}", action, f"{value:.2f}")
-                # print(f"Q-Wert für {state}, {action}: {value:.2f}")
-            DataStorage().save_data_to_csv_file(array, file) # Speicher Array in CSV
+            return self.ant_machine_learning, dict(self._q)
         elif self.ant_machine_learning == "Perzeptron":
-            data = []
-            for p in self._q: # Fülle Panda DataFrame mit lernerfolgen der ML
-                w_list, b = p.save()
-                data.append(w_list + [b])
+            return self.ant_machine_learning, [p.get_weights() for p in self._q]
+        elif self.ant_machine_learning == "Policy-Network":
+            return self.ant_machine_learning, {k: v.detach().clone() for k, v in self._q.state_dict().items()}
+        return None
 
-            df = pd.DataFrame(data, columns=["w0", "w1", "w2", "w3", "b"])
+    def write_brain_snapshot(self, snapshot, file=None):
+        """
+        Schreibt eine Kopie aus snapshot_brain_data in `file` bzw. die Datei des Lernverfahrens.
+        Die Datei wird atomar ersetzt (erst temporäre Datei, dann umbenennen).
+        """
+        machine_learning, data = snapshot
+        if file is None:
+            file = self.config.policy_network_file if machine_learning == "Policy-Network" else self.data_file
+        if machine_learning == "Monte-Carlo" or machine_learning == "Q-Learning":
+            # Speichert das Q-Dictionary in eine CSV-Datei. Beispiel: ["-1:0:-1:0", "up", -0.25]
+            rows = [(f"{state[0]}:{state[1]}:{state[2]}:{state[3]}", DIRECTIONS[action], f"{value:.2f}")
+                    for (state, action), value in data.items()]
+            array = pd.DataFrame(rows, columns=["state", "action", "value"])
+            DataStorage().save_data_to_csv_file(array, file) # Speicher Array in CSV
+        elif machine_learning == "Perzeptron":
+            rows = [[round(w, 2) for w in w_list] + [round(b, 2)] for w_list, b in data]
+            df = pd.DataFrame(rows, columns=["w0", "w1", "w2", "w3", "b"])
             DataStorage().save_data_to_csv_file(df, file)
-        elif self.ant_machine_learning == "Policy-Network":
+        elif machine_learning == "Policy-Network":
             # Speichern der Modellparameter:
-            torch.save(self._q.state_dict(), 'policy_network.pth')
-        else:
-            logger.info("Bei diesem Lernverfahren nicht möglich.")
+            DataStorage.atomic_write(file, lambda tmp: torch.save(data, tmp))
+
+    def get_genome(self):
+        """
+        Kopie der gelernten Daten als Erbgut für die nächste Generation (siehe Breeder).
+
+        Returns:
+            Q-Dictionary, Liste (Gewichte, Bias) je Perzeptron, state_dict des Policy-Network
+            oder None (ohne Lernverfahren).
+        """
+        snapshot = self.snapshot_brain_data()
+        return snapshot[1] if snapshot else None
+
+    def set_genome(self, genome):
+        """
+        Übernimmt ein Erbgut aus get_genome bzw. Breeder (Gegenstück zu get_genome).
+        """
+        if genome is None: return
+        if self.ant_machine_learning == "Monte-Carlo" or self.ant_machine_learning == "Q-Learning":
+            self._q = dict(genome)
+        elif self.ant_machine_learning == "Perzeptron":
+            self._q = [Perzeptron(len(w_list), self.log_collector, [*w_list, b]) for w_list, b in genome]
+        elif self.ant_machine_learning == "Policy-Network":
+            from network import PolicyNetwork   # torch erst hier laden
+            network = PolicyNetwork()
+            network.load_state_dict(genome)
+            network.eval()
+            self._q = network
+            self.optimizer = None                   # Neues Netz: Optimizer beginnt neu
+        self.invalidate_policy()
 
     def set_brain(self, values):
             """Setzt die Q-Werte."""
-            if values: self._q = values
+            if values:
+                self._q = values
+                self.invalidate_policy()
+
+    def invalidate_policy(self, state=None):
+        """
+        Verwirft zwischengespeicherte Entscheidungen: Nur für `state` (nach einem Q-Update)
+        oder alle (neue Daten bzw. geänderte Perzeptron-Gewichte).
+        """
+        if state is None:
+            self._q_values_cache.clear()
+            self._best_actions_cache.clear()
+            self._perzeptron_cache.clear()
+            self._policy_inference = None           # Beim nächsten Zugriff neu aus dem Netz
+            return
+        self._q_values_cache.pop(state, None)
+        for last_direction in range(NO_DIRECTION + 1):
+            self._best_actions_cache.pop((state, last_direction), None)
 
     def policy_network_calculate(self, state, action, reward):
         self.log_collector.add_log_txt(f"------Policy Network Brain Berechnung--------\n")
@@ -322,23 +603,29 @@ class Brain:        # Hier werden Die daten als auch die Methoden für ML bereit
         self.optimizer.zero_grad()
         loss.backward()
         self.optimizer.step()
+        self.learned = True
+        self.last_loss = loss.item()
+        self.refresh_policy_inference()             # Gewichte geändert: NumPy-Kopie erneuern
 
     def perzeptron_calculate(self, state, action, reward):
         brain_output = self.get_perzeptron_value(state)
         self.log_collector.add_log_txt(f"------Perzeptron Brain Berechnung--------\n")
         self.log_collector.add_log_txt(f"Übergebene Werte:\n"
-            f"Status: {state}, Perz. Ausgabe: {brain_output}, Richtung: {action}, Belohnung: {reward}\n"
+            f"Status: {state}, Perz. Ausgabe: {brain_output}, Richtung: {DIRECTIONS[action]}, Belohnung: {reward}\n"
             f"Gehe Richtungen und Perz. durch:\n"
             f"------Perzeptron-Berechnung--------\n")
-        for i, (p, d) in enumerate(zip(self._q, self.directions)):
-            if d == action:
+        for i, p in enumerate(self._q):                # Perzeptron i gehört zu Richtungscode i
+            if i == action:
                 self.log_collector.add_log_txt(
-                    f"!!!Gefunden!!! bei Perz.: {i+1} mit Richtung: {d}.\n ---Übergebe an Perzeptron---\n")
-                p.lerne(state, reward, brain_output[i])
+                    f"!!!Gefunden!!! bei Perz.: {i+1} mit Richtung: {DIRECTIONS[i]}.\n ---Übergebe an Perzeptron---\n")
+                changed = p.lerne(state, reward, brain_output[i])
             else:
                 self.log_collector.add_log_txt(
-                    f"Perz.: {i+1} mit Richtung: {d}.\n ---Übergebe an Perzeptron---\n")
-                p.lerne(state, brain_output[i], brain_output[i])
+                    f"Perz.: {i+1} mit Richtung: {DIRECTIONS[i]}.\n ---Übergebe an Perzeptron---\n")
+                changed = p.lerne(state, brain_output[i], brain_output[i])
+            if changed:                                 # Gewichte geändert: Alle Ausgaben neu
+                self.invalidate_policy()
+                self.learned = True
             p.update_eta(self.output_error)
         self.eta = sum(p.eta for p in self._q) / len(self._q)
 
@@ -358,9 +645,11 @@ class Brain:        # Hier werden Die daten als auch die Methoden für ML bereit
                 visited.add(key)                # Merke bereits verarbeitete
                 old_q = self._q.get(key, -1)    # Prognose berechnung
                 self._q[key] = old_q + self.alpha * (g - old_q)
+                self.invalidate_policy(state)
+                self.learned = True
 
                 self.log_collector.add_log_txt(
-                    f"[t={len(self.episode) - 1 - i}] Status:{state} Richtung:{action} "
+                    f"[t={len(self.episode) - 1 - i}] Status:{state} Richtung:{DIRECTIONS[action]} "
                     f"Belohnung:{reward} Zukünftige Belohnung:{g:.2f}\n"
                     f"Vorhandener Q-Wert:{old_q:.2f} → Ersetzt durch:{self._q[key]:.2f} = Veränderung:{self._q[key] - old_q:.2f}\n"
                 )
@@ -374,7 +663,7 @@ class Brain:        # Hier werden Die daten als auch die Methoden für ML bereit
 
         Args:
             state (Any): Aktueller Zustand (z.B. Tuple mit Umgebungswerten)
-            action (str): Gewählte Aktion ('up', 'down', etc.)
+            action (int): Gewählte Aktion (Richtungscode UP, DOWN, LEFT, RIGHT)
             reward (float): Erhaltene Belohnung
             next_state (Any): Nächster Zustand nach der Aktion
         """
@@ -383,16 +672,18 @@ class Brain:        # Hier werden Die daten als auch die Methoden für ML bereit
         f"Gesammelte Werte!\n"
         f"Aktueller Status:\n"
         f"Oben: {state[0]:+d}      Unten: {state[1]:+d}       Links: {state[2]:+d}       Rechts: {state[3]:+d}\n"
-        f"Richtung: {action}, Belohnung: {reward}\n"
+        f"Richtung: {DIRECTIONS[action]}, Belohnung: {reward}\n"
         f"Nächste Position: \n"
         f"Oben: {next_state[0]:+d}      Unten: {next_state[1]:+d}       Links: {next_state[2]:+d}       Rechts: {next_state[3]:+d}\n")
 
         current_q = self._q.get((state, action), 0)                                             # Aktueller Q-Wert
-        next_q_value = [self._q.get((next_state, a), 0) for a in ['up', 'down', 'left', 'right']] # Q-Werte aller Aktionen im nächsten Zustand
+        next_q_value = [self._q.get((next_state, a), 0) for a in ACTIONS]                        # Q-Werte aller Aktionen im nächsten Zustand
         max_next_q = max(next_q_value)                                                          # Höchster Q-Wert im nächsten Zustand
         # Formel: Q(s,a) ← Q(s,a) + α [r + γ max_a' Q(s',a') − Q(s,a)]
         new_q = current_q + self.alpha * (reward + self.gamma * max_next_q - current_q)
         self._q[(state, action)] = new_q                                                        # Speichern für aktuellen Zustand
+        self.invalidate_policy(state)
+        self.learned = True
         self.log_collector.add_log_txt(f"Zuküftige möglichkeiten:\n"
         f"Oben: {float(next_q_value[0]):+.1f}   Unten: {float(next_q_value[1]):+.1f}     Links: {float(next_q_value[2]):+.1f}     Rechts: {float(next_q_value[3]):+.1f}\n"
         f"Maximaler Wert: {max_next_q:.1f}\n"
@@ -409,15 +700,71 @@ class Brain:        # Hier werden Die daten als auch die Methoden für ML bereit
         # print(f"Q-Wert für {state}, {action}: {self._q.get((state, action), 0):.2f}")
         return self._q.get((state, action), 0)
 
+    def get_q_values(self, state):
+        """
+        Gibt die auf eine Nachkommastelle gerundeten Q-Werte aller Richtungen zurück.
+        Zwischengespeichert je Zustand, bis ein Q-Update diesen Zustand ändert.
+
+        Returns:
+            tuple[float, float, float, float]: Q-Werte (oben, unten, links, rechts).
+        """
+        values = self._q_values_cache.get(state)
+        if values is None:
+            values = tuple(round(float(self._q.get((state, a), 0)), 1) for a in ACTIONS)
+            self._q_values_cache[state] = values
+        return values
+
+    def get_best_actions(self, state, last_direction=NO_DIRECTION):
+        """
+        Gibt die Richtungen mit dem höchsten Q-Wert zurück. Die Gegenrichtung von
+        `last_direction` wird mit -2 bewertet (Zurückgehen vermeiden).
+        Zwischengespeichert je (Zustand, letzte Richtung), die Liste nicht verändern.
+        """
+        key = (state, last_direction)
+        best_actions = self._best_actions_cache.get(key)
+        if best_actions is None:
+            q_value = list(self.get_q_values(state))
+            if last_direction != NO_DIRECTION:
+                q_value[OPPOSITES[last_direction]] -= 2                 # Rückwärtsgehen vermeiden
+            q_max = max(q_value)                                        # Höchster wert gewinnt
+            best_actions = [a for q, a in zip(q_value, ACTIONS) if q == q_max]
+            self._best_actions_cache[key] = best_actions
+        return best_actions
+
     def get_perzeptron_value(self, state):
-        output = []
-        for i, o in enumerate(state):
-            output.append(self._q[i].berechne(state))
+        """
+        Gibt die Ausgaben der 4 Perzeptrons (je Richtung 0/1) für `state` zurück.
+        Zwischengespeichert je Zustand, bis sich Gewichte ändern, die Liste nicht verändern.
+        """
+        output = self._perzeptron_cache.get(state)
+        if output is None:
+            output = [p.berechne(state) for p in self._q[:len(state)]]
+            self._perzeptron_cache[state] = output
         return output
 
     def get_policy_network(self):
         return self._q
 
+    def refresh_policy_inference(self):
+        """
+        Kopiert die aktuellen Gewichte des Policy-Network in NumPy-Arrays (Vorhersage ohne torch).
+        """
+        from network import NumpyPolicy
+        self._policy_inference = NumpyPolicy.from_network(self._q)
+
+    def get_policy_output(self, states):
+        """
+        Scores des Policy-Network je Richtung, gerechnet mit NumPy.
+
+        Args:
+            states: Ein Zustand (4,) oder mehrere Zustände (N, 4).
+
+        Returns:
+            np.ndarray: Form (4,) bzw. (N, 4).
+        """
+        if self._policy_inference is None: self.refresh_policy_inference()
+        return self._policy_inference(states)
+
     def train_perzeptron(self, settings):
         learning_data = DataStorage.load_data_from_csv_file(settings["BATCH_FILE"])
         self.log_collector.add_log_txt(f"Starte Training mit {settings['BATCH_FILE']}\n")
@@ -426,7 +773,7 @@ class Brain:        # Hier werden Die daten als auch die Methoden für ML bereit
             for row in learning_data.itertuples(index=False): # data training
                 state = tuple([int(x) for x in row.state.split(":")])
                 self.log_collector.add_log_txt(f"Datensatz: {state}, Aktion: {row.action}, Belohnung: 10\n")
-                self.perzeptron_calculate(state, row.action, reward=10)
+                self.perzeptron_calculate(state, DIRECTION_CODES[row.action], reward=10)
 
     def train_policy_network(self):
         print("Coming soon")
@@ -443,19 +790,24 @@ class Ant:
     Die Ant-Klasse repräsentiert eine Ameise in der Simulation.
     Sie bewegt sich in einer Weltmatrix basierend auf verschiedenen Strategien:
     zufällig, geruchsbasiert oder mittels Reinforcement Learning (Monte Carlo, Q-Learning).
+
+    Richtungen werden intern als Code (UP, DOWN, LEFT, RIGHT) geführt, Namen nur für Log und Anzeige.
     """
+    __slots__ = ("name", "world", "pos_x", "pos_y", "orka", "out_of_action", "last_direction",
+                 "last_last_direction", "eps", "odor", "error_memory", "odor_old", "verkir", "food_found",
+                 "period", "event_keysym_direction", "brain", "log_collector", "color")
+    directions = ACTIONS                                # Mögliche Richtungen (gemeinsam für alle Ameisen)
+
     def __init__(self, world, pos_x: int, pos_y: int, brain: Brain, name: str) -> None:
         self.name = name                                # z. B. "001"
         self.world = world                              # Enthält alle Weltobjekte (Matrix)
         self.pos_x = pos_x
         self.pos_y = pos_y
-        self.orka = int(ORKA)                           # Energie /  Schritte
+        self.orka = world.config.orka                   # Energie /  Schritte
         self.out_of_action = False
-        self.directions = DIRECTIONS                    # Mögliche Richtungen
-        self.last_direction = 'XXX'                     # Alte Richtungsanzeige
-        self.last_last_direction = 'XXX'                # Alte Richtungsanzeige x 2
-        self.opposites = {'up': 'down', 'down': 'up', 'left': 'right', 'right': 'left'}
-        self.eps = 0.1                                  # Monte-Carlo ε-Soft Policy
+        self.last_direction = NO_DIRECTION              # Alte Richtung (Code)
+        self.last_last_direction = NO_DIRECTION         # Alte Richtung x 2 (Code)
+        self.eps = world.config.eps                     # Monte-Carlo ε-Soft Policy
         self.odor = 100                                 # Geruchsstärke
         self.error_memory = 100
         self.odor_old = 0                               # Vorhergehender Geruch
@@ -470,6 +822,26 @@ class Ant:
             logger.critical("Fehler beim Gehirn übergabe")        # Fehler
         self.color = self.set_color()
 
+    def respawn(self, pos_x: int, pos_y: int) -> None:
+        """
+        Neues Leben an (pos_x, pos_y) für die nächste Generation: Energie, Zähler und
+        Richtungen zurücksetzen. Gehirn, Name und Log bleiben erhalten.
+        """
+        self.pos_x = pos_x
+        self.pos_y = pos_y
+        self.orka = self.world.config.orka
+        self.out_of_action = False
+        self.last_direction = NO_DIRECTION
+        self.last_last_direction = NO_DIRECTION
+        self.odor = 100
+        self.error_memory = 100
+        self.odor_old = 0
+        self.verkir = 0
+        self.food_found = 0
+        self.period = 0
+        self.event_keysym_direction = None
+        self.brain.episode = []
+
     def get_position(self):                          # Ant Position
         """
         Gibt die aktuelle (x, y)-Position der Ameise in der Welt zurück.
@@ -479,12 +851,26 @@ class Ant:
         """
         return self.pos_x, self.pos_y
 
+    def memory_usage(self):
+        """
+        Ungefährer Speicherbedarf der Ameise in Bytes.
+
+        Returns:
+            dict: {"ant": Ameisen-Objekt, "log", "episode", "q", "network" (siehe Brain.memory_usage), "total"}
+        """
+        seen = {id(self.world)}
+        usage = {"ant": sys.getsizeof(self)}
+        usage.update(self.brain.memory_usage(seen))
+        usage["total"] = sum(usage.values())
+        return usage
+
     def set_color(self):
-        if self.brain.ant_strategy == "random": return RANDOM_COLOR
-        if self.brain.ant_strategy == "odor": return ODOR_COLOR
+        config = self.world.config
+        if self.brain.ant_strategy == "random": return config.random_color
+        if self.brain.ant_strategy == "odor": return config.odor_color
         if self.brain.ant_strategy == "brain":
-            if self.brain.ant_machine_learning == "Monte-Carlo": return MONTE_CARLO_COLOR
-            if self.brain.ant_machine_learning == "Q-Learning": return Q_LEARNING_COLOR
+            if self.brain.ant_machine_learning == "Monte-Carlo": return config.monte_carlo_color
+            if self.brain.ant_machine_learning == "Q-Learning": return config.q_learning_color
         return (0, 0, 0)
 
     def get_position_turned(self):                      # Position gedreht
@@ -502,41 +888,26 @@ class Ant:
     def set_pos(self, pos_x: int, pos_y: int) -> None:        # Position setzen auserhalb des Quadrat nicht erlaubt
         """
         Setzt die Position der Ameise. Falls die neue Position außerhalb der Welt liegt,
-        wird sie auf die gegenüberliegende Seite gesetzt (Wrap-Around).
+        entscheidet die Topologie der Welt: gegenüberliegende Seite (torus) oder am Rand bleiben (walls).
 
         Args:
             pos_x (int): Neue X-Position.
             pos_y (int): Neue Y-Position.
         """
-        if pos_x < 0:                                   # Bim Bereich verlassen
-            self.pos_x = 99                             # Entgegengesetzter Seite rein
-        elif pos_x >= GRID_WIDTH:
-            self.pos_x = 0
-        else:
-            self.pos_x = pos_x
+        self.pos_x, self.pos_y = self.world.wrap_position(pos_x, pos_y)
 
-        if pos_y < 0:
-            self.pos_y = 99
-        elif pos_y >= GRID_WIDTH:
-            self.pos_y = 0
-        else:
-            self.pos_y = pos_y
-
-    def move_direction(self, direction: str) -> None: # Bewegung
+    def move_direction(self, direction) -> None: # Bewegung
         """
         Bewegt die Ameise in die angegebene Richtung.
 
         Args:
-            direction (str): Eine der vier Richtungen: 'up', 'down', 'left', 'right'.
-        """
-        if direction == 'up':
-            self.set_pos(self.pos_x, self.pos_y - 1)
-        elif direction == 'down':
-            self.set_pos(self.pos_x, self.pos_y + 1)
-        elif direction == 'left':
-            self.set_pos(self.pos_x - 1, self.pos_y)
-        elif direction == 'right':
-            self.set_pos(self.pos_x + 1, self.pos_y)
+            direction (int | str): Richtungscode (UP, DOWN, LEFT, RIGHT) oder Name ('up', 'down', 'left', 'right').
+        """
+        if direction is None or type(direction) is str:                 # Name (z.B. Tastatur) -> Code
+            direction = DIRECTION_CODES.get(direction, NO_DIRECTION)
+        if 0 <= direction < NO_DIRECTION:
+            self.pos_x, self.pos_y = self.world.wrap_position(self.pos_x + DX[direction], self.pos_y + DY[direction])
+            self.world.tick_actions[direction] += 1                     # Kennzahlen: Gewählte Richtungen
         else:
             logger.error(f"Die übergebene Richtung ist nicht möglich.({direction})")
 
@@ -571,6 +942,8 @@ class Ant:
             tuple[int, int, int, int]: Geruchsunterschiede (oben, unten, links, rechts),
             jeweils im Bereich [-1, 0, 1].
         """
+        if self.odor == self.world.get_odor(self.pos_x, self.pos_y):          # Eigener Geruch aktuell
+            return STATES[self.world.get_state_code(self.pos_x, self.pos_y)]  # Vorberechneter Zustand
         odor_up = int(max(-1, min(1, self.world.get_odor(self.pos_x, self.pos_y - 1) - self.odor)))     # Hole Geruch Oben
         odor_down = int(max(-1, min(1, self.world.get_odor(self.pos_x, self.pos_y + 1) - self.odor)))   # Hole Geruch Unten
         odor_left = int(max(-1, min(1, self.world.get_odor(self.pos_x - 1, self.pos_y) - self.odor)))   # Hole Geruch Links
@@ -587,7 +960,7 @@ class Ant:
         return self.error_memory
 
     def move_self(self, event):
-        self.event_keysym_direction = event.keysym.lower()
+        self.event_keysym_direction = DIRECTION_CODES.get(event.keysym.lower())    # Taste -> Richtungscode
         if self.brain.ant_strategy == "self":
             self.move_direction(self.event_keysym_direction)
             self.log_collector.add_log_txt(
@@ -607,14 +980,13 @@ class Ant:
             f"Geruchswahrnehmung Position: {self.odor}\nBerechneter Status:\n"
             f"Oben: {state[0]:+d}      Unten: {state[1]:+d}       Links: {state[2]:+d}       Rechts: {state[3]:+d}\n")
         if random.random() < self.brain.eta:  # eps Exploration: zufällige Richtung wählen
-            action = random.choice(self.directions)  # self.direction = ['up', 'down', 'left', 'right']
+            action = random.choice(self.directions)  # Code von UP, DOWN, LEFT, RIGHT
             self.log_collector.add_log_txt(
                 f"Ereignis Zufällig gehen eingetrofen\n"
-                f"Bisher die Besten aktionen: {self.directions}, Neue Richtungswahl: {action}\n")
+                f"Bisher die Besten aktionen: {DIRECTIONS}, Neue Richtungswahl: {DIRECTIONS[action]}\n")
         else:
-            policy_network = self.brain.get_policy_network()
-            brain_output = policy_network(torch.tensor(state, dtype=torch.float32)) # state = torch.tensor([0.1, 0.0, 0.3, -0.2])
-            action = self.directions[torch.argmax(brain_output).item()]
+            brain_output = self.brain.get_policy_output(state)      # NumPy-Vorhersage, ohne Autograd
+            action = int(brain_output.argmax())                     # Ausgabeindex = Richtungscode
             # self.log_collector.add_log_txt(
             #     f"Policy Network Ausgabe: {brain_output}, Bestimmte Aktion: {action}\n")
             # self.brain.output_error = self.calculate_error(brain_output) # in %
@@ -625,20 +997,19 @@ class Ant:
             #         best_directions.append(self.directions[i])
             if best_directions:
                 action = random.choice(best_directions)                 # Richtung Höchster wert merken
-                if self.opposites.get(action) == self.last_direction:   # zurück gehen verboten
-                    directions = self.directions.copy()                 # Richtungen kopieren
-                    del directions[directions.index(action)]            # Zurück löschen
+                if OPPOSITES[action] == self.last_direction:            # zurück gehen verboten
+                    directions = [d for d in self.directions if d != action]    # Richtungen ohne Zurück
                     action = random.choice(directions)                  # Richtung Zufällig ohne Zurück
                     self.log_collector.add_log_txt(
                         f"Ereignis Zurück gehen eingetrofen\n"
-                        f"Vorhergehende Richtungswahl: {self.last_direction}\n"
-                        f"Zurück gehen nicht erlaubt. Neue Richtungswahl: {action}\n")
+                        f"Vorhergehende Richtungswahl: {DIRECTION_NAMES[self.last_direction]}\n"
+                        f"Zurück gehen nicht erlaubt. Neue Richtungswahl: {DIRECTIONS[action]}\n")
             else:
                 action = random.choice(self.directions)
             self.log_collector.add_log_txt(
                 f"Policy Network Ausgabe: \n{brain_output}\n" # , Fehlerrate: {self.brain.output_error}%
-                f"Berechnete Richtungen: {best_directions} Gewählte Richtung: {action}\n"
-                f"Vorhergehende Richtungswahl: {self.last_direction} \n")
+                f"Berechnete Richtungen: {[DIRECTIONS[d] for d in best_directions]} Gewählte Richtung: {DIRECTIONS[action]}\n"
+                f"Vorhergehende Richtungswahl: {DIRECTION_NAMES[self.last_direction]} \n")
 
         self.move_direction(action)                                 # Bewegung ausführen
         self.last_direction = action
@@ -650,8 +1021,8 @@ class Ant:
                 reward = 20
                 self.log_collector.add_log_txt(f" --- !!!Essen gefunden!!! --- \n"
                                                f"Belohnung: {reward}\n")
-        action_idx = self.directions.index(action)
-        self.brain.policy_network_calculate(state, action_idx, reward)
+        with profiler.phase("learn"):
+            self.brain.policy_network_calculate(state, action, reward)
         self.log_collector.add_log_txt(f" --- !!!Bewegung!!! --- \n"
                                        f"Neuer Positionsgeruch:{self.odor}\n")
 
@@ -666,33 +1037,32 @@ class Ant:
             f"Geruchswahrnehmung Position: {self.odor}\nBerechneter Status:\n"
             f"Oben: {state[0]:+d}      Unten: {state[1]:+d}       Links: {state[2]:+d}       Rechts: {state[3]:+d}\n")
         if random.random() < self.brain.eta:  # eps Exploration: zufällige Richtung wählen
-            action = random.choice(self.directions)  # self.direction = ['up', 'down', 'left', 'right']
+            action = random.choice(self.directions)  # Code von UP, DOWN, LEFT, RIGHT
             self.log_collector.add_log_txt(
                 f"Ereignis Zufällig gehen eingetrofen\n"
-                f"Bisher die Besten aktionen: {self.directions}, Neue Richtungswahl: {action}\n")
+                f"Bisher die Besten aktionen: {DIRECTIONS}, Neue Richtungswahl: {DIRECTIONS[action]}\n")
         else:
             brain_output = self.brain.get_perzeptron_value(state)
             self.brain.output_error = self.calculate_error(brain_output) # in %
             best_directions = []
             for i, o in enumerate(brain_output):
                 if o > 0:
-                    best_directions.append(self.directions[i])
+                    best_directions.append(i)                       # Ausgabeindex = Richtungscode
             if best_directions:
                 action = random.choice(best_directions)                 # Richtung Höchster wert merken
-                if self.opposites.get(action) == self.last_direction:   # zurück gehen verboten
-                    directions = self.directions.copy()                 # Richtungen kopieren
-                    del directions[directions.index(action)]            # Zurück löschen
+                if OPPOSITES[action] == self.last_direction:            # zurück gehen verboten
+                    directions = [d for d in self.directions if d != action]    # Richtungen ohne Zurück
                     action = random.choice(directions)                  # Richtung Zufällig ohne Zurück
                     self.log_collector.add_log_txt(
                         f"Ereignis Zurück gehen eingetrofen\n"
-                        f"Vorhergehende Richtungswahl: {self.last_direction}\n"
-                        f"Zurück gehen nicht erlaubt. Neue Richtungswahl: {action}\n")
+                        f"Vorhergehende Richtungswahl: {DIRECTION_NAMES[self.last_direction]}\n"
+                        f"Zurück gehen nicht erlaubt. Neue Richtungswahl: {DIRECTIONS[action]}\n")
             else:
                 action = random.choice(self.directions)
             self.log_collector.add_log_txt(
                 f"Perzeptron Output: {brain_output}, Fehlerrate: {self.brain.output_error}%\n"
-                f"Berechnete Richtungen: {best_directions} Gewählte Richtung: {action}\n"
-                f"Vorhergehende Richtungswahl: {self.last_direction} \n")
+                f"Berechnete Richtungen: {[DIRECTIONS[d] for d in best_directions]} Gewählte Richtung: {DIRECTIONS[action]}\n"
+                f"Vorhergehende Richtungswahl: {DIRECTION_NAMES[self.last_direction]} \n")
 
         self.move_direction(action)                                 # Bewegung ausführen
         self.last_direction = action
@@ -704,7 +1074,8 @@ class Ant:
                 reward = 20
                 self.log_collector.add_log_txt(f" --- !!!Essen gefunden!!! --- \n"
                                                f"Belohnung: {reward}\n")
-        self.brain.perzeptron_calculate(state, action, reward)
+        with profiler.phase("learn"):
+            self.brain.perzeptron_calculate(state, action, reward)
         self.log_collector.add_log_txt(f" --- !!!Bewegung!!! --- \n"
                                        f"Neuer Positionsgeruch:{self.odor}\n")
 
@@ -716,7 +1087,7 @@ class Ant:
         Berechnet Belohnung und aktualisiert das Q-Table im Brain.
         """
         state = self.calculate_state()                                      # Aktueller Status
-        q_value = [round(float(self.brain.get_q_value(state, d)), 1) for d in self.directions] # Q-Werte für alle Richtungen
+        q_value = self.brain.get_q_values(state)                            # Q-Werte für alle Richtungen
         self.log_collector.add_log_txt(
             f"Position: X: {self.pos_x}, Y: {self.pos_y}, Energie: {self.orka}, Futtergefunden: {self.food_found}\n"
             f"------------------------------------------------------------------------------------------\n"
@@ -725,29 +1096,23 @@ class Ant:
             f"Gefundene Erfahrungen im Brain:\n"
             f"Oben: {float(q_value[0]):+.1f}   Unten: {float(q_value[1]):+.1f}     Links: {float(q_value[2]):+.1f}     Rechts: {float(q_value[3]):+.1f}\n")
 
-        q_value.clear()
-        for d in self.directions:                                   # Gehe alle 4 Richtungen durch
-            q = round(float(self.brain.get_q_value(state, d)), 1)   # Hole jeweils Q Werte
-            if self.opposites.get(d) == self.last_direction:        # Finde zurückgehen
-                self.log_collector.add_log_txt(
-                    f"Berücksichtigung zurückgehen minimieren! Richtung: {self.last_direction}\n"
-                    f"Alte Bewertung: {q:+.1f} Erschwert. Neue bewertung: {q - 2:+.1f}\n")
-                q -= 2                                              # Rückwärtsgehen vermeiden
-            q_value.append(q)                                       # In die Liste
-
-        q_max = max(q_value)  # Höchster wert gewinnt
-        best_actions = [d for q, d in zip(q_value, self.directions) if q == q_max]  # Vier Richtungen durchgehen
+        if self.last_direction != NO_DIRECTION:                     # Finde zurückgehen
+            q = q_value[OPPOSITES[self.last_direction]]
+            self.log_collector.add_log_txt(
+                f"Berücksichtigung zurückgehen minimieren! Richtung: {DIRECTION_NAMES[self.last_direction]}\n"
+                f"Alte Bewertung: {q:+.1f} Erschwert. Neue bewertung: {q - 2:+.1f}\n")
+        best_actions = self.brain.get_best_actions(state, self.last_direction)  # Höchster wert gewinnt (zwischengespeichert)
 
         if random.random() < self.eps:                              # Exploration: zufällige Richtung wählen
-            action = random.choice(self.directions)                 # self.direction = ['up', 'down', 'left', 'right']
+            action = random.choice(self.directions)                 # Code von UP, DOWN, LEFT, RIGHT
             self.log_collector.add_log_txt(
                 f"Ereignis Zufällig gehen eingetrofen\n"
-                f"Bisher die Besten aktionen: {best_actions}, Neue Richtungswahl: {action}\n")
+                f"Bisher die Besten aktionen: {[DIRECTIONS[d] for d in best_actions]}, Neue Richtungswahl: {DIRECTIONS[action]}\n")
         else:
             action = random.choice(best_actions)                                        # Richtung Höchster wert merken
             self.log_collector.add_log_txt(
-                f"Berechnete Richtungen: {best_actions} Gewählte Richtung: {action}\n"
-                f"Vorhergehende Richtungswahl: {self.last_direction} \n")
+                f"Berechnete Richtungen: {[DIRECTIONS[d] for d in best_actions]} Gewählte Richtung: {DIRECTIONS[action]}\n"
+                f"Vorhergehende Richtungswahl: {DIRECTION_NAMES[self.last_direction]} \n")
 
         self.move_direction(action)                                         # Bewegung ausführen
         self.last_direction = action
@@ -760,7 +1125,8 @@ class Ant:
                 reward += 10
                 self.log_collector.add_log_txt(f" --- !!!Essen gefunden!!! --- \n"
                                                f"Belohnung: {reward}\n")
-        self.brain.q_learning_calculate(state, action, reward, next_state) # Q-Learning Update
+        with profiler.phase("learn"):
+            self.brain.q_learning_calculate(state, action, reward, next_state)  # Q-Learning Update
         self.log_collector.add_log_txt(f" --- !!!Bewegung!!! --- \n"
             f"Neuer Positionsgeruch:{self.odor}\n")
         self.log_collector.add_new_period()
@@ -775,7 +1141,7 @@ class Ant:
         Falls Futter gefunden wird, wird die Monte-Carlo-Rückpropagierung ausgelöst.
         """
         state = self.calculate_state()                                                  # Aktueller Status
-        q_value = [round(float(self.brain.get_q_value(state, d)), 1) for d in self.directions]
+        q_value = self.brain.get_q_values(state)
         self.log_collector.add_log_txt(
             f"Position: X: {self.pos_x}, Y: {self.pos_y}, Energie: {self.orka}, Futtergefunden: {self.food_found}\n"
             f"------------------------------------------------------------------------------------------\n"
@@ -783,44 +1149,39 @@ class Ant:
             f"Oben: {state[0]:+d}      Unten: {state[1]:+d}       Links: {state[2]:+d}       Rechts: {state[3]:+d}\n"
             f"Gefundene Erfahrungen im Brain:\n"
             f"Oben: {float(q_value[0]):+.1f}   Unten: {float(q_value[1]):+.1f}     Links: {float(q_value[2]):+.1f}     Rechts: {float(q_value[3]):+.1f}\n")
-        q_value.clear()
-        for d in self.directions:  # Gehe alle 4 Richtungen durch
-            q = round(float(self.brain.get_q_value(state, d)), 1)
-            if self.opposites.get(d) == self.last_direction:
-                self.log_collector.add_log_txt(
-                    f"Berücksichtigung zurückgehen minimieren! Richtung: {self.last_direction}\n"
-                    f"Alte Bewertung: {q:+.1f} Erschwert. Neue bewertung: {q-2:+.1f}\n")
-                q -= 2
-            q_value.append(q)
-
-        q_max = max(q_value)  # Höchster wert gewinnt
-        best_actions = [d for q, d in zip(q_value, self.directions) if q == q_max]  # Vier Richtungen durchgehen
+        if self.last_direction != NO_DIRECTION:
+            q = q_value[OPPOSITES[self.last_direction]]
+            self.log_collector.add_log_txt(
+                f"Berücksichtigung zurückgehen minimieren! Richtung: {DIRECTION_NAMES[self.last_direction]}\n"
+                f"Alte Bewertung: {q:+.1f} Erschwert. Neue bewertung: {q-2:+.1f}\n")
+        best_actions = self.brain.get_best_actions(state, self.last_direction)  # Höchster wert gewinnt (zwischengespeichert)
 
         if random.random() < self.eps:  # Exploration: zufällige Richtung wählen
-            action = random.choice(self.directions)  # self.direction = ['up', 'down', 'left', 'right']
+            action = random.choice(self.directions)  # Code von UP, DOWN, LEFT, RIGHT
             self.log_collector.add_log_txt(
                 f"Ereignis Zufällig gehen eingetrofen\n"
-                f"Bisher die Besten aktionen: {best_actions}, Neue Richtungswahl: {action}\n")
+                f"Bisher die Besten aktionen: {[DIRECTIONS[d] for d in best_actions]}, Neue Richtungswahl: {DIRECTIONS[action]}\n")
         else:
             action = random.choice(best_actions)                                        # Richtung Höchster wert merken
             self.log_collector.add_log_txt(
-                f"Berechnete Richtungen: {best_actions} Gewählte Richtung: {action}\n"
-                f"Vorhergehende Richtungswahl: {self.last_direction} \n")
+                f"Berechnete Richtungen: {[DIRECTIONS[d] for d in best_actions]} Gewählte Richtung: {DIRECTIONS[action]}\n"
+                f"Vorhergehende Richtungswahl: {DIRECTION_NAMES[self.last_direction]} \n")
         self.move_direction(action)                                         # --- Bewege dich ---
         self.last_direction = action
         reward = -0.2                                                       # Strafe
-        self.log_collector.add_log_txt(f"Bewegung nach: {action}, Kleine Bestrafung: {reward}\n")
+        self.log_collector.add_log_txt(f"Bewegung nach: {DIRECTIONS[action]}, Kleine Bestrafung: {reward}\n")
         self.odor = self.world.get_odor(self.pos_x, self.pos_y)             # Hole Geruch
         for food in self.world.foods:                                       # Foods durchsuchen
             if food.get_position() == self.get_position():                  # Wenn Futter gefunden
                 reward += 10                                                # Belohnung
                 self.brain.episode.append((state, action, reward))          # Schreibe den Datensatz in episode
                 self.log_collector.add_log_txt(f" --- !!!Essen gefunden!!! --- \n"
-                                               f"Belohnung: {reward}, Merke in Episode:{(state, action, reward)}\n")
-                self.brain.monte_carlo_calculate()                          # Führe Monte-Carlo-Berechnung durch
+                                               f"Belohnung: {reward}, Merke in Episode:{(state, DIRECTIONS[action], reward)}\n")
+                with profiler.phase("learn"):
+                    self.brain.monte_carlo_calculate()                      # Führe Monte-Carlo-Berechnung durch
                 return                                                      # Episode bereits verarbeitet also return
         self.brain.episode.append((state, action, reward))                  # Schreibe den Datensatz in episode
-        self.log_collector.add_log_txt(f"Merke in Episode:{(state, action, reward)}\n")
+        self.log_collector.add_log_txt(f"Merke in Episode:{(state, DIRECTIONS[action], reward)}\n")
         self.log_collector.add_new_period()
 
     def move_odor(self) -> None:  # Kombination aus Zufall und "Geruch folgen" Strategie
@@ -836,21 +1197,20 @@ class Ant:
         max_value = max(state)  # Höchster wert gewinnt
         new_directions = [d for q, d in zip(state, self.directions) if q == max_value]  # Vier Richtungen durchgehen
         action = random.choice(new_directions)  # Richtung Höchster wert merken
-        if self.opposites.get(action) == self.last_direction:           # zurück gehen verboten
-            directions = self.directions.copy()                         # Richtungen kopieren
-            del directions[directions.index(action)]                    # Zurück löschen
+        if OPPOSITES[action] == self.last_direction:                    # zurück gehen verboten
+            directions = [d for d in self.directions if d != action]    # Richtungen ohne Zurück
             action = random.choice(directions)                          # Richtung Zufällig ohne Zurück
             self.log_collector.add_log_txt(
                 f"Ereignis Zurück gehen eingetrofen\n"
-                f"Vorhergehende Richtungswahl: {self.last_direction}\n"
-                f"Zurück gehen nicht erlaubt. Neue Richtungswahl: {action}\n")
+                f"Vorhergehende Richtungswahl: {DIRECTION_NAMES[self.last_direction]}\n"
+                f"Zurück gehen nicht erlaubt. Neue Richtungswahl: {DIRECTIONS[action]}\n")
         self.log_collector.add_log_txt(
             f"Ameise:{self.name}, Strategie: {self.brain.ant_strategy}, Lernmethode:{self.brain.ant_machine_learning}\n"
             f"Position: X:{self.pos_x}, Y:{self.pos_y}, Energie:{self.orka}, Futtergefunden:{self.food_found}\n"
             f"------------------------------------------------------------------------------------------\n"
             f"Geruchswahrnehmung Position: {self.odor}\n"
             f"Oben:{state[0]} Unten:{state[1]} Links:{state[2]} Rechts:{state[3]}\n"
-            f"Berechnete Richtungen:{new_directions} Gewählte Richtung:{action}\n"
+            f"Berechnete Richtungen:{[DIRECTIONS[d] for d in new_directions]} Gewählte Richtung:{DIRECTIONS[action]}\n"
             f"------------------------------------------------------------------------------------------\n")
         self.move_direction(action)
         self.last_direction = action
@@ -870,13 +1230,42 @@ class Ant:
             self.event_keysym_direction = None
         self.move_direction(direction)
         self.log_collector.add_log_txt(f"Position: X:{self.pos_x}, Y:{self.pos_y}, Energie:{self.orka}, Futtergefunden:{self.food_found}\n"
-                                       f"Bewegungsrichtung Richtung: {direction}")
+                                       f"Bewegungsrichtung Richtung: {DIRECTIONS[direction]}")
         self.log_collector.add_new_period()
 
+class ListView(Sequence):
+    """
+    Schreibgeschützte Sicht auf eine Liste ohne Kopie (Index, len, Iteration, in).
+    Änderungen der Liste sind sofort sichtbar.
+    """
+    __slots__ = ("_items",)
+
+    def __init__(self, items):
+        self._items = items
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __repr__(self):
+        return f"ListView({self._items!r})"
+
 class Ants:
     """
     Eine Sammlung von Ameisen (Ant-Objekten), die auf einer gemeinsamen Welt (World) operieren.
     Diese Klasse verwaltet die Erzeugung, Iteration und Verwaltung der Ameisen.
+
+    Iteration und len() umfassen nur die aktiven Ameisen. Ameisen ohne Energie werden am Ende
+    eines Simulationsschritts aus der aktiven Liste genommen (retire_exhausted) und, falls
+    ANT_ARCHIVE bzw. GENERATION aktiv ist, mit Statistik und Gehirn im Archiv aufbewahrt.
+
+    Namen sind fortlaufende Nummern ("001", "002", ...), die nie wiederverwendet werden.
+    get_ant findet eine Ameise über den Namen in O(1).
     """
     def __init__(self, world) -> None:
         """
@@ -885,18 +1274,24 @@ class Ants:
         :param world: Das World-Objekt, in dem sich die Ameisen bewegen.
         """
         self.world = world
-        self._ants = []
+        self._ants = []             # Aktive Ameisen
+        self._retired = []          # Archiv: Ameisen ohne Energie
+        self._by_name = {}          # Name -> Ameise (aktiv und archiviert)
+        self.next_id = 1            # Nächste freie Nummer für den Namen (nie wiederverwendet)
 
     def __iter__(self):
-        """Ermöglicht die Iteration über alle Ant-Objekte."""
+        """Ermöglicht die Iteration über alle aktiven Ant-Objekte."""
         return iter(self._ants)
 
     def __delitem__(self, index) -> None:
         """Löscht eine Ameise anhand ihres Index."""
+        removed = self._ants[index]
         del self._ants[index]  # del liste[1]  löscht das Element über Index
+        for ant in (removed if isinstance(index, slice) else [removed]):
+            self._by_name.pop(ant.name, None)
 
     def __len__(self) -> int:
-        """Gibt die Anzahl der Ameisen zurück."""
+        """Gibt die Anzahl der aktiven Ameisen zurück."""
         return len(self._ants)
 
     def index(self, item: Ant) -> int:
@@ -910,44 +1305,132 @@ class Ants:
 
     def clear(self):  # Leert die Liste
         """
-        Leert die gesamte Liste der Ameisen.
+        Leert die gesamte Liste der Ameisen (auch das Archiv). Die Nummerierung läuft weiter.
         """
         self._ants.clear()
+        self._retired.clear()
+        self._by_name.clear()
+
+    def iter_all(self):
+        """Iteration über aktive und archivierte Ameisen."""
+        return itertools.chain(self._ants, self._retired)
+
+    def retire_exhausted(self):
+        """
+        Nimmt Ameisen ohne Energie (out_of_action) aus der aktiven Liste.
+        Die Reihenfolge der übrigen bleibt erhalten, damit der Ablauf reproduzierbar ist.
+        """
+        archive = self.world.config.ant_archive or self.world.config.generation    # Generationen brauchen die Gehirne
+        alive = []
+        for ant in self._ants:
+            if not ant.out_of_action:
+                alive.append(ant)
+            elif archive:
+                self._retired.append(ant)
+            else:
+                self._by_name.pop(ant.name, None)
+        self._ants[:] = alive                   # In place: Sichten (show_ants) bleiben gültig
+
+    def revive_all(self):
+        """Holt alle archivierten Ameisen zurück in die aktive Liste (neue Generation)."""
+        self._ants.extend(self._retired)
+        self._retired.clear()
+
+    def count_retired(self) -> int:
+        """Gibt die Anzahl der archivierten Ameisen zurück."""
+        return len(self._retired)
+
+    def show_retired(self):
+        """
+        Gibt die archivierten Ameisen als schreibgeschützte Sicht (ohne Kopie) zurück.
+
+        :return: ListView von Ant-Instanzen.
+        """
+        return ListView(self._retired)
+
+    def add_ant(self, ant: Ant) -> None:
+        """Fügt eine fertige Ameise hinzu (z.B. aus einem Snapshot)."""
+        if ant.name in self._by_name:
+            raise ValueError(f"Ameise {ant.name} ist bereits vorhanden.")
+        self._ants.append(ant)
+        self._by_name[ant.name] = ant
+        if ant.name.isdigit():                  # Nummerierung hinter vorhandene Namen setzen
+            self.next_id = max(self.next_id, int(ant.name) + 1)
 
     def get_ant(self, name):
-        for ant in self:
-            if ant.name == name:
-                return ant
-        logger.error("Fehler: Ameise nicht vorhanden.")
-        return None
+        """
+        Sucht eine Ameise (aktiv oder archiviert) über ihren Namen in O(1).
+        """
+        ant = self._by_name.get(name)
+        if ant is None: logger.error("Fehler: Ameise nicht vorhanden.")
+        return ant
 
-    def generate_ants(self, crowd, ant_strategy, ant_machine_learning = None, csv_load = True):
+    def search(self, query="", limit=50):
+        """
+        Sucht Ameisen (aktiv und archiviert) für die Auswahl, die meisten Futterfunde zuerst.
+
+        Alle Begriffe im Suchtext müssen passen: ">n" bzw. ">=n" für Futterfunde,
+        sonst Teil von Name, Strategie oder Lernverfahren (Groß/Klein egal).
+        Ohne Suchtext ergibt sich die Bestenliste.
+
+        :param query: Suchtext, z.B. "q-learning >10" oder "007".
+        :param limit: Höchstens so viele Treffer (ohne die ganze Population zu sortieren).
+        :return: Liste von Ant-Instanzen.
+        """
+        min_food, words = 0, []
+        for term in query.lower().split():
+            number = term.lstrip(">=")
+            if term.startswith(">") and number.isdigit():
+                min_food = max(min_food, int(number) + (0 if "=" in term else 1))
+            else:
+                words.append(term)
+
+        def matches(ant):
+            if ant.food_found < min_food: return False
+            if not words: return True
+            text = f"{ant.name} {ant.brain.ant_strategy} {ant.brain.ant_machine_learning}".lower()
+            return all(word in text for word in words)
+
+        return heapq.nlargest(limit, filter(matches, self.iter_all()), key=lambda ant: ant.food_found)
+
+    def generate_ants(self, crowd, ant_strategy, ant_machine_learning = None, csv_load = True, genomes = None):
         """
         Erzeugt eine Anzahl von Ameisen mit gegebener Strategie (und ggf. ML-Verfahren).
 
         :param crowd: Anzahl der zu erzeugenden Ameisen.
         :param ant_strategy: Bewegungsstrategie ('random', 'odor', 'brain').
         :param ant_machine_learning: Optional, bei Strategie 'brain': ML-Methode ('Monte-Carlo', 'Q-Learning').
+        :param genomes: Optional, Erbgut je Ameise (Brain.get_genome) statt CSV bzw. leerem Gehirn.
+        :return: Liste der neuen Ameisen.
         """
+        ants = []
         for i in range(crowd):
-            pos_x = random.randint(2, GRID_WIDTH - 2)
-            pos_y = random.randint(2, GRID_HEIGHT - 2)
-            name = str(len(self.world.ants) + 1).zfill(3)
-            brain = Brain(name=name, ant_strategy=ant_strategy, ant_machine_learning=ant_machine_learning, csv_load=csv_load)
-            self._ants.append(Ant(self.world, pos_x, pos_y, brain, name=name))
+            pos_x = random.randint(2, self.world.grid_width - 2)
+            pos_y = random.randint(2, self.world.grid_height - 2)
+            name = str(self.next_id).zfill(3)  # Fortlaufend, auch nach Löschen keine doppelten Namen
+            genome = genomes[i] if genomes else None
+            brain = Brain(name=name, ant_strategy=ant_strategy, data={} if genome is not None else None,
+                          ant_machine_learning=ant_machine_learning, csv_load=csv_load, config=self.world.config)
+            brain.set_genome(genome)
+            ant = Ant(self.world, pos_x, pos_y, brain, name=name)
+            self.add_ant(ant)
+            ants.append(ant)
+        return ants
 
     def show_ants(self):
         """
-        Gibt alle gespeicherten Ameisen als Liste zurück.
+        Gibt die aktiven Ameisen als schreibgeschützte Sicht (ohne Kopie) zurück.
 
-        :return: Liste von Ant-Instanzen.
+        :return: ListView von Ant-Instanzen.
         """
-        return [x for x in self._ants]
+        return ListView(self._ants)
 
 class Food:
     """
     Repräsentiert eine Futterquelle mit Position, Kalorienwert und Namen.
     """
+    __slots__ = ("name", "pos_x", "pos_y", "calories", "color")
+
     def __init__(self, pos_x: int, pos_y: int, calories: int = 10, name: str = "Zucker", color=FOOD_FIXED_SIZE_COLOR) -> None:
         """
         Initialisiert das Futterobjekt.
@@ -971,22 +1454,28 @@ class Food:
         """
         return self.pos_x, self.pos_y
 
-    def set_new_position(self) -> None:             # Wenn das Futter gefunden wurde, neu Positionieren
+    def set_new_position(self, grid_width: int, grid_height: int) -> None:  # Wenn das Futter gefunden wurde, neu Positionieren
         """
         Setzt eine neue zufällige Position für das Futter innerhalb der erlaubten Weltgrenzen.
+
+        :param grid_width: Breite der Welt.
+        :param grid_height: Höhe der Welt.
         """
-        self.pos_x = random.randint(2, GRID_WIDTH - 2)
-        self.pos_y = random.randint(2, GRID_HEIGHT - 2)
+        self.pos_x = random.randint(2, grid_width - 2)
+        self.pos_y = random.randint(2, grid_height - 2)
 
 class Foods:
     """
     Verwaltung einer Sammlung von Food-Objekten in der Welt.
     Ermöglicht Erzeugen, Iterieren, Löschen und Anzeigen von Futter.
     """
-    def __init__(self) -> None:
+    def __init__(self, world) -> None:
         """
         Initialisiert die Foods-Sammlung.
+
+        :param world: Das World-Objekt, in dem das Futter liegt.
         """
+        self.world = world
         self._foods = []
         self.set_food = 0
 
@@ -1021,12 +1510,18 @@ class Foods:
         """
         self._foods.clear()
 
+    def add_food(self, food: Food) -> None:
+        """Fügt ein fertiges Food-Objekt hinzu (z.B. aus einem Snapshot)."""
+        self._foods.append(food)
+
     def generate_food(self, crowd=1):
         """
         Erzeugt mehrere Food-Objekte an zufälligen Positionen.
         """
         for _ in range(crowd): #random.randint(5, 100)
-            self._foods.append(Food(random.randint(2, GRID_WIDTH - 2), random.randint(2, GRID_HEIGHT - 2), int(FOOD_RANGE)))
+            self._foods.append(Food(random.randint(2, self.world.grid_width - 2),
+                                    random.randint(2, self.world.grid_height - 2), self.world.config.food_range,
+                                    color=self.world.config.food_fixed_size_color))
         self.set_food = len(self._foods)
 
     def show_foods(self):
@@ -1035,66 +1530,882 @@ class Foods:
         """
         return [x for x in self._foods]
 
+class TileGrid:
+    """
+    Dünn besetztes 2D-Feld (z.B. Geruchsfeld) für sehr große Welten.
+
+    Das Feld wird in quadratische Kacheln (tile_size x tile_size) aufgeteilt. Nur Kacheln, die
+    einen Wert ungleich `fill` enthalten, werden als NumPy-Array angelegt. Der Speicherbedarf
+    wächst damit mit der Geruchsabdeckung und nicht mit der Weltgröße.
+
+    Zugriff wie bei einem NumPy-Array:
+    - grid[y, x]            -> Einzelwert
+    - grid[ys, xs]          -> Werte für viele Positionen (Arrays)
+    - grid[y0:y1, x0:x1]    -> dichte Kopie des Bereichs (auch mit Schrittweite, z.B. grid[::10, ::10])
+    - grid[y0:y1, x0:x1] = values
+    """
+    def __init__(self, shape, tile_size=64, dtype=np.uint16, fill=0):
+        """
+        Args:
+            shape (Tuple[int, int]): (Höhe, Breite) des Feldes.
+            tile_size (int): Kantenlänge einer Kachel.
+            dtype: Datentyp der Werte.
+            fill: Wert außerhalb der angelegten Kacheln.
+        """
+        self.shape = tuple(shape)
+        self.tile_size = int(tile_size)
+        self.dtype = np.dtype(dtype)
+        self.fill = fill
+        self.ndim = 2
+        self.tiles = {}     # z.B. {(tile_y, tile_x): np.ndarray}
+
+    @property
+    def nbytes(self):
+        """Belegter Speicher aller angelegten Kacheln in Bytes."""
+        return sum(tile.nbytes for tile in self.tiles.values())
+
+    def __array__(self, dtype=None, copy=None):
+        """Dichte Kopie des gesamten Feldes (z.B. für Matplotlib)."""
+        array = self[:, :]
+        return array if dtype is None else array.astype(dtype)
+
+    def _slices(self, key):
+        """Wandelt einen Index (int/slice, int/slice) in zwei Slices um."""
+        slices = []
+        for k, size in zip(key, self.shape):
+            if isinstance(k, slice):
+                slices.append(slice(*k.indices(size)))
+            else:
+                k = int(k) + size if k < 0 else int(k)
+                slices.append(slice(k, k + 1, 1))
+        return slices
+
+    def __getitem__(self, key):
+        y, x = key
+        t = self.tile_size
+        if isinstance(y, np.ndarray) or isinstance(x, np.ndarray) or isinstance(y, list):
+            return self.gather(np.asarray(y), np.asarray(x))
+        if not isinstance(y, slice) and not isinstance(x, slice):      # Einzelwert
+            tile = self.tiles.get((y // t, x // t))
+            return self.dtype.type(self.fill) if tile is None else tile[y % t, x % t]
+        sy, sx = self._slices(key)
+        rows, cols = np.arange(sy.start, sy.stop, sy.step), np.arange(sx.start, sx.stop, sx.step)
+        out = np.full((rows.size, cols.size), self.fill, dtype=self.dtype)
+        if rows.size and cols.size:
+            tile_rows, tile_cols = rows // t, cols // t
+            for ty in np.unique(tile_rows):
+                r_sel = np.flatnonzero(tile_rows == ty)
+                for tx in np.unique(tile_cols):
+                    tile = self.tiles.get((int(ty), int(tx)))
+                    if tile is not None:
+                        c_sel = np.flatnonzero(tile_cols == tx)
+                        out[np.ix_(r_sel, c_sel)] = tile[np.ix_(rows[r_sel] % t, cols[c_sel] % t)]
+        if not isinstance(y, slice): out = out[0]
+        elif not isinstance(x, slice): out = out[:, 0]
+        return out
+
+    def __setitem__(self, key, values):
+        sy, sx = self._slices(key)
+        if sy.step != 1 or sx.step != 1:
+            raise ValueError("TileGrid: Schreiben nur ohne Schrittweite möglich.")
+        t = self.tile_size
+        values = np.broadcast_to(np.asarray(values, dtype=self.dtype), (sy.stop - sy.start, sx.stop - sx.start))
+        for ty in range(sy.start // t, (sy.stop - 1) // t + 1 if sy.stop > sy.start else 0):
+            y0, y1 = max(sy.start, ty * t), min(sy.stop, (ty + 1) * t)
+            for tx in range(sx.start // t, (sx.stop - 1) // t + 1 if sx.stop > sx.start else 0):
+                x0, x1 = max(sx.start, tx * t), min(sx.stop, (tx + 1) * t)
+                block = values[y0 - sy.start:y1 - sy.start, x0 - sx.start:x1 - sx.start]
+                tile = self.tiles.get((ty, tx))
+                if tile is None:
+                    if not (block != self.fill).any(): continue     # Nur "leere" Werte: Keine Kachel nötig
+                    tile = self.tiles[(ty, tx)] = np.full((t, t), self.fill, dtype=self.dtype)
+                tile[y0 - ty * t:y1 - ty * t, x0 - tx * t:x1 - tx * t] = block
+                if not (tile != self.fill).any():                  # Kachel wieder leer: Freigeben
+                    del self.tiles[(ty, tx)]
+
+    def astype(self, dtype):
+        """
+        Wandelt alle Kacheln in einen anderen Datentyp um (z.B. wenn stärkeres Futter hinzukommt).
+        """
+        self.dtype = np.dtype(dtype)
+        for key, tile in self.tiles.items():
+            self.tiles[key] = tile.astype(self.dtype)
+        return self
+
+    def gather(self, ys, xs):
+        """
+        Liest die Werte für viele Positionen auf einmal.
+
+        Args:
+            ys (np.ndarray): Y-Positionen.
+            xs (np.ndarray): X-Positionen.
+
+        Returns:
+            np.ndarray: Werte an den Positionen.
+        """
+        t = self.tile_size
+        out = np.full(np.broadcast(ys, xs).shape, self.fill, dtype=self.dtype)
+        ys, xs = np.broadcast_arrays(ys, xs)
+        keys = (ys // t) * (self.shape[1] // t + 1) + xs // t
+        for key in np.unique(keys):
+            sel = keys == key
+            tile = self.tiles.get((int(key) // (self.shape[1] // t + 1), int(key) % (self.shape[1] // t + 1)))
+            if tile is not None:
+                out[sel] = tile[ys[sel] % t, xs[sel] % t]
+        return out
+
 class World:
     """
     Repräsentiert die Welt mit Ameisen, Futter und dem Geruchsfeld.
     Verwalten der Geruchsausbreitung und Zugriff auf Ameisen und Futter.
     """
-    def __init__(self):
+    def __init__(self, config: WorldConfig = None, grid_width: int = None, grid_height: int = None, topology: str = None):
         """
         Initialisiert die Welt, Ameisen, Futter und das Geruchsfeld.
-        """
-        self.world_array = []
-        self.grid_size = GRID_SIZE
-        self.grid_width = GRID_WIDTH
-        self.grid_height = GRID_HEIGHT
+
+        Args:
+            config (WorldConfig): Einstellungen der Welt, Standard aus config.json.
+            grid_width (int): Breite der Welt (Zellen), überschreibt config.
+            grid_height (int): Höhe der Welt (Zellen), überschreibt config.
+            topology (str): "torus" (Rand führt auf die Gegenseite) oder "walls" (Rand ist Wand), überschreibt config.
+        """
+        self.config = config or WorldConfig()
+        self.grid_size = self.config.grid_size
+        self.grid_width = int(grid_width or self.config.grid_width)
+        self.grid_height = int(grid_height or self.config.grid_height)
+        self.topology = topology or self.config.topology
+        if self.topology not in TOPOLOGIES:
+            raise ValueError(f"Unbekannte Topologie: {self.topology}")
         self.screen_width = self.grid_width * self.grid_size
         self.screen_height = self.grid_height * self.grid_size
+        # Sehr große Welten: Geruch nur in Kacheln speichern, in denen er vorkommt
+        if self.config.odor_sparse == "auto":
+            self.odor_sparse = self.grid_width * self.grid_height > self.config.odor_sparse_cells
+        else:
+            self.odor_sparse = bool(int(self.config.odor_sparse))
+        self.world_array = self.create_grid(self.get_odor_dtype(self.config.food_range), 0)   # Geruchsfeld
+        self.state_array = self.create_grid(np.uint8, STATE_NEUTRAL)     # Zustandscode je Zelle
+        self.odor_foods = Counter()                                     # Futter (x, y, Kalorien) im Geruchsfeld
+        self.odor_stamps = {}                                           # Geruchsausbreitung je Kalorienwert
+        self.scratch = {}                                               # Wiederverwendete Zwischenspeicher
 
         self.clock_tick = 1
+        self.ticks = 0                                                  # Simulationsschritte
+        self.generation = 0                                             # Anzahl Generationswechsel
+        self.tick_food = Counter()                                      # Futterfunde im letzten Tick je (Strategie, Lernverfahren)
+        self.tick_actions = [0] * NO_DIRECTION                          # Gewählte Richtungen im letzten Tick
         self.world_pause = False
         self.step = False
         self.ants = Ants(self)
-        self.foods = Foods()
+        self.foods = Foods(self)
         self.update_odor_world()
 
+    def get_odor_dtype(self, calories):
+        """
+        Kleinster vorzeichenloser Datentyp, der Geruchswerte bis `calories` aufnehmen kann.
+        Geruch ist nie größer als die Kalorien des Futters (z.B. 120 -> uint8).
+        Ein fest eingestellter Typ (ODOR_DTYPE) wird nur vergrößert, wenn er überlaufen würde.
+        """
+        needed = np.min_scalar_type(max(int(calories), 0))
+        if self.config.odor_dtype == "auto":
+            return needed
+        dtype = np.dtype(self.config.odor_dtype)
+        if dtype.kind in "ui" and np.iinfo(dtype).max < calories:    # Sonst Überlauf (300 -> 44 bei uint8)
+            logger.warning(f"ODOR_DTYPE {dtype} zu klein für {int(calories)} Kalorien, verwende {np.promote_types(dtype, needed)}")
+            dtype = np.promote_types(dtype, needed)
+        return dtype
+
+    def create_grid(self, dtype, fill):
+        """
+        Erzeugt ein Feld in Weltgröße: Dicht als NumPy-Array oder gekachelt (TileGrid).
+        """
+        if self.odor_sparse:
+            return TileGrid((self.grid_height, self.grid_width), self.config.odor_tile_size, dtype, fill)
+        return np.full((self.grid_height, self.grid_width), fill, dtype=dtype)
+
+    def update(self):
+        """
+        Führt einen Simulationsschritt aus: Bewegt alle Ameisen, prüft Futterfunde,
+        verteilt Energie und aktualisiert die Geruchswelt.
+        """
+        profiler.start("odor")
+        self.update_odor_world()                                            # Futter außerhalb geändert (z.B. Tk)
+        profiler.stop()
+        self.tick_food.clear()
+        self.tick_actions = [0] * NO_DIRECTION
+        exhausted = False
+        for ant in self.ants:                                               # Nur aktive Ameisen
+            profiler.start("move")
+            if not ant.out_of_action: ant.move()                            # Bewege Ameise
+            profiler.stop()
+            profiler.start("food")
+            food_changed = False
+            for food in self.foods:                                         # Gehe Foods durch
+                if food.get_position() == ant.get_position():               # Ameise hat Futter gefunden
+                    ant.orka += food.calories         # Nach bedarf: Ameisen erhalten Energie vom Futter
+                    ant.food_found += 1                                     # Futter gefunden Zähler
+                    self.tick_food[(ant.brain.ant_strategy, ant.brain.ant_machine_learning)] += 1
+                    food_changed = True
+                    if self.foods.set_food >= len(self.foods):              # Wenn Futter gebraucht wird
+                        food.set_new_position(self.grid_width, self.grid_height) # Setze Food an neue Position
+                    else:
+                        del self.foods[self.foods.index(food)]              # Oder entferne es
+            if ant.orka <= 0:
+                ant.out_of_action = True
+                exhausted = True
+            else:
+                ant.orka -= 1
+            profiler.stop()
+            if food_changed:                                                # Geruch nur nach Futterfund neu
+                profiler.start("odor")
+                self.update_odor_world()                                    # Aktualisiere Geruchsmatrix
+                profiler.stop()
+        if exhausted: self.ants.retire_exhausted()                          # Ohne Energie: Aus der aktiven Liste
+        self.ticks += 1
+        if self.config.generation and not len(self.ants) and self.ants.count_retired():
+            self.next_generation()                                          # Alle ohne Energie: Neue Generation
+
+    def next_generation(self, breeder=None):
+        """
+        Generationssortierung: Je Strategie/Lernverfahren werden die Ameisen nach food_found sortiert,
+        die Besten behalten ihr Gehirn, die übrigen erhalten Nachkommen der Besten (Breeder).
+        Alle Ameisen beginnen ein neues Leben an zufälliger Position, die Objekte bleiben erhalten.
+        """
+        breeder = breeder or Breeder(self.config)
+        self.ants.revive_all()
+        groups = defaultdict(list)
+        for ant in self.ants:
+            groups[(ant.brain.ant_strategy, ant.brain.ant_machine_learning)].append(ant)
+        for (_, machine_learning), ants in groups.items():
+            ranked = sorted(ants, key=lambda ant: ant.food_found, reverse=True)
+            genomes = breeder.next_generation(machine_learning, [(ant.food_found, ant.brain.get_genome()) for ant in ranked])
+            logger.info(f"Generation {self.generation + 1} ({machine_learning}): Bester {ranked[0].food_found}, "
+                        f"Mittel {sum(ant.food_found for ant in ants) / len(ants):.1f} Futter")
+            survivors = breeder.parent_count(len(ranked))
+            for i, (ant, genome) in enumerate(zip(ranked, genomes)):
+                if i >= survivors: ant.brain.set_genome(genome)     # Überlebende behalten ihr Gehirn (inkl. Optimizer)
+                ant.respawn(random.randint(2, self.grid_width - 2), random.randint(2, self.grid_height - 2))
+        self.generation += 1
+
     def update_odor_world(self):
         """
         Aktualisiert das Geruchsfeld basierend auf aktuellem Futter.
-        """
-        self.world_array = np.zeros((GRID_HEIGHT, GRID_WIDTH), dtype=int) # Erzeuge Feld
-        yy, xx = np.indices(self.world_array.shape)  # erstellt zwei Arrays die die Koordinaten (Indices) aller Zellen im world_array enthalten
-        for food in self.foods.show_foods():
-            self.calculate_odor_field(food, yy, xx)             # Berechne Geruchsausbreitung
-        self.world_array[0, :] = 0                              # Setze Oberste Reihe auf Null
-        self.world_array[-1, :] = 0                             # Setze Unterste Reihe auf Null
-        self.world_array[:, 0] = 0                              # Setze Erste Spalte auf Null
-        self.world_array[:, -1] = 0                             # Setze Letzte Spalte auf Null
-        # print(self.world_array[95:100, 95:100])
 
-    def calculate_odor_field(self, food, yy, xx):
+        Es werden nur die Bereiche neu berechnet, in denen Futter hinzugekommen
+        oder verschwunden (bzw. umgesetzt) ist.
+        """
+        foods = Counter((food.pos_x, food.pos_y, int(food.calories)) for food in self.foods)
+        removed = self.odor_foods - foods                       # Futter weg oder umgesetzt
+        added = foods - self.odor_foods                         # Futter neu
+        self.odor_foods = foods
+        max_calories = max((calories for _, _, calories in added), default=0)
+        dtype = self.world_array.dtype
+        if dtype.kind in "ui" and max_calories > np.iinfo(dtype).max:     # Datentyp zu klein: Vergrößern
+            self.world_array = self.world_array.astype(self.get_odor_dtype(max_calories))
+            self.odor_stamps.clear()
+        for pos_x, pos_y, calories in removed.elements():       # Bereich aus übrigem Futter neu berechnen
+            window = self.get_odor_window(pos_x, pos_y, calories)
+            if window: self.calculate_odor_region(*window, self.odor_foods)
+        for pos_x, pos_y, calories in added.elements():         # Geruch hinzufügen
+            window = self.get_odor_window(pos_x, pos_y, calories)
+            if window:
+                y0, y1, x0, x1 = window
+                self.calculate_odor_region(*window, [(pos_x, pos_y, calories)], self.world_array[y0:y1, x0:x1])
+
+    def get_odor_window(self, pos_x, pos_y, calories):
+        """
+        Gibt den Bereich (y0, y1, x0, x1) innerhalb der Welt zurück, in dem das Futter riecht.
+
+        Returns:
+            Optional[Tuple[int, int, int, int]]: Bereich oder None, wenn kein Geruch entsteht.
         """
-        Berechnet Geruchsausbreitung vom Futter ausgehend.
+        if calories <= 0:
+            return None
+        reach = calories - 1                                    # Geruch > 0 nur für Distanz < Kalorien
+        y0, y1 = max(pos_y - reach, 0), min(pos_y + reach + 1, self.grid_height)
+        x0, x1 = max(pos_x - reach, 0), min(pos_x + reach + 1, self.grid_width)
+        if y0 >= y1 or x0 >= x1:
+            return None
+        return y0, y1, x0, x1
+
+    def calculate_odor_region(self, y0, y1, x0, x1, foods, region=None):
         """
-        start_x, start_y = food.get_position()                  # Futter Position
-        dist = np.sqrt((yy - start_y) ** 2 + (xx - start_x) ** 2)  # Euklidische Distanz zum Startpunkt berechnen
-        # Werte nach Entfernung setzen: runde abwärts, invertiere zur Höhe
-        value_array = np.clip(food.calories - np.floor(dist).astype(int), 0, food.calories)
-        self.world_array = np.maximum(self.world_array, value_array) # Mit dem Zielarray kombinieren
-        # print(self.world_array[start_y - 5:start_y + 6, start_x - 5:start_x + 6])
+        Berechnet das Geruchsfeld im Bereich [y0:y1, x0:x1] und die Zustandscodes drumherum.
+
+        Args:
+            foods: Iterierbare (x, y, Kalorien)-Tupel, deren Geruch eingerechnet wird.
+            region: Bisheriger Geruch des Bereichs (wird erweitert) oder None (neu berechnen).
+        """
+        if region is None:
+            region = self.get_scratch("region", (y1 - y0, x1 - x0), self.world_array.dtype)
+            region.fill(0)
+        for pos_x, pos_y, calories in foods:
+            window = self.get_odor_window(pos_x, pos_y, calories)
+            if window is None: continue
+            iy0, iy1 = max(window[0], y0), min(window[1], y1)   # Schnittmenge mit dem Bereich
+            ix0, ix1 = max(window[2], x0), min(window[3], x1)
+            if iy0 >= iy1 or ix0 >= ix1: continue
+            sub = region[iy0 - y0:iy1 - y0, ix0 - x0:ix1 - x0]
+            np.maximum(sub, self.calculate_odor_field(pos_x, pos_y, calories, iy0, iy1, ix0, ix1), out=sub)
+        if y0 == 0: region[0, :] = 0                                # Setze Oberste Reihe auf Null
+        if y1 == self.grid_height: region[-1, :] = 0                # Setze Unterste Reihe auf Null
+        if x0 == 0: region[:, 0] = 0                                # Setze Erste Spalte auf Null
+        if x1 == self.grid_width: region[:, -1] = 0                 # Setze Letzte Spalte auf Null
+        self.world_array[y0:y1, x0:x1] = region
+        # Nachbarn der geänderten Zellen sehen ebenfalls einen neuen Geruchsunterschied
+        self.calculate_state_region(max(y0 - 1, 0), min(y1 + 1, self.grid_height),
+                                    max(x0 - 1, 0), min(x1 + 1, self.grid_width))
+
+    def calculate_odor_field(self, pos_x, pos_y, calories, y0, y1, x0, x1):
+        """
+        Gibt die Geruchsausbreitung vom Futter ausgehend für den Bereich [y0:y1, x0:x1] zurück.
+        Die Ausbreitung hängt nur von den Kalorien ab und wird als Ausschnitt (Sicht) aus
+        dem vorberechneten Stempel gelesen.
+        """
+        reach = calories - 1
+        stamp = self.get_odor_stamp(calories)
+        return stamp[y0 - pos_y + reach:y1 - pos_y + reach, x0 - pos_x + reach:x1 - pos_x + reach]
+
+    def get_odor_stamp(self, calories):
+        """
+        Berechnet (einmal je Kalorienwert) die Geruchsausbreitung um ein Futter in der Mitte.
+        """
+        stamp = self.odor_stamps.get(calories)
+        if stamp is None:
+            reach = calories - 1
+            yy, xx = np.ogrid[-reach:reach + 1, -reach:reach + 1]       # Abstand zum Futter
+            dist = np.sqrt(yy ** 2 + xx ** 2)                           # Euklidische Distanz zum Startpunkt berechnen
+            # Werte nach Entfernung setzen: runde abwärts, invertiere zur Höhe
+            stamp = np.clip(calories - np.floor(dist).astype(int), 0, calories).astype(self.world_array.dtype)
+            self.odor_stamps[calories] = stamp
+        return stamp
+
+    def get_scratch(self, name, shape, dtype):
+        """
+        Gibt eine Sicht der Größe `shape` auf einen wiederverwendeten Zwischenspeicher zurück.
+        Der Speicher wird nur neu angelegt, wenn er zu klein ist oder der Datentyp abweicht.
+        """
+        buffer = self.scratch.get(name)
+        if buffer is None or buffer.dtype != dtype or buffer.shape[0] < shape[0] or buffer.shape[1] < shape[1]:
+            old_shape = buffer.shape if buffer is not None and buffer.dtype == dtype else (0, 0)
+            buffer = np.empty((max(shape[0], old_shape[0]), max(shape[1], old_shape[1])), dtype=dtype)
+            self.scratch[name] = buffer
+        return buffer[:shape[0], :shape[1]]
+
+    def calculate_state_region(self, y0, y1, x0, x1):
+        """
+        Berechnet die Zustandscodes (siehe STATES) für den Bereich [y0:y1, x0:x1].
+        Außerhalb der Welt gilt der Geruch 0, wie bei `get_odor`.
+        """
+        height, width = y1 - y0, x1 - x0
+        odor = self.get_scratch("odor", (height + 2, width + 2), np.int32)  # Bereich mit Rand von 1 Zelle
+        odor.fill(0)
+        sy0, sy1 = max(y0 - 1, 0), min(y1 + 1, self.grid_height)
+        sx0, sx1 = max(x0 - 1, 0), min(x1 + 1, self.grid_width)
+        odor[sy0 - y0 + 1:sy1 - y0 + 1, sx0 - x0 + 1:sx1 - x0 + 1] = self.world_array[sy0:sy1, sx0:sx1]
+        own = odor[1:-1, 1:-1]                                              # Geruch der Zelle selbst
+        code = self.get_scratch("code", (height, width), np.int32)
+        diff = self.get_scratch("diff", (height, width), np.int32)
+        code.fill(0)
+        for weight, neighbor in ((27, odor[:-2, 1:-1]),                     # Oben
+                                 (9, odor[2:, 1:-1]),                       # Unten
+                                 (3, odor[1:-1, :-2]),                      # Links
+                                 (1, odor[1:-1, 2:])):                      # Rechts
+            np.subtract(neighbor, own, out=diff)
+            np.sign(diff, out=diff)                                         # -1, 0, 1
+            diff += 1
+            diff *= weight
+            code += diff
+        self.state_array[y0:y1, x0:x1] = code
 
     def get_odor(self, x: int, y: int) -> int:
         """
         Gibt die Geruchsstärke an Position (x,y) zurück.
         """
-        if 0 <= x < GRID_WIDTH and 0 <= y < GRID_HEIGHT:
-            return self.world_array[y, x]   # Normalrückgabe
+        if 0 <= x < self.grid_width and 0 <= y < self.grid_height:
+            return int(self.world_array[y, x])   # Normalrückgabe (int: keine Überläufe bei kompakten Datentypen)
         return 0            # Geruch auserhalb des Array auf 0 Setzen, fehler ausschließen
         # print(f"Auserhalb des bereichs: Pos: {x}, Pos: {y}")
 
+    def wrap_position(self, x: int, y: int):
+        """
+        Bildet eine Position nach der Topologie der Welt auf eine gültige Zelle ab.
+
+        Returns:
+            Tuple[int, int]: Gültige Position (x, y).
+        """
+        if self.topology == "walls":                                # Am Rand stehen bleiben
+            return min(max(x, 0), self.grid_width - 1), min(max(y, 0), self.grid_height - 1)
+        return x % self.grid_width, y % self.grid_height            # Entgegengesetzte Seite rein
+
+    def get_state_code(self, x: int, y: int) -> int:
+        """
+        Gibt den vorberechneten Zustandscode an Position (x,y) zurück (Index in STATES).
+        """
+        return int(self.state_array[y, x])
+
+    def get_state_codes(self, xs, ys):
+        """
+        Gibt die Zustandscodes für viele Positionen auf einmal zurück.
+
+        Args:
+            xs: X-Positionen (Liste oder NumPy-Array).
+            ys: Y-Positionen (Liste oder NumPy-Array).
+
+        Returns:
+            np.ndarray: Zustandscodes (uint8), Index in STATES.
+        """
+        return self.state_array[ys, xs]
+
+    def memory_usage(self, ants=None):
+        """
+        Ungefährer Speicherbedarf der Welt in Bytes.
+
+        :param ants: Optional, Liste, an die je Ameise (Name, Ant.memory_usage) angehängt wird.
+
+        Returns:
+            dict: {"odor", "state": Geruchs-/Zustandsfeld, "odor_cache": Stempel und Zwischenspeicher,
+                   "foods": Futterliste, "ants", "log", "episode", "q", "network": Summen über alle Ameisen,
+                   "total", "ants_count"}
+        """
+        seen = {id(self), id(self.config)}
+        usage = {"odor": self.world_array.nbytes,
+                 "state": self.state_array.nbytes,
+                 "odor_cache": deep_sizeof([self.odor_stamps, self.scratch, self.odor_foods], seen),
+                 "foods": deep_sizeof(self.foods, seen),
+                 "ants": 0, "log": 0, "episode": 0, "q": 0, "network": 0}
+        ants_count = 0
+        for ant in self.ants.iter_all():                                # Archivierte belegen auch Speicher
+            ants_count += 1
+            ant_usage = ant.memory_usage()
+            if ants is not None: ants.append((ant.name, ant_usage))
+            for key, size in ant_usage.items():
+                if key == "total": continue
+                usage["ants" if key == "ant" else key] += size
+        usage["total"] = sum(usage.values())
+        usage["ants_count"] = ants_count
+        return usage
+
+    def memory_report(self, top=10):
+        """
+        Speicherbericht als Text: Summen der Welt und die `top` Ameisen mit dem größten Bedarf.
+        """
+        ants = []
+        usage = self.memory_usage(ants)                                 # Ameisen nur einmal durchlaufen
+        lines = [f"Speicher gesamt (ca.): {format_bytes(usage['total'])}, Ameisen: {usage['ants_count']}"]
+        for key in ("odor", "state", "odor_cache", "foods", "ants", "log", "episode", "q", "network"):
+            lines.append(f"  {key:<12}{format_bytes(usage[key]):>12}")
+        ants.sort(key=lambda item: -item[1]["total"])
+        if ants:
+            lines.append(f"\nTop {min(top, len(ants))} Ameisen:")
+            lines.append(f"  {'Name':<8}{'Gesamt':>12}{'Log':>12}{'Episode':>12}{'Q':>12}{'Netz':>12}")
+            for name, ant in ants[:top]:
+                lines.append(f"  {name:<8}{format_bytes(ant['total']):>12}{format_bytes(ant['log']):>12}"
+                             f"{format_bytes(ant['episode']):>12}{format_bytes(ant['q']):>12}"
+                             f"{format_bytes(ant['network']):>12}")
+        return "\n".join(lines)
+
     def get_screen_color(self):
         return "WHITE"
 
+    # Ameisen-Attribute im Snapshot: (Name, Datentyp). event_keysym_direction None wird als -1 gespeichert.
+    ANT_SNAPSHOT_FIELDS = (("pos_x", np.int64), ("pos_y", np.int64), ("orka", np.int64), ("out_of_action", np.bool_),
+                           ("last_direction", np.int8), ("last_last_direction", np.int8), ("eps", np.float64),
+                           ("odor", np.int64), ("error_memory", np.int64), ("odor_old", np.int64),
+                           ("verkir", np.float64), ("food_found", np.int64), ("period", np.int64),
+                           ("event_keysym_direction", np.int8))
+
+    def snapshot_arrays(self):
+        """
+        Gesamtzustand der Welt als Dictionary aus NumPy-Arrays (ohne pandas und ohne pickle).
+
+        Enthalten sind Einstellungen, Zähler und Zufallsgeneratoren (in "meta" als JSON), Ameisen und
+        Futter spaltenweise (ein Array je Attribut) sowie alle Gehirne: Q-Tabellen, Episoden und
+        Perzeptrons als zusammengehängte Arrays mit Startindex je Ameise, Policy-Networks als
+        torch-Blob je Ameise. Das Geruchsfeld wird nicht gespeichert, es folgt eindeutig aus dem Futter.
+
+        Returns:
+            dict[str, np.ndarray]
+        """
+        ants = list(self.ants.iter_all())                               # Aktive und archivierte Ameisen
+        foods = list(self.foods)
+        arrays = {}
+        for field, dtype in self.ANT_SNAPSHOT_FIELDS:
+            values = [getattr(ant, field) for ant in ants]
+            if field == "event_keysym_direction": values = [-1 if v is None else v for v in values]
+            arrays[f"ant_{field}"] = np.array(values, dtype=dtype)
+        arrays["ant_name"] = np.array([ant.name for ant in ants], dtype=str)
+        arrays["ant_strategy"] = np.array([str(ant.brain.ant_strategy) for ant in ants], dtype=str)
+        arrays["ant_machine_learning"] = np.array([str(ant.brain.ant_machine_learning) for ant in ants], dtype=str)
+        arrays["brain_output_error"] = np.array([ant.brain.output_error for ant in ants], dtype=np.float64)
+        arrays["brain_eta"] = np.array([ant.brain.eta for ant in ants], dtype=np.float64)
+
+        q_offsets, q_state, q_action, q_value = [0], [], [], []             # Monte-Carlo, Q-Learning
+        episode_offsets, episode_state, episode_action, episode_reward = [0], [], [], []
+        perzeptron_offsets, perzeptron_rows = [0], []                      # Perzeptron: w..., b, eta, alpha, error_number
+        blob_offsets, blobs = [0], []                                      # Policy-Network (torch.save)
+        for ant in ants:
+            brain = ant.brain
+            blob = b""
+            if brain.ant_machine_learning == "Perzeptron":
+                for p in brain._q:
+                    perzeptron_rows.append([*p._w, p._b, p.eta, p.alpha, p.error_number])
+            elif brain.ant_machine_learning == "Policy-Network":
+                buffer = io.BytesIO()
+                torch.save({"network": brain._q.state_dict(),
+                            "optimizer": brain.optimizer.state_dict() if brain.optimizer else None}, buffer)
+                blob = buffer.getvalue()
+                blobs.append(blob)
+            elif isinstance(brain._q, dict):
+                for (state, action), value in brain._q.items():
+                    q_state.append(STATE_INDEX[state])
+                    q_action.append(action)
+                    q_value.append(value)
+            for state, action, reward in brain.episode:
+                episode_state.append(STATE_INDEX[state])
+                episode_action.append(action)
+                episode_reward.append(reward)
+            q_offsets.append(len(q_value))
+            episode_offsets.append(len(episode_reward))
+            perzeptron_offsets.append(len(perzeptron_rows))
+            blob_offsets.append(blob_offsets[-1] + len(blob))
+        arrays.update(q_offsets=np.array(q_offsets, dtype=np.int64), q_state=np.array(q_state, dtype=np.uint8),
+                      q_action=np.array(q_action, dtype=np.int8), q_value=np.array(q_value, dtype=np.float64),
+                      episode_offsets=np.array(episode_offsets, dtype=np.int64),
+                      episode_state=np.array(episode_state, dtype=np.uint8),
+                      episode_action=np.array(episode_action, dtype=np.int8),
+                      episode_reward=np.array(episode_reward, dtype=np.float64),
+                      perzeptron_offsets=np.array(perzeptron_offsets, dtype=np.int64),
+                      perzeptron=np.array(perzeptron_rows, dtype=np.float64).reshape(-1, 8),   # 4 Gewichte + 4 Werte
+                      blob_offsets=np.array(blob_offsets, dtype=np.int64),
+                      blobs=np.frombuffer(b"".join(blobs), dtype=np.uint8))
+
+        arrays["food_pos_x"] = np.array([food.pos_x for food in foods], dtype=np.int64)
+        arrays["food_pos_y"] = np.array([food.pos_y for food in foods], dtype=np.int64)
+        arrays["food_calories"] = np.array([food.calories for food in foods], dtype=np.int64)
+        arrays["food_name"] = np.array([food.name for food in foods], dtype=str)
+        arrays["food_color"] = np.array([str(food.color) for food in foods], dtype=str)
+
+        random_version, random_state, gauss_next = random.getstate()
+        numpy_kind, numpy_keys, numpy_pos, numpy_has_gauss, numpy_gauss = np.random.get_state()
+        arrays["random_state"] = np.array(random_state, dtype=np.uint32)
+        arrays["numpy_random_state"] = np.asarray(numpy_keys, dtype=np.uint32)
+        if "torch" in sys.modules:                                      # torch nur, wenn geladen
+            arrays["torch_random_state"] = sys.modules["torch"].get_rng_state().numpy()
+        meta = {"version": SNAPSHOT_VERSION, "config": self.config.as_dict(),
+                "grid_width": self.grid_width, "grid_height": self.grid_height, "topology": self.topology,
+                "ticks": self.ticks, "clock_tick": self.clock_tick, "set_food": self.foods.set_food,
+                "generation": self.generation, "next_ant_id": self.ants.next_id,
+                "random": [random_version, gauss_next],
+                "numpy_random": [numpy_kind, int(numpy_pos), int(numpy_has_gauss), float(numpy_gauss)]}
+        arrays["meta"] = np.array(json.dumps(meta))
+        return arrays
+
+    def save_snapshot(self, file=SNAPSHOT_FILE):
+        """
+        Speichert den Gesamtzustand der Welt binär (unkomprimiertes .npz, atomar ersetzt).
+        Fortsetzen mit World.load_snapshot(file) läuft genau so weiter wie diese Welt.
+        """
+        arrays = self.snapshot_arrays()
+        def write(tmp):
+            with open(tmp, "wb") as f:
+                np.savez(f, **arrays)
+        DataStorage.atomic_write(file, write)
+        logger.info(f"Snapshot gespeichert: {file} (Tick {self.ticks}, {len(self.ants)} Ameisen)")
+
+    @classmethod
+    def load_snapshot(cls, file=SNAPSHOT_FILE):
+        """
+        Erzeugt eine Welt aus einer mit save_snapshot gespeicherten Datei.
+        Die globalen Zufallsgeneratoren (random, NumPy, torch) werden auf den gespeicherten Stand gesetzt.
+        """
+        with np.load(file, allow_pickle=False) as data:
+            return cls.from_snapshot_arrays({key: data[key] for key in data.files})
+
+    @classmethod
+    def from_snapshot_arrays(cls, arrays):
+        """
+        Erzeugt eine Welt aus dem Ergebnis von snapshot_arrays.
+        """
+        meta = json.loads(str(arrays["meta"]))
+        if meta["version"] != SNAPSHOT_VERSION:
+            raise ValueError(f"Snapshot-Version {meta['version']} wird nicht unterstützt (erwartet {SNAPSHOT_VERSION}).")
+        world = cls(WorldConfig(meta["config"]), meta["grid_width"], meta["grid_height"], meta["topology"])
+        world.ticks = meta["ticks"]
+        world.clock_tick = meta["clock_tick"]
+        world.generation = meta.get("generation", 0)
+
+        for pos_x, pos_y, calories, name, color in zip(arrays["food_pos_x"].tolist(), arrays["food_pos_y"].tolist(),
+                                                        arrays["food_calories"].tolist(), arrays["food_name"].tolist(),
+                                                        arrays["food_color"].tolist()):
+            world.foods.add_food(Food(pos_x, pos_y, calories, name, color))
+        world.foods.set_food = meta["set_food"]
+        world.update_odor_world()                                       # Geruchsfeld aus dem Futter
+
+        columns = {field: arrays[f"ant_{field}"].tolist() for field, _ in cls.ANT_SNAPSHOT_FIELDS}
+        q_offsets, episode_offsets = arrays["q_offsets"].tolist(), arrays["episode_offsets"].tolist()
+        perzeptron_offsets, blob_offsets = arrays["perzeptron_offsets"].tolist(), arrays["blob_offsets"].tolist()
+        q_state, q_action, q_value = arrays["q_state"].tolist(), arrays["q_action"].tolist(), arrays["q_value"].tolist()
+        episode_state, episode_action = arrays["episode_state"].tolist(), arrays["episode_action"].tolist()
+        episode_reward, perzeptron = arrays["episode_reward"].tolist(), arrays["perzeptron"].tolist()
+        blobs = arrays["blobs"]
+        output_error, eta = arrays["brain_output_error"].tolist(), arrays["brain_eta"].tolist()
+        for i, (name, strategy, machine_learning) in enumerate(zip(arrays["ant_name"].tolist(), arrays["ant_strategy"].tolist(),
+                                                                   arrays["ant_machine_learning"].tolist())):
+            if machine_learning == "None": machine_learning = None
+            brain = Brain(name=name, ant_strategy=strategy, data={}, ant_machine_learning=machine_learning,
+                          csv_load=False, config=world.config)
+            if machine_learning == "Perzeptron":
+                q = []
+                for row in perzeptron[perzeptron_offsets[i]:perzeptron_offsets[i + 1]]:
+                    p = Perzeptron(4, brain.log_collector)
+                    *p._w, p._b, p.eta, p.alpha, error_number = row
+                    p.error_number = int(error_number)
+                    q.append(p)
+                brain.set_brain(q)
+            elif machine_learning == "Policy-Network":
+                from network import PolicyNetwork   # torch erst hier laden
+                blob = torch.load(io.BytesIO(blobs[blob_offsets[i]:blob_offsets[i + 1]].tobytes()))
+                network = PolicyNetwork()
+                network.load_state_dict(blob["network"])
+                network.eval()
+                brain.set_brain(network)
+                if blob["optimizer"] is not None:
+                    brain.optimizer = optim.Adam(network.parameters(), lr=0.01)
+                    brain.optimizer.load_state_dict(blob["optimizer"])
+            else:
+                brain.set_brain({(STATES[q_state[j]], q_action[j]): q_value[j] for j in range(q_offsets[i], q_offsets[i + 1])})
+            brain.episode = [(STATES[episode_state[j]], episode_action[j], episode_reward[j])
+                             for j in range(episode_offsets[i], episode_offsets[i + 1])]
+            brain.output_error = output_error[i]
+            brain.eta = eta[i]
+            ant = Ant(world, columns["pos_x"][i], columns["pos_y"][i], brain, name=name)
+            for field, _ in cls.ANT_SNAPSHOT_FIELDS:
+                setattr(ant, field, columns[field][i])
+            if ant.event_keysym_direction < 0: ant.event_keysym_direction = None
+            world.ants.add_ant(ant)
+        world.ants.retire_exhausted()                                   # Archivierte wieder ins Archiv
+        world.ants.next_id = max(world.ants.next_id, meta.get("next_ant_id", 1))
+
+        random_version, gauss_next = meta["random"]                     # Zufallsgeneratoren zuletzt setzen
+        random.setstate((random_version, tuple(arrays["random_state"].tolist()), gauss_next))
+        numpy_kind, numpy_pos, numpy_has_gauss, numpy_gauss = meta["numpy_random"]
+        np.random.set_state((numpy_kind, arrays["numpy_random_state"], numpy_pos, numpy_has_gauss, numpy_gauss))
+        if "torch_random_state" in arrays:
+            torch.set_rng_state(torch.from_numpy(arrays["torch_random_state"].copy()))
+        logger.info(f"Snapshot geladen: Tick {world.ticks}, {len(world.ants)} Ameisen, {len(world.foods)} Futter")
+        return world
+
+class TickProfiler:
+    """
+    Misst die Laufzeit der einzelnen Phasen eines Simulationsschritts (Tick).
+
+    Phasen werden mit `start(name)`/`stop()` bzw. `with profiler.phase(name):` geklammert.
+    "log" umfasst das Anhängen und Weiterreichen der Logtexte, nicht deren Formatierung.
+    Gemessen wird die Eigenzeit: Die Zeit verschachtelter Phasen (z.B. "learn" in "move")
+    wird der äußeren Phase abgezogen. Gemessen wird nur zwischen `begin_tick()` und
+    `end_tick()` im Thread der Simulation, sonst kosten die Aufrufe fast nichts.
+
+    Attributes:
+        enabled (bool): Messung an/aus (wirkt ab dem nächsten Tick).
+        ticks (deque): Phasenzeiten der letzten Ticks (rollendes Fenster).
+        histograms (dict): Je Phase Anzahl Ticks je Zeitklasse (seit dem letzten Zurücksetzen).
+    """
+    BUCKETS = 24                # Histogramm-Klassen: <1 µs, <2 µs, <4 µs, ... <2^23 µs (~8 s)
+
+    def __init__(self, window=PROFILER_WINDOW):
+        self.enabled = True
+        self.ticks = deque(maxlen=window)
+        self.histograms = {}
+        self._tick = defaultdict(float)         # Phasenzeiten des laufenden Ticks
+        self._stack = []                        # Offene Phasen [Name, Start, Zeit der Unterphasen]
+        self._active = False                    # Läuft gerade ein gemessener Tick
+        self._thread = None                     # Thread der Simulation
+        self._tick_start = 0.0
+        self._phases = {}                       # Wiederverwendete Kontextmanager je Phase
+        self._profile = None                    # Laufender cProfile-Mitschnitt
+        self._profile_ticks = 0
+        self._profile_file = None
+        self._profile_request = None            # (Ticks, Datei), Start beim nächsten Tick
+
+    def begin_tick(self):
+        """Beginnt die Messung eines Ticks (im Thread der Simulation aufrufen)."""
+        self._active = self.enabled
+        if not self._active and not self._profile_request: return
+        self._thread = threading.get_ident()
+        self._stack.clear()
+        self._tick.clear()
+        if self._profile_request:                           # cProfile im Simulations-Thread starten
+            self._profile_ticks, self._profile_file = self._profile_request
+            self._profile_request = None
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+            logger.info(f"cProfile: Zeichne {self._profile_ticks} Ticks auf")
+        self._tick_start = time.perf_counter()
+
+    def end_tick(self):
+        """Schließt den Tick ab und übernimmt die Phasenzeiten in Fenster und Histogramme."""
+        if self._profile:
+            self._profile_ticks -= 1
+            if self._profile_ticks <= 0: self._finish_profile()
+        if not self._active: return
+        self._active = False
+        self._tick["tick"] = time.perf_counter() - self._tick_start
+        self.ticks.append(dict(self._tick))
+        for name, seconds in self._tick.items():
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = np.zeros(self.BUCKETS, dtype=np.int64)
+            histogram[min(int(seconds * 1e6).bit_length(), self.BUCKETS - 1)] += 1
+
+    def start(self, name):
+        """Beginnt die Phase `name`."""
+        if self._active and threading.get_ident() == self._thread:
+            self._stack.append([name, time.perf_counter(), 0.0])
+
+    def stop(self):
+        """Beendet die zuletzt begonnene Phase."""
+        if self._active and self._stack and threading.get_ident() == self._thread:
+            name, start, children = self._stack.pop()
+            seconds = time.perf_counter() - start
+            if self._stack: self._stack[-1][2] += seconds       # Der äußeren Phase abziehen
+            self._tick[name] += seconds - children
+
+    def phase(self, name):
+        """
+        Kontextmanager für eine Phase, z.B. `with profiler.phase("render"): ...`
+        """
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = _ProfilerPhase(self, name)
+        return phase
+
+    def reset(self):
+        """Verwirft alle bisherigen Messwerte."""
+        self.ticks.clear()
+        self.histograms.clear()
+
+    def rows(self):
+        """
+        Kennzahlen je Phase über das rollende Fenster.
+
+        Returns:
+            list[dict]: {"phase", "mean_ms", "p95_ms", "max_ms", "share"} absteigend nach Mittelwert,
+            "tick" (gesamter Tick) zuerst, "other" ist die nicht zugeordnete Zeit.
+        """
+        ticks = list(self.ticks)
+        if not ticks: return []
+        names = sorted({name for tick in ticks for name in tick})
+        times = {name: np.array([tick.get(name, 0.0) for tick in ticks]) * 1000 for name in names}
+        times["other"] = np.maximum(times["tick"] - sum(t for n, t in times.items() if n != "tick"), 0)
+        total = times["tick"].mean() or 1.0
+        rows = [{"phase": name,
+                 "mean_ms": float(t.mean()),
+                 "p95_ms": float(np.percentile(t, 95)),
+                 "max_ms": float(t.max()),
+                 "share": float(t.mean() / total)} for name, t in times.items()]
+        rows.sort(key=lambda row: (row["phase"] != "tick", -row["mean_ms"]))
+        return rows
+
+    def format_table(self):
+        """Gibt die rollende Tabelle als Text zurück (für Tk-Fenster und Datei)."""
+        rows = self.rows()
+        if not rows: return "Noch keine Messwerte (Simulation starten)."
+        lines = [f"Letzte {len(self.ticks)} Ticks, {1000 / rows[0]['mean_ms']:.1f} Ticks/s" if rows[0]["mean_ms"] else "",
+                 f"{'Phase':<14}{'Mittel ms':>11}{'p95 ms':>11}{'Max ms':>11}{'Anteil':>9}"]
+        for row in rows:
+            lines.append(f"{row['phase']:<14}{row['mean_ms']:>11.3f}{row['p95_ms']:>11.3f}"
+                         f"{row['max_ms']:>11.3f}{row['share']:>9.1%}")
+        return "\n".join(lines)
+
+    def dump(self, file):
+        """
+        Speichert rollende Tabelle und Histogramme als JSON-Datei.
+        Histogramm-Klasse i zählt Ticks mit einer Phasenzeit unter 2^i µs.
+        """
+        data = {"time": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "ticks": len(self.ticks),
+                "rows": self.rows(),
+                "histogram_upper_us": [2 ** i for i in range(self.BUCKETS)],
+                "histograms": {name: histogram.tolist() for name, histogram in self.histograms.items()}}
+        with open(file, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        logger.info(f"Profiler-Daten gespeichert in {file}")
+
+    def request_profile(self, ticks=PROFILE_TICKS, file=PROFILE_FILE):
+        """
+        Zeichnet die nächsten `ticks` Ticks mit cProfile auf (Start im Simulations-Thread).
+        Darf aus jedem Thread (z.B. Tk-Button, PyGame-Taste) aufgerufen werden.
+        """
+        if not self._profile:
+            self._profile_request = (int(ticks), file)
+
+    def _finish_profile(self):
+        """Beendet den cProfile-Mitschnitt, speichert ihn und loggt die teuersten Funktionen."""
+        self._profile.disable()
+        self._profile.dump_stats(self._profile_file)
+        text = io.StringIO()
+        pstats.Stats(self._profile, stream=text).sort_stats("cumulative").print_stats(15)
+        logger.info(f"cProfile gespeichert in {self._profile_file}\n{text.getvalue()}")
+        self._profile = None
+
+class _ProfilerPhase:
+    """Kontextmanager für eine Phase von TickProfiler (einmal je Name erzeugt)."""
+    __slots__ = ("profiler", "name")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler.start(self.name)
+
+    def __exit__(self, *exc):
+        self.profiler.stop()
+
+profiler = TickProfiler()           # Gemeinsamer Profiler der Simulation
+
+class MemoryTracer:
+    """
+    Vergleicht tracemalloc-Schnappschüsse: Jeder Aufruf von `diff()` zeigt, welche
+    Codezeilen seit dem vorherigen Aufruf Speicher dazu bekommen haben.
+    """
+    def __init__(self, frames=1):
+        self.frames = frames                # Aufruftiefe je Speicherblock
+        self._snapshot = None
+
+    def start(self):
+        """Startet tracemalloc (falls nötig) und nimmt den ersten Schnappschuss."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self._snapshot = tracemalloc.take_snapshot()
+
+    def stop(self):
+        """Beendet tracemalloc und verwirft den Schnappschuss."""
+        tracemalloc.stop()
+        self._snapshot = None
+
+    def diff(self, top=15):
+        """
+        Vergleicht mit dem vorherigen Schnappschuss und gibt die größten Zuwächse als Text zurück.
+        Beim ersten Aufruf wird nur gestartet.
+        """
+        if self._snapshot is None or not tracemalloc.is_tracing():
+            self.start()
+            return "tracemalloc gestartet, nächster Aufruf zeigt den Zuwachs."
+        snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+        stats = snapshot.compare_to(self._snapshot, "lineno")
+        self._snapshot = snapshot
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"tracemalloc: aktuell {format_bytes(current)}, Spitze {format_bytes(peak)}",
+                 f"Größte Zuwächse seit dem letzten Schnappschuss:"]
+        for stat in stats[:top]:
+            frame = stat.traceback[0]
+            lines.append(f"  {format_bytes(stat.size_diff):>10} {stat.count_diff:>+8} Blöcke  {frame.filename}:{frame.lineno}")
+        return "\n".join(lines)
+
+memory_tracer = MemoryTracer()      # Gemeinsamer Speicher-Tracer (UI und Runner)
+
 class LogCollector:
     """
     Sammelt und verwaltet logische Zeitabschnitte ("Perioden") von Textlogs für eine Ameisen-Simulation.
@@ -1133,11 +2444,14 @@ class LogCollector:
     def add_log_txt(self, text):
         """
         Fügt der aktuellen Periode einen neuen Log-Textabschnitt hinzu.
-        Der Text wird mit einem Trenner getrennt angehängt.
+        Der Text wird mit einem Trenner getrennt angehängt (Profiler-Phase "log"; das
+        Formatieren des Textes geschieht beim Aufrufer und zählt zu dessen Phase, z.B. "move").
         Args:
             text (str): Der hinzuzufügende Logtext.
         """
+        profiler.start("log")
         self._periods[self.period] += self.SEPARATOR + text
+        profiler.stop()
 
     def add_new_period(self):
         """
@@ -1145,10 +2459,15 @@ class LogCollector:
         Dabei wird der Periodenzähler erhöht und eine neue Textperiode mit
         Kopfzeile für die Ameise, Strategie und Lernmethode angelegt.
         """
-        self.update_log_text_widget()
+        profiler.start("log")
+        if self.update_log_text_widget:                                 # Ohne Oberfläche kein Callback
+            profiler.start("tk_callback")
+            self.update_log_text_widget()
+            profiler.stop()
         self.period += 1
         # self._periods.append(self.PERIOD_SEPARATOR + f"Ant: {self.name}, Strategie: {self.ant_strategy}, Lernmethode: {self.ant_machine_learning}, Step: {self.period}\n")
         self._periods.append(self.PERIOD_SEPARATOR + self.title)
+        profiler.stop()
 
     def get_formatted_info(self):
         """
@@ -1166,12 +2485,503 @@ class LogCollector:
         """
         return "".join(self._periods)
 
+    def period_count(self):
+        """
+        Returns:
+            int: Anzahl der bisherigen Perioden (inklusive der laufenden).
+        """
+        return len(self._periods)
+
+    def get_periods(self, start, stop):
+        """
+        Gibt nur die Perioden start bis stop (exklusiv) zusammenhängend zurück, für seitenweise Anzeige.
+        """
+        return "".join(self._periods[max(0, start):max(0, stop)])
+
+    def find_period(self, text, start=0, backward=False):
+        """
+        Sucht die nächste Periode, die `text` enthält (z.B. "Essen gefunden").
+        Args:
+            text (str): Gesuchter Text.
+            start (int): Erste zu prüfende Periode.
+            backward (bool): Rückwärts zu kleineren Perioden suchen.
+        Returns:
+            int | None: Index der Periode oder None, wenn nichts gefunden wurde.
+        """
+        periods = self._periods
+        if backward: indices = range(min(start, len(periods) - 1), -1, -1)
+        else: indices = range(max(0, start), len(periods))
+        for index in indices:
+            if text in periods[index]: return index
+        return None
+
+    def memory_usage(self, seen=None):
+        """
+        Ungefährer Speicherbedarf der gesammelten Logtexte in Bytes.
+        """
+        return deep_sizeof(self._periods, seen)
+
     def update_log_collector_callback(self, callback):
         """
         Callback vom Controller um das Text Widget zu aktualisieren
         """
         self.update_log_text_widget = callback
 
+class Breeder:
+    """
+    Erzeugt aus den Gehirnen einer Generation das Erbgut der nächsten (Generationssortierung).
+
+    Die besten `survivors` (Anteil nach food_found) behalten ihr Gehirn und sind die Eltern.
+    Die übrigen Plätze erhalten Kinder zweier zufälliger Eltern:
+    - Monte-Carlo, Q-Learning: Je Zustand alle Q-Werte von einem Elternteil, Mutation einzelner Q-Werte
+    - Perzeptron: Je Perzeptron Gewichte von einem Elternteil, Mutation einzelner Gewichte
+    - Policy-Network: Parameter eines Elternteils mit Rauschen (keine Kreuzung, Netze passen nicht zusammen)
+    Mutiert wird jeder Wert mit Wahrscheinlichkeit `rate` um Normalrauschen mit Standardabweichung `sigma`.
+    """
+    def __init__(self, config=None, survivors=None, rate=None, sigma=None):
+        config = config or WorldConfig()
+        self.survivors = config.generation_survivors if survivors is None else survivors
+        self.rate = config.mutation_rate if rate is None else rate
+        self.sigma = config.mutation_sigma if sigma is None else sigma
+
+    def parent_count(self, size):
+        """Anzahl der Eltern (Überlebenden) bei `size` Gehirnen, mindestens 1."""
+        return max(1, round(size * self.survivors))
+
+    def next_generation(self, machine_learning, ranked):
+        """
+        Args:
+            machine_learning (str): Lernverfahren aller Gehirne.
+            ranked (list): [(Fitness, Erbgut), ...] einer Generation.
+
+        Returns:
+            list: Erbgut der nächsten Generation, gleiche Anzahl, Eltern zuerst (beste vorne).
+        """
+        ranked = sorted(ranked, key=lambda item: item[0], reverse=True)
+        parents = [genome for _, genome in ranked[:self.parent_count(len(ranked))]]
+        children = list(parents)
+        while len(children) < len(ranked):
+            child = self.crossover(machine_learning, random.choice(parents), random.choice(parents))
+            children.append(self.mutate(machine_learning, child))
+        return children
+
+    def crossover(self, machine_learning, a, b):
+        """Kind aus zwei Eltern (neues Objekt, Eltern bleiben unverändert)."""
+        if a is None or b is None: return None
+        if machine_learning == "Monte-Carlo" or machine_learning == "Q-Learning":
+            child = {}
+            for state in dict.fromkeys(state for state, _ in [*a, *b]):    # Zustände beider Eltern, feste Reihenfolge
+                source = a if random.random() < 0.5 else b
+                for action in ACTIONS:
+                    if (state, action) in source: child[(state, action)] = source[(state, action)]
+            return child
+        if machine_learning == "Perzeptron":
+            return [(list(w_list), b) for w_list, b in
+                    (pa if random.random() < 0.5 else pb for pa, pb in zip(a, b))]
+        if machine_learning == "Policy-Network":
+            return {key: value.clone() for key, value in a.items()}
+        return None
+
+    def mutate(self, machine_learning, genome):
+        """Verändert einzelne Werte des Erbguts (in place) und gibt es zurück."""
+        if genome is None: return None
+        if machine_learning == "Monte-Carlo" or machine_learning == "Q-Learning":
+            for key in genome:
+                if random.random() < self.rate: genome[key] += random.gauss(0, self.sigma)
+        elif machine_learning == "Perzeptron":
+            for i, (w_list, b) in enumerate(genome):
+                w_list = [w + random.gauss(0, self.sigma) if random.random() < self.rate else w for w in w_list]
+                if random.random() < self.rate: b += random.gauss(0, self.sigma)
+                genome[i] = (w_list, b)
+        elif machine_learning == "Policy-Network":
+            for key, value in genome.items():
+                noise = np.random.normal(0, self.sigma, value.shape) * (np.random.random(value.shape) < self.rate)
+                genome[key] = value + torch.from_numpy(noise.astype(np.float32))
+        return genome
+
+class BrainAutosaver:
+    """
+    Speichert die gelernten Gehirne regelmäßig, ohne den Simulations-Thread zu blockieren.
+
+    `tick()` wird im Simulations-Thread aufgerufen und kopiert nach Ablauf des Intervalls
+    die Daten (snapshot_brain_data). Das Schreiben übernimmt ein Hintergrund-Thread mit
+    atomarem Ersetzen der Dateien. Ist er noch beschäftigt, wird nur die neueste Kopie behalten.
+    Je Lernverfahren wird die Ameise mit den meisten Futterfunden gespeichert, da sich alle
+    Ameisen eines Lernverfahrens eine Datei teilen. Berücksichtigt werden nur Gehirne, die seit
+    dem letzten Speichern gelernt haben (Brain.learned).
+
+    Geschrieben wird in eigene Dateien neben den Daten des Lernverfahrens (autosave_file, z.B.
+    "Q-Learning.autosave.csv"), die gespeicherten Gehirne selbst werden nie überschrieben.
+    """
+    def __init__(self, world, interval=AUTOSAVE_SECONDS):
+        self.world = world
+        self.interval = float(interval)         # Sekunden, 0 = aus
+        self.saves = 0                          # Anzahl geschriebener Kopien
+        self._last = time.monotonic()
+        self._pending = None                    # Wartende Kopien [(Brain, Kopie), ...]
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        """Startet den Hintergrund-Thread zum Schreiben."""
+        if self._thread: return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="BrainAutosaver", daemon=True)
+        self._thread.start()
+
+    def stop(self, flush=True):
+        """Beendet den Hintergrund-Thread, schreibt vorher (flush) noch einmal alle Gehirne."""
+        if not self._thread: return
+        if flush and self.interval > 0: self.snapshot()
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self._thread.join()
+        self._thread = None
+
+    @staticmethod
+    def autosave_file(brain):
+        """Datei für die automatische Sicherung eines Gehirns, z.B. "Q-Learning.csv" -> "Q-Learning.autosave.csv"."""
+        file = brain.config.policy_network_file if brain.ant_machine_learning == "Policy-Network" else brain.data_file
+        root, ext = os.path.splitext(file)
+        return f"{root}.autosave{ext}"
+
+    def tick(self):
+        """Im Simulations-Thread aufrufen: Kopiert die Gehirne, wenn das Intervall abgelaufen ist."""
+        if self.interval <= 0 or time.monotonic() - self._last < self.interval: return
+        self.snapshot()
+
+    def snapshot(self):
+        """Kopiert die zu speichernden Gehirne und übergibt sie dem Hintergrund-Thread."""
+        self._last = time.monotonic()
+        best = {}                               # Lernverfahren -> Ameise mit den meisten Futterfunden
+        learned = []                            # Gehirne mit neuem Lernstand
+        for ant in self.world.ants.iter_all():
+            if ant.brain.ant_strategy != "brain" or not ant.brain.learned: continue
+            learned.append(ant.brain)
+            other = best.get(ant.brain.ant_machine_learning)
+            if other is None or ant.food_found > other.food_found:
+                best[ant.brain.ant_machine_learning] = ant
+        jobs = [(ant.brain, ant.brain.snapshot_brain_data()) for ant in best.values()]
+        jobs = [(brain, snapshot) for brain, snapshot in jobs if snapshot is not None]
+        for brain in learned: brain.learned = False
+        if not jobs: return
+        with self._condition:
+            self._pending = jobs                # Ältere, noch nicht geschriebene Kopie verwerfen
+            self._condition.notify()
+
+    def _run(self):
+        """Hintergrund-Thread: Schreibt wartende Kopien auf die Festplatte."""
+        while True:
+            with self._condition:
+                while self._pending is None and self._running:
+                    self._condition.wait()
+                jobs, self._pending = self._pending, None
+                if jobs is None: return         # Beendet und nichts mehr zu schreiben
+            for brain, snapshot in jobs:
+                try:
+                    brain.write_brain_snapshot(snapshot, self.autosave_file(brain))
+                except Exception as e:
+                    logger.error(f"Automatisches Speichern fehlgeschlagen ({brain.ant_machine_learning}): {e}")
+            self.saves += 1
+            logger.info(f"Automatisch gespeichert: {', '.join(brain.ant_machine_learning for brain, _ in jobs)}")
+
+class MetricsRecorder:
+    """
+    Zeichnet je Tick strukturierte Kennzahlen der Welt auf (statt sie aus Logtexten zu lesen).
+
+    Spalten: tick, generation, ants_alive, food_found (im Tick, gesamt und je Strategie bzw.
+    Lernverfahren), orka_mean, q_coverage (Anteil belegter Q-Werte, Monte-Carlo/Q-Learning),
+    policy_loss (mittlerer letzter Loss, Policy-Network) und action_up/down/left/right.
+
+    `record()` wird im Simulations-Thread aufgerufen und schreibt nur in vorab angelegte
+    NumPy-Spalten. Volle Blöcke (`chunk_ticks` Zeilen) schreibt ein Hintergrund-Thread spaltenweise
+    als .npy-Arrays hintereinander in eine Datei: Zuerst die Spaltennamen, dann je Block ein Array
+    je Spalte. `MetricsRecorder.load()` liest die Datei wieder als Dictionary aus Arrays.
+    """
+    GROUPS = ("random", "odor", "Monte-Carlo", "Q-Learning", "Perzeptron", "Policy-Network")
+
+    def __init__(self, world, file=METRICS_FILE, chunk_ticks=METRICS_CHUNK_TICKS):
+        self.world = world
+        self.file = file                        # "" = aus
+        self.chunk_ticks = max(1, int(chunk_ticks))
+        self.columns = [("tick", np.int64), ("generation", np.int32), ("ants_alive", np.int32),
+                        ("food_found", np.int32)]
+        self.columns += [(f"food_found_{group}", np.int32) for group in self.GROUPS]
+        self.columns += [("orka_mean", np.float32), ("q_coverage", np.float32), ("policy_loss", np.float32)]
+        self.columns += [(f"action_{direction}", np.int32) for direction in DIRECTIONS]
+        self.ticks = 0                          # Anzahl aufgezeichneter Ticks
+        self._chunk = None                      # Spalte -> Array des laufenden Blocks
+        self._row = 0
+        self._queue = queue.Queue(maxsize=16)   # Volle Blöcke für den Schreib-Thread
+        self._out = None
+        self._thread = None
+
+    def start(self):
+        """Öffnet die Datei, schreibt die Spaltennamen und startet den Schreib-Thread."""
+        if not self.file or self._thread: return
+        self._out = open(self.file, "wb")
+        np.save(self._out, np.array([name for name, _ in self.columns]), allow_pickle=False)
+        self._chunk = self.new_chunk()
+        self._thread = threading.Thread(target=self._run, name="MetricsRecorder", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Schreibt den angefangenen Block, beendet den Schreib-Thread und schließt die Datei."""
+        if not self._thread: return
+        if self._row: self._queue.put((self._chunk, self._row))
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self._out.close()
+        self._out = None
+        logger.info(f"Kennzahlen gespeichert: {self.file} ({self.ticks} Ticks)")
+
+    def new_chunk(self):
+        self._row = 0
+        return {name: np.zeros(self.chunk_ticks, dtype=dtype) for name, dtype in self.columns}
+
+    def record(self):
+        """Im Simulations-Thread nach World.update aufrufen: Eine Zeile für den letzten Tick."""
+        if not self._thread: return
+        world = self.world
+        chunk, row = self._chunk, self._row
+        ants = 0
+        orka = 0
+        coverage, coverage_ants = 0, 0
+        loss, loss_ants = 0.0, 0
+        for ant in world.ants:                                          # Nur aktive Ameisen
+            ants += 1
+            orka += ant.orka
+            brain = ant.brain
+            if brain.ant_strategy != "brain": continue
+            if brain.ant_machine_learning == "Q-Learning" or brain.ant_machine_learning == "Monte-Carlo":
+                coverage += len(brain._q)
+                coverage_ants += 1
+            elif brain.ant_machine_learning == "Policy-Network" and brain.last_loss == brain.last_loss:  # nicht NaN
+                loss += brain.last_loss
+                loss_ants += 1
+        chunk["tick"][row] = world.ticks
+        chunk["generation"][row] = world.generation
+        chunk["ants_alive"][row] = ants
+        chunk["food_found"][row] = sum(world.tick_food.values())
+        for (strategy, machine_learning), count in world.tick_food.items():
+            group = machine_learning if strategy == "brain" else strategy
+            if group in self.GROUPS: chunk[f"food_found_{group}"][row] = count
+        chunk["orka_mean"][row] = orka / ants if ants else np.nan
+        chunk["q_coverage"][row] = coverage / (coverage_ants * len(STATES) * len(ACTIONS)) if coverage_ants else np.nan
+        chunk["policy_loss"][row] = loss / loss_ants if loss_ants else np.nan
+        for direction, count in enumerate(world.tick_actions):
+            chunk[f"action_{DIRECTIONS[direction]}"][row] = count
+        self.ticks += 1
+        self._row += 1
+        if self._row == self.chunk_ticks:                               # Block voll: An den Schreib-Thread
+            self._queue.put((chunk, self._row))
+            self._chunk = self.new_chunk()
+
+    def _run(self):
+        """Hintergrund-Thread: Schreibt volle Blöcke spaltenweise in die Datei."""
+        while True:
+            item = self._queue.get()
+            if item is None: return
+            chunk, rows = item
+            try:
+                for name, _ in self.columns:
+                    np.save(self._out, chunk[name][:rows], allow_pickle=False)
+                self._out.flush()
+            except Exception as e:
+                logger.error(f"Kennzahlen konnten nicht geschrieben werden ({self.file}): {e}")
+
+    @staticmethod
+    def load(file):
+        """
+        Liest eine Kennzahlen-Datei. Ein unvollständiger letzter Block (Abbruch) wird ignoriert.
+
+        Returns:
+            dict[str, np.ndarray]: Spalte -> Werte aller Ticks (z.B. für pd.DataFrame).
+        """
+        with open(file, "rb") as data:
+            names = [str(name) for name in np.load(data, allow_pickle=False)]
+            parts = {name: [] for name in names}
+            while True:
+                try:
+                    arrays = [np.load(data, allow_pickle=False) for _ in names]
+                except (EOFError, ValueError):                         # Dateiende
+                    break
+                for name, array in zip(names, arrays):
+                    parts[name].append(array)
+        return {name: np.concatenate(arrays) if arrays else np.empty(0) for name, arrays in parts.items()}
+
+class TrajectoryRecorder:
+    """
+    Zeichnet je Tick die Positionen der Ameisen und des Futters für die Wiedergabe auf (TrajectoryReader).
+
+    Dateiformat (little-endian): Kopf MAGIC, Breite, Höhe, Zellengröße, Topologie. Danach je Tick ein
+    Frame mit FRAME (Tick, Flags, Anzahl Ameisen, Anzahl Futter) und Nutzdaten:
+    - Schlüsselbild (KEY): x, y je Ameise (uint16) und Farbcode (uint8)
+    - Sonst nur ein Richtungscode je Ameise (uint8, UP ... NO_DIRECTION): Ausgeführte Bewegung seit dem Vortick
+    - Bei FOODS zusätzlich x, y (uint16) und Farbcode (uint8) je Futter (nur wenn sich Futter geändert hat)
+    Ein Schlüsselbild wird geschrieben, wenn sich die Ameisen geändert haben, eine Ameise mehr als eine Zelle
+    gesprungen ist (z.B. neue Generation) und spätestens alle `keyframe_ticks` Ticks (schnelles Springen).
+    """
+    MAGIC = b"ANTTRAJ1"
+    HEADER = struct.Struct("<8sIIII")           # Kennung, Breite, Höhe, Zellengröße, Topologie (Index in TOPOLOGIES)
+    FRAME = struct.Struct("<qBII")              # Tick, Flags, Anzahl Ameisen, Anzahl Futter
+    KEY, FOODS = 1, 2                           # Flags
+    # Schritt (dx + 1) * 3 + (dy + 1) -> Richtungscode, 255 = kein einzelner Schritt
+    STEP_CODES = np.array([next((code for code in range(NO_DIRECTION + 1) if (DX[code] + 1) * 3 + DY[code] + 1 == key), 255)
+                           for key in range(9)], dtype=np.uint8)
+
+    def __init__(self, world, file=TRAJECTORY_FILE, keyframe_ticks=TRAJECTORY_KEYFRAME_TICKS):
+        self.world = world
+        self.file = file                        # "" = aus
+        self.keyframe_ticks = max(1, int(keyframe_ticks))
+        self.frames = 0                         # Anzahl geschriebener Frames
+        self._out = None
+        self._ants = None                       # Ameisen des letzten Frames (Reihenfolge)
+        self._xy = None                         # Positionen des letzten Frames
+        self._foods = None                      # Futter des letzten Frames
+        self._last_key = 0
+
+    @staticmethod
+    def color_code(color):
+        """Farbe als Index in COLORS (unbekannte Farben, z.B. RGB-Tupel, werden schwarz)."""
+        if isinstance(color, str) and color.upper() in COLORS: return COLORS.index(color.upper())
+        return COLORS.index("BLACK")
+
+    def start(self):
+        """Öffnet die Datei und schreibt den Kopf."""
+        if not self.file or self._out: return
+        world = self.world
+        self._out = open(self.file, "wb", buffering=1 << 20)
+        self._out.write(self.HEADER.pack(self.MAGIC, world.grid_width, world.grid_height, world.grid_size,
+                                         TOPOLOGIES.index(world.topology)))
+        self._ants = None
+        self._foods = None
+
+    def stop(self):
+        """Schreibt den Puffer und schließt die Datei."""
+        if not self._out: return
+        self._out.close()
+        self._out = None
+        logger.info(f"Bewegungen gespeichert: {self.file} ({self.frames} Ticks)")
+
+    def record(self):
+        """Im Simulations-Thread nach World.update aufrufen: Ein Frame für den letzten Tick."""
+        if not self._out: return
+        world = self.world
+        ants = list(world.ants)
+        xy = np.array([(ant.pos_x, ant.pos_y) for ant in ants], dtype=np.int64).reshape(-1, 2)
+        foods = [(food.pos_x, food.pos_y, self.color_code(food.color)) for food in world.foods]
+        flags = 0
+        codes = None
+        if ants == self._ants and world.ticks - self._last_key < self.keyframe_ticks:
+            dx = xy[:, 0] - self._xy[:, 0]
+            dy = xy[:, 1] - self._xy[:, 1]
+            if world.topology == "torus":                           # Über den Rand: -1 bzw. +1
+                dx = (dx + 1) % world.grid_width - 1
+                dy = (dy + 1) % world.grid_height - 1
+            step = np.abs(dx) + np.abs(dy) <= 1
+            if step.all():
+                codes = self.STEP_CODES[(dx + 1) * 3 + dy + 1]
+        if codes is None:
+            flags |= self.KEY | self.FOODS
+            self._last_key = world.ticks
+        elif foods != self._foods:
+            flags |= self.FOODS
+        out = self._out
+        out.write(self.FRAME.pack(world.ticks, flags, len(ants), len(foods)))
+        if flags & self.KEY:
+            out.write(xy.astype("<u2").tobytes())
+            out.write(bytes(self.color_code(ant.color) for ant in ants))
+        else:
+            out.write(codes.tobytes())
+        if flags & self.FOODS:
+            out.write(np.array([(x, y) for x, y, _ in foods], dtype="<u2").tobytes())
+            out.write(bytes(color for _, _, color in foods))
+        self._ants, self._xy, self._foods = ants, xy, foods
+        self.frames += 1
+
+class TrajectoryReader:
+    """
+    Liest eine Datei des TrajectoryRecorders über memory-mapping, ohne Ameisen oder Gehirne zu erzeugen.
+
+    Beim Öffnen werden nur die Frame-Köpfe gelesen (Index). `frame(i)` setzt die Positionen ab dem
+    letzten Schlüsselbild (bzw. dem zuletzt gelesenen Frame beim Vorwärtslaufen) aus den Richtungscodes zusammen.
+    Ein unvollständiger letzter Frame (Abbruch der Aufzeichnung) wird ignoriert.
+    """
+    def __init__(self, file):
+        self.file = file
+        self.data = np.memmap(file, dtype=np.uint8, mode="r")
+        header = TrajectoryRecorder.HEADER
+        magic, self.grid_width, self.grid_height, self.grid_size, topology = header.unpack_from(self.data, 0)
+        if magic != TrajectoryRecorder.MAGIC:
+            raise ValueError(f"Keine Bewegungsdatei: {file}")
+        self.topology = TOPOLOGIES[topology]
+        self.offsets, self.ticks, self.keyframes, self.food_frames = [], [], [], []
+        self.index(header.size)
+        self._cache = None                      # (Frame, x, y, Farben) des zuletzt gelesenen Frames
+        self._dx = np.array(DX, dtype=np.int64)
+        self._dy = np.array(DY, dtype=np.int64)
+
+    def index(self, offset):
+        """Liest alle Frame-Köpfe und merkt sich Position, Tick, Schlüsselbilder und Futteränderungen."""
+        frame, size = TrajectoryRecorder.FRAME, len(self.data)
+        while offset + frame.size <= size:
+            tick, flags, ants, foods = frame.unpack_from(self.data, offset)
+            end = offset + frame.size + (ants * 5 if flags & TrajectoryRecorder.KEY else ants)
+            if flags & TrajectoryRecorder.FOODS: end += foods * 5
+            if end > size: break                                    # Unvollständiger Frame
+            if flags & TrajectoryRecorder.KEY: self.keyframes.append(len(self.offsets))
+            if flags & TrajectoryRecorder.FOODS: self.food_frames.append(len(self.offsets))
+            self.offsets.append(offset)
+            self.ticks.append(tick)
+            offset = end
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def world(self):
+        """Leere Welt in der aufgezeichneten Größe (für die Darstellung)."""
+        return World(WorldConfig({"GRID_WIDTH": self.grid_width, "GRID_HEIGHT": self.grid_height,
+                                  "GRID_SIZE": self.grid_size, "WORLD_TOPOLOGY": self.topology}))
+
+    def read_header(self, index):
+        offset = self.offsets[index]
+        return offset + TrajectoryRecorder.FRAME.size, TrajectoryRecorder.FRAME.unpack_from(self.data, offset)
+
+    def frame(self, index):
+        """
+        Returns:
+            tuple: (Tick, Ameisen x, Ameisen y, Ameisen Farbcodes, Futter x, Futter y, Futter Farbcodes)
+        """
+        start = self.keyframes[bisect.bisect_right(self.keyframes, index) - 1]
+        if self._cache and start <= self._cache[0] <= index:        # Vorwärts ab dem zuletzt gelesenen Frame
+            current, x, y, colors = self._cache
+        else:
+            current = start
+            offset, (_, _, ants, _) = self.read_header(start)
+            xy = self.data[offset:offset + ants * 4].view("<u2").reshape(-1, 2).astype(np.int64)
+            x, y = xy[:, 0], xy[:, 1]
+            colors = np.array(self.data[offset + ants * 4:offset + ants * 5])
+        for i in range(current + 1, index + 1):
+            offset, (_, _, ants, _) = self.read_header(i)
+            codes = self.data[offset:offset + ants]
+            x = x + self._dx[codes]
+            y = y + self._dy[codes]
+            if self.topology == "torus":
+                x %= self.grid_width
+                y %= self.grid_height
+        self._cache = (index, x, y, colors)
+
+        food_index = self.food_frames[bisect.bisect_right(self.food_frames, index) - 1]
+        offset, (_, flags, ants, foods) = self.read_header(food_index)
+        offset += ants * 5 if flags & TrajectoryRecorder.KEY else ants
+        food_xy = self.data[offset:offset + foods * 4].view("<u2").reshape(-1, 2)
+        food_colors = self.data[offset + foods * 4:offset + foods * 5]
+        return self.ticks[index], x, y, colors, food_xy[:, 0], food_xy[:, 1], food_colors
+
 class DataStorage:
     """
     Klasse zur Speicherung und zum Laden von Q-Learning-Daten in CSV-Dateien.
@@ -1200,10 +3010,29 @@ class DataStorage:
             logger.error(f"Fehler beim Lesen der CSV-Datei: {e}")
             return pd.DataFrame()  # Gibt ein leeres DataFrame zurück als "Fallback"
 
+    @staticmethod
+    def atomic_write(file, write):
+        """
+        Schreibt eine Datei atomar: `write(pfad)` schreibt in eine temporäre Datei im selben
+        Verzeichnis, die danach die Zieldatei ersetzt. So gibt es nie halb geschriebene Dateien.
+
+        Args:
+            file (str): Zieldatei.
+            write: Funktion, die den Inhalt in den übergebenen Pfad schreibt.
+        """
+        folder, name = os.path.split(os.path.abspath(file))
+        tmp = os.path.join(folder, f".{name}.{os.getpid()}.{threading.get_ident()}.tmp")   # Eindeutig je Thread
+        try:
+            write(tmp)
+            os.replace(tmp, file)                   # Atomar (auch unter Windows)
+        except BaseException:
+            if os.path.exists(tmp): os.remove(tmp)
+            raise
+
     def save_data_to_csv_file(self, array, file):
         try:
-            # Versuchen, das Array in eine CSV-Datei zu speichern
-            array.to_csv(file, index=False)  # index=False vermeidet das Speichern der Index-Spalte
+            # Versuchen, das Array in eine CSV-Datei zu speichern (index=False vermeidet die Index-Spalte)
+            self.atomic_write(file, lambda tmp: array.to_csv(tmp, index=False))
             logger.info(f"Erfolgreich in {file} gespeichert.")  # Erfolgsnachricht (kann auch entfernt werden)
         except PermissionError:
             logger.error(f"Fehler: Keine Schreibberechtigung für die Datei {file}.")
@@ -1238,13 +3067,16 @@ class DataStorage:
             return None
 
     def save_json_file(self, file, dict_data):
-        try:
-            with open(file, 'w') as json_file:
+        def write(tmp):
+            with open(tmp, 'w') as json_file:
                 json.dump(dict_data, json_file, indent=4)
+        try:
+            self.atomic_write(file, write)
             logger.info("Einstellungen erfolgreich gespeichert.")
         except Exception as e:
             logger.error(f"Fehler beim Speichern der Datei: {e}")
 
 # === Testpoint ===
 if __name__ == "__main__":
+    import main
     main.main()
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""
+Dieses Modul `network` enthält das neuronale Netz (torch) der Policy-Network-Ameisen.
+
+Es wird von `model` erst geladen, wenn ein Brain mit dem Lernverfahren "Policy-Network"
+erzeugt wird, da der Import von torch mehrere Sekunden dauert.
+
+Zusätzlich stellt `NumpyPolicy` die Vorhersage des Netzes mit reinen NumPy-Matrix-
+multiplikationen bereit, torch wird dann nur noch für das Training gebraucht.
+
+Autor: Artur Lamparter <arturlamparter@web.de>
+"""
+import numpy as np
+import torch.nn as nn
+import torch.nn.functional as F
+
+
+class PolicyNetwork(nn.Module):
+    def __init__(self, input_size=4, hidden_size=16, output_size=4):
+        super(PolicyNetwork, self).__init__()
+        self.fc1 = nn.Linear(input_size, hidden_size)
+        self.fc2 = nn.Linear(hidden_size, output_size)
+
+    def forward(self, x):
+        x = F.relu(self.fc1(x))
+        return self.fc2(x)  # Ausgabe = Scores für jede Richtung
+
+
+class NumpyPolicy:
+    """
+    Kopie der Gewichte eines PolicyNetwork als NumPy-Arrays für die Vorhersage ohne torch.
+
+    Rechnet dieselbe Funktion wie PolicyNetwork.forward (Linear -> ReLU -> Linear),
+    aber ohne Autograd-Graph und torch-Aufrufkosten. Eingabe ist ein Zustand (4,)
+    oder ein Stapel von Zuständen (N, 4).
+    """
+    def __init__(self, w1, b1, w2, b2):
+        self.w1 = w1        # (Eingänge, Versteckt)
+        self.b1 = b1
+        self.w2 = w2        # (Versteckt, Ausgänge)
+        self.b2 = b2
+
+    @classmethod
+    def from_network(cls, network):
+        """Übernimmt die aktuellen Gewichte (Kopie) aus einem PolicyNetwork."""
+        def export(tensor):
+            return tensor.detach().cpu().numpy().astype(np.float32, copy=True)
+        return cls(export(network.fc1.weight).T, export(network.fc1.bias),
+                   export(network.fc2.weight).T, export(network.fc2.bias))
+
+    def __call__(self, states):
+        """
+        Args:
+            states: Zustand (4,) oder Zustände (N, 4).
+
+        Returns:
+            np.ndarray: Scores je Richtung, Form (4,) bzw. (N, 4).
+        """
+        x = np.asarray(states, dtype=np.float32)
+        hidden = x @ self.w1
+        hidden += self.b1
+        np.maximum(hidden, 0, out=hidden)                  # ReLU
+        return hidden @ self.w2 + self.b2
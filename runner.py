@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Dieses Modul `runner` führt Ameisen-Welten ohne grafische Oberfläche aus.
+
+Es umfasst einen Headless-Runner für einzelne Welten und einen Sweep-Runner, der viele
+Welten mit unterschiedlichen Parametern (z.B. ALPHA, GAMMA, EPS, Futteranzahl, ORKA)
+parallel in einem Prozess-Pool rechnet und die Kennzahlen in einer Ergebnistabelle sammelt.
+
+Beispiel:
+    python runner.py --ticks 2000 --set ANTS=20 ANT_MACHINE_LEARNING=Q-Learning \\
+                     --sweep ALPHA=0.05,0.1,0.2 GAMMA=0.8,0.9 --workers 4 --out sweep.csv
+
+    # Langer Lauf mit Zwischenstand alle 10000 Ticks, später genau dort fortsetzen
+    python runner.py --ticks 100000 --set ANTS=50 ANT_STRATEGY=brain --snapshot run.npz --checkpoint-every 10000
+    python runner.py --ticks 100000 --resume run.npz --snapshot run.npz --checkpoint-every 10000
+
+    # Kennzahlen je Tick spaltenweise speichern, danach mit model.MetricsRecorder.load() auswerten
+    python runner.py --ticks 1000000 --set ANTS=50 ANT_STRATEGY=brain --metrics metrics.npy
+
+    # Bewegungen aufzeichnen und danach im PyGame-Fenster abspielen
+    python runner.py --ticks 100000 --set ANTS=50 ANT_STRATEGY=brain --trajectory run.traj
+    python main.py --replay run.traj
+
+    # Jedes 50. Bild ohne Bildschirm als PNG speichern (Schreiben im Hintergrund, verwirft statt zu bremsen)
+    python runner.py --ticks 20000 --set ANTS=50 ANT_STRATEGY=brain --frames frames --frame-every 50
+
+Autor: Artur Lamparter <arturlamparter@web.de>
+"""
+import argparse
+import itertools
+import json
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import model
+
+pd = model.LazyModule("pandas")     # Nur für die Ergebnistabelle
+view = model.LazyModule("view")     # Nur für --frames (pygame, tkinter)
+
+# Einstellungen, die der Runner selbst auswertet (alle anderen gehen an model.WorldConfig)
+RUN_DEFAULTS = {"TICKS": 1000,                                  # Simulationsschritte
+                "ANTS": 10,                                     # Anzahl Ameisen
+                "FOODS": 100,                                   # Anzahl Futter
+                "ANT_STRATEGY": model.ANT_STRATEGY,             # ["random", "odor", "brain"]
+                "ANT_MACHINE_LEARNING": model.ANT_MACHINE_LEARNING,  # Bestimte brain Methode
+                "CSV_LOAD": 0,                                  # Gelernte Daten laden
+                "SEED": 0}                                      # Zufallsstartwert
+
+
+class HeadlessRunner:
+    """
+    Führt eine einzelne Welt ohne PyGame/Tk aus.
+
+    Attributes:
+        settings: Einstellungen des Laufs (RUN_DEFAULTS und Schlüssel aus config.json).
+        world: Die simulierte Welt.
+    """
+    def __init__(self, settings=None, snapshot=None, metrics=None, trajectory=None, frames=None, frame_every=10):
+        """
+        Erzeugt die Welt mit Futter und Ameisen.
+
+        Args:
+            settings (dict): Überschreibt RUN_DEFAULTS bzw. config.json Werte.
+            snapshot (str): Welt aus dieser Snapshot-Datei fortsetzen (World.save_snapshot).
+                Welt, Ameisen und Zufallsgeneratoren kommen dann aus der Datei, nur TICKS wird verwendet.
+            metrics (str): Kennzahlen je Tick in diese Datei schreiben (model.MetricsRecorder), bis close().
+            trajectory (str): Bewegungen je Tick in diese Datei schreiben (model.TrajectoryRecorder), bis close().
+            frames (str): Ordner für PNG-Bilder jedes `frame_every`-ten Ticks (view.FrameExporter), bis close().
+        """
+        settings = dict(settings or {})
+        self.settings = {key: settings.pop(key, default) for key, default in RUN_DEFAULTS.items()}
+        self.settings.update(settings)
+        if snapshot:
+            self.world = model.World.load_snapshot(snapshot)
+        else:
+            self.seed(int(self.settings["SEED"]))
+            self.world = model.World(model.WorldConfig(settings))
+            self.world.foods.generate_food(int(self.settings["FOODS"]))
+            self.world.update_odor_world()
+            self.world.ants.generate_ants(int(self.settings["ANTS"]), self.settings["ANT_STRATEGY"],
+                                          self.settings["ANT_MACHINE_LEARNING"], bool(int(self.settings["CSV_LOAD"])))
+        self.recorder = model.MetricsRecorder(self.world, metrics or "")
+        self.trajectory = model.TrajectoryRecorder(self.world, trajectory or "")
+        self.frames = view.FrameExporter(view.PyGameWindow(self.world, offscreen=True), frames, frame_every) if frames else None
+        self.elapsed = 0.0
+        self.ticks_run = 0                              # Schritte dieses Laufs (ohne die aus dem Snapshot)
+
+    @staticmethod
+    def seed(seed):
+        """
+        Setzt alle Zufallsgeneratoren, damit ein Lauf wiederholbar ist.
+        """
+        random.seed(seed)
+        np.random.seed(seed)
+        if "torch" in sys.modules:                      # torch nur seeden, wenn geladen
+            sys.modules["torch"].manual_seed(seed)
+
+    def run(self, ticks=None, checkpoint=None, checkpoint_every=0):
+        """
+        Führt die Simulationsschritte aus.
+
+        Args:
+            ticks (int): Anzahl der Schritte, Standard aus den Einstellungen (TICKS).
+            checkpoint (str): Snapshot-Datei für Zwischenstände.
+            checkpoint_every (int): Alle n Schritte einen Snapshot speichern (0 = nie).
+        """
+        ticks = int(self.settings["TICKS"] if ticks is None else ticks)
+        self.recorder.start()
+        self.trajectory.start()
+        if self.frames: self.frames.start()
+        start = time.perf_counter()
+        for tick in range(1, ticks + 1):
+            self.world.update()
+            self.recorder.record()
+            self.trajectory.record()
+            if self.frames: self.frames.capture(self.world.ticks)
+            if checkpoint and checkpoint_every and tick % checkpoint_every == 0:
+                self.world.save_snapshot(checkpoint)
+        self.elapsed += time.perf_counter() - start
+        self.ticks_run += ticks
+        return self
+
+    def close(self):
+        """
+        Schreibt die restlichen Kennzahlen, Bewegungen bzw. Bilder und schließt die Dateien.
+        """
+        self.recorder.stop()
+        self.trajectory.stop()
+        if self.frames: self.frames.stop()
+
+    def metrics(self):
+        """
+        Gibt die Kennzahlen des Laufs zurück.
+
+        Returns:
+            dict: z.B. {"ticks": 1000, "food_found": 42, ...}
+        """
+        ants = list(self.world.ants.iter_all())        # Auch archivierte (ohne Energie)
+        food_found = [ant.food_found for ant in ants]
+        return {"ticks": self.world.ticks,
+                "ants": len(ants),
+                "ants_alive": len(self.world.ants),
+                "food_found": sum(food_found),
+                "food_found_mean": float(np.mean(food_found)) if ants else 0.0,
+                "food_found_max": max(food_found, default=0),
+                "orka_mean": float(np.mean([ant.orka for ant in ants])) if ants else 0.0,
+                "memory_mb": round(self.world.memory_usage()["total"] / 2 ** 20, 2),
+                "seconds": round(self.elapsed, 3),
+                "ticks_per_second": round(self.ticks_run / self.elapsed, 1) if self.elapsed else 0.0}
+
+
+def run_world(settings):
+    """
+    Führt eine Welt aus und gibt Einstellungen und Kennzahlen als eine Tabellenzeile zurück.
+    Wird im Worker-Prozess ausgeführt, daher eine Funktion auf Modulebene.
+    """
+    runner = HeadlessRunner(settings).run()
+    return {**settings, **runner.metrics()}
+
+
+class SweepRunner:
+    """
+    Rechnet viele Welten mit unterschiedlichen Parametern parallel in einem Prozess-Pool.
+
+    Aus `grid` wird das kartesische Produkt gebildet, z.B.
+    {"ALPHA": [0.1, 0.2], "EPS": [0.05, 0.1]} -> 4 Welten.
+    """
+    def __init__(self, base_settings=None, grid=None, repeats=1, workers=None):
+        """
+        Args:
+            base_settings (dict): Für alle Welten gleiche Einstellungen.
+            grid (dict[str, list]): Zu variierende Einstellungen.
+            repeats (int): Wiederholungen je Kombination (mit unterschiedlichem SEED).
+            workers (int): Anzahl Prozesse, None = Anzahl CPUs.
+        """
+        self.base_settings = dict(base_settings or {})
+        self.grid = dict(grid or {})
+        self.repeats = int(repeats)
+        self.workers = workers
+        self.results = None
+
+    def settings_list(self):
+        """
+        Gibt die Einstellungen aller Welten des Sweeps zurück.
+        """
+        keys = list(self.grid)
+        settings_list = []
+        for values in itertools.product(*(self.grid[key] for key in keys)):
+            for repeat in range(self.repeats):
+                settings = dict(self.base_settings, **dict(zip(keys, values)))
+                settings["SEED"] = int(settings.get("SEED", RUN_DEFAULTS["SEED"])) + repeat
+                settings_list.append(settings)
+        return settings_list
+
+    def run(self):
+        """
+        Führt alle Welten im Prozess-Pool aus und sammelt die Ergebnisse.
+
+        Returns:
+            pd.DataFrame: Eine Zeile je Welt (Einstellungen + Kennzahlen).
+        """
+        settings_list = self.settings_list()
+        model.logger.info(f"Sweep: {len(settings_list)} Welten, Prozesse: {self.workers or 'alle CPUs'}")
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            rows = list(pool.map(run_world, settings_list))
+        self.results = pd.DataFrame(rows)
+        return self.results
+
+    def save(self, file):
+        """
+        Speichert die Ergebnistabelle als CSV-Datei.
+        """
+        model.DataStorage().save_data_to_csv_file(self.results, file)
+
+
+def parse_value(text):
+    """Wandelt einen Kommandozeilenwert in Zahl/Bool/String um (JSON, sonst Text)."""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+def parse_settings(items, multiple=False):
+    """
+    Wandelt ["KEY=VALUE", ...] (bzw. "KEY=V1,V2" bei multiple) in ein Dictionary um.
+    """
+    settings = {}
+    for item in items or []:
+        key, _, value = item.partition("=")
+        settings[key.upper()] = [parse_value(v) for v in value.split(",")] if multiple else parse_value(value)
+    return settings
+
+
+def main(argv=None):
+    """
+    Kommandozeile: Einzelne Welt (ohne --sweep) oder Parameter-Sweep ausführen.
+    """
+    parser = argparse.ArgumentParser(description="Ameisen-Simulation ohne Oberfläche")
+    parser.add_argument("--ticks", type=int, default=RUN_DEFAULTS["TICKS"], help="Simulationsschritte je Welt")
+    parser.add_argument("--set", nargs="*", metavar="KEY=VALUE", help="Einstellungen für alle Welten")
+    parser.add_argument("--sweep", nargs="*", metavar="KEY=V1,V2", help="Zu variierende Einstellungen")
+    parser.add_argument("--repeats", type=int, default=1, help="Wiederholungen je Kombination")
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl Prozesse")
+    parser.add_argument("--out", default=None, help="Ergebnis-CSV")
+    parser.add_argument("--memory", action="store_true", help="Speicherbericht und tracemalloc-Zuwachs (einzelne Welt)")
+    parser.add_argument("--resume", default=None, help="Welt aus Snapshot-Datei fortsetzen (einzelne Welt)")
+    parser.add_argument("--snapshot", default=None, help="Snapshot am Ende (und bei --checkpoint-every) speichern")
+    parser.add_argument("--checkpoint-every", type=int, default=0, help="Snapshot alle n Ticks (mit --snapshot)")
+    parser.add_argument("--metrics", default=None, help="Kennzahlen je Tick als Datei (einzelne Welt)")
+    parser.add_argument("--trajectory", default=None, help="Bewegungen je Tick für main.py --replay (einzelne Welt)")
+    parser.add_argument("--frames", default=None, help="Ordner für PNG-Bilder ohne Bildschirm (einzelne Welt)")
+    parser.add_argument("--frame-every", type=int, default=10, help="Jeden n-ten Tick als Bild speichern (mit --frames)")
+    args = parser.parse_args(argv)
+
+    base_settings = dict(parse_settings(args.set), TICKS=args.ticks)
+    if args.sweep:
+        sweep = SweepRunner(base_settings, parse_settings(args.sweep, multiple=True), args.repeats, args.workers)
+        results = sweep.run()
+        if args.out: sweep.save(args.out)
+    else:
+        runner = HeadlessRunner(base_settings, snapshot=args.resume, metrics=args.metrics,
+                                trajectory=args.trajectory, frames=args.frames, frame_every=args.frame_every)
+        if args.memory: model.memory_tracer.start()     # Zuwachs nur während der Simulation
+        runner.run(checkpoint=args.snapshot, checkpoint_every=args.checkpoint_every)
+        runner.close()
+        if args.snapshot: runner.world.save_snapshot(args.snapshot)
+        if args.memory:
+            print(runner.world.memory_report())
+            print(model.memory_tracer.diff())
+            model.memory_tracer.stop()
+        results = pd.DataFrame([{**base_settings, **runner.metrics()}])
+        if args.out: model.DataStorage().save_data_to_csv_file(results, args.out)
+    print(results.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
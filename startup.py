@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Dieses Modul `startup` misst die Importzeit (Startzeit) der Projektmodule.
+
+Jedes Modul wird in einem frischen Python-Prozess mit `-X importtime` importiert.
+Der Bericht zeigt die Gesamtzeit, die teuersten direkten Importe und ob schwere
+Bibliotheken (torch, pandas, matplotlib) schon beim Start geladen werden.
+Liegt ein Modul über seinem Budget, endet der Aufruf mit Rückgabewert 1.
+
+Aufruf:
+    python startup.py                 # Bericht mit Standardbudget
+    python startup.py --budget-ms 500 # Eigenes Budget für alle Module
+
+Autor: Artur Lamparter <arturlamparter@web.de>
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ["torch", "pandas", "matplotlib"]       # Dürfen beim Start nicht geladen werden
+STARTUP_BUDGET_MS = {"model": 400,                      # Budget je Modul in Millisekunden
+                     "runner": 500,
+                     "view": 800,
+                     "controller": 800,
+                     "main": 800}
+
+
+def measure(module):
+    """
+    Importiert `module` in einem neuen Prozess und wertet `-X importtime` aus.
+
+    Returns:
+        dict: {"module", "total_ms", "top" (Liste (Name, ms)), "heavy" (geladene schwere Module)}
+    """
+    code = (f"import sys, {module}; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")     # Ohne pygame-Begrüßung
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, check=True, env=env)
+    total_us, direct = 0, []
+    for line in result.stderr.splitlines():             # "import time: self [us] | cumulative | name"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2   # Einrückung = Verschachtelung
+        if depth == 0 and name.strip() == module:
+            total_us = int(cumulative)
+        elif depth == 1:
+            direct.append((name.strip(), int(cumulative)))
+    direct.sort(key=lambda item: item[1], reverse=True)
+    output = result.stdout.strip().splitlines()
+    heavy = [m for m in output[-1].split(",") if m] if output else []
+    return {"module": module,
+            "total_ms": total_us / 1000,
+            "top": [(name, us / 1000) for name, us in direct[:5]],
+            "heavy": heavy}
+
+
+def report(modules=None, budget_ms=None):
+    """
+    Misst alle Module und gibt den Bericht aus.
+
+    Args:
+        modules (list[str]): Zu messende Module, Standard: alle mit Budget.
+        budget_ms (float): Einheitliches Budget, Standard: STARTUP_BUDGET_MS.
+
+    Returns:
+        bool: True, wenn alle Module im Budget liegen und keine schweren Module laden.
+    """
+    ok = True
+    for module in modules or STARTUP_BUDGET_MS:
+        result = measure(module)
+        budget = budget_ms if budget_ms is not None else STARTUP_BUDGET_MS.get(module, 1000)
+        status = "OK" if result["total_ms"] <= budget and not result["heavy"] else "ÜBER BUDGET"
+        if status != "OK": ok = False
+        print(f"{module:<12} {result['total_ms']:8.1f} ms  (Budget {budget} ms)  {status}")
+        for name, ms in result["top"]:
+            print(f"    {name:<28} {ms:8.1f} ms")
+        if result["heavy"]:
+            print(f"    !!! Beim Start geladen: {', '.join(result['heavy'])}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importzeit-Bericht der Ameisen-Simulation")
+    parser.add_argument("modules", nargs="*", help="Module (Standard: alle)")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Budget je Modul in ms")
+    args = parser.parse_args(argv)
+    sys.exit(0 if report(args.modules, args.budget_ms) else 1)
+
+
+if __name__ == "__main__":
+    main()
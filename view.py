@@ -8,32 +8,158 @@ und Benutzeroberfläche der Ameisen-Simulation.
 Autor: Artur Lamparter <arturlamparter@web.de>
 """
 
+import math
+import os
+import queue
+import struct
+import threading
+import zlib
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
 import pygame
-import matplotlib.pyplot as plt
-import pandas as pd
 import numpy as np
 
-import main
 import model
 
+plt = model.LazyModule("matplotlib.pyplot")     # Erst beim Anzeigen des Geruchsfeldes laden
+pd = model.LazyModule("pandas")                 # Erst beim Anzeigen einer CSV laden
+
+
+class BucketIndex:
+    """
+    Räumlicher Index für die Sichtbarkeitsprüfung: Positionen werden nach Eimern (bucket x bucket Zellen)
+    sortiert, eine Abfrage liest je Eimerzeile nur den zusammenhängenden Abschnitt der sichtbaren Eimer.
+    """
+    def __init__(self, xs, ys, width, height, bucket=32):
+        self.xs = np.asarray(xs, dtype=np.int64)
+        self.ys = np.asarray(ys, dtype=np.int64)
+        self.bucket = bucket
+        self.columns = -(-width // bucket)
+        rows = -(-height // bucket)
+        keys = (self.ys // bucket) * self.columns + self.xs // bucket
+        self.order = np.argsort(keys, kind="stable")                # Indizes nach Eimer sortiert
+        counts = np.bincount(keys, minlength=rows * self.columns)
+        self.starts = np.concatenate(([0], np.cumsum(counts)))     # Abschnitt je Eimer in self.order
+
+    def query(self, x0, y0, x1, y1):
+        """
+        Returns:
+            np.ndarray: Indizes aller Positionen mit x0 <= x < x1 und y0 <= y < y1.
+        """
+        b = self.bucket
+        bx0, bx1 = max(0, x0 // b), min(self.columns - 1, (x1 - 1) // b)
+        by0, by1 = max(0, y0 // b), min((len(self.starts) - 2) // self.columns, (y1 - 1) // b)
+        if bx0 > bx1 or by0 > by1: return np.empty(0, dtype=np.int64)
+        parts = [self.order[self.starts[row * self.columns + bx0]:self.starts[row * self.columns + bx1 + 1]]
+                 for row in range(by0, by1 + 1)]
+        index = np.concatenate(parts)
+        xs, ys = self.xs[index], self.ys[index]
+        return index[(xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)]  # Randeimer genau prüfen
 
 class PyGameWindow:
     """
     GUI-Komponente für die Darstellung der Ameisenwelt mit Pygame.
 
     Dieses Fenster visualisiert die Positionen der Ameisen und der Nahrung auf einem Gitter.
-    """
+    Das Fenster ist höchstens MAX_WIDTH x MAX_HEIGHT groß, eine Kamera (Verschieben, Zoom) wählt den
+    sichtbaren Ausschnitt. Gezeichnet wird nur, was im Ausschnitt liegt (BucketIndex). Bei weniger als
+    DENSITY_ZOOM Pixeln je Zelle wird statt einzelner Quadrate die Dichte (Ameisen bzw. Futter je Block)
+    als Bild gezeichnet, so bleibt die Zeit je Bild auch bei sehr großen Welten begrenzt.
 
-    def __init__(self, world) -> None:
+    Bedienung: Mausrad bzw. +/- Zoom, linke Maustaste ziehen bzw. W/A/S/D verschieben, 0 ganze Welt.
+    """
+    MAX_WIDTH = 1600                # Größte Fenstergröße in Pixeln
+    MAX_HEIGHT = 1000
+    BUCKET_CELLS = 32               # Kantenlänge eines Eimers im BucketIndex (Zellen)
+    DENSITY_ZOOM = 2.0              # Unter so vielen Pixeln je Zelle: Dichte statt einzelner Quadrate
+    DENSITY_PIXELS = 4              # Kantenlänge eines Dichte-Blocks in Pixeln (ungefähr)
+    ZOOM_STEP = 1.25
+
+    def __init__(self, world, offscreen=False) -> None:
         """
         Initialisiert das Pygame-Fenster mit voreingestellter Größe und Titel.
+
+        Args:
+            world: Die darzustellende Welt.
+            offscreen (bool): Ohne Bildschirm nur in eine Surface zeichnen (z.B. FrameExporter im runner).
         """
         self.world = world
-        self.screen = pygame.display.set_mode((self.world.screen_width, self.world.screen_height))  # Fenstergröße variabel laut config
-        pygame.display.set_caption("Lernende Ameise")  # Fenstertitel setzen
+        self.offscreen = offscreen
+        size = (min(self.world.screen_width, self.MAX_WIDTH), min(self.world.screen_height, self.MAX_HEIGHT))
+        if offscreen:
+            self.screen = pygame.Surface(size)
+        else:
+            self.screen = pygame.display.set_mode(size)  # Fenstergröße variabel laut config, höchstens MAX_WIDTH x MAX_HEIGHT
+            pygame.display.set_caption("Lernende Ameise")  # Fenstertitel setzen
+        self.camera_x = 0.0             # Zelle am linken Rand
+        self.camera_y = 0.0             # Zelle am oberen Rand
+        self.zoom = float(self.world.grid_size)     # Pixel je Zelle
+        self.drag = False               # Linke Maustaste gedrückt (Verschieben)
+        if size != (self.world.screen_width, self.world.screen_height): self.fit()  # Zu groß: Ganze Welt zeigen
+
+    def min_zoom(self):
+        """Zoom, bei dem die ganze Welt in das Fenster passt."""
+        width, height = self.screen.get_size()
+        return min(width / self.world.grid_width, height / self.world.grid_height)
+
+    def fit(self):
+        """Zeigt die ganze Welt."""
+        self.zoom = self.min_zoom()
+        self.camera_x = self.camera_y = 0.0
+
+    def set_zoom(self, zoom, pixel_x=None, pixel_y=None):
+        """Ändert den Zoom, der Punkt unter (pixel_x, pixel_y) bleibt an seiner Stelle (Standard: Mitte)."""
+        width, height = self.screen.get_size()
+        pixel_x = width / 2 if pixel_x is None else pixel_x
+        pixel_y = height / 2 if pixel_y is None else pixel_y
+        cell_x, cell_y = self.camera_x + pixel_x / self.zoom, self.camera_y + pixel_y / self.zoom
+        self.zoom = min(max(zoom, self.min_zoom()), 4.0 * self.world.grid_size)
+        self.move_camera(cell_x - pixel_x / self.zoom - self.camera_x, cell_y - pixel_y / self.zoom - self.camera_y)
+
+    def move_camera(self, cells_x, cells_y):
+        """Verschiebt den Ausschnitt um (cells_x, cells_y) Zellen, begrenzt auf die Welt."""
+        width, height = self.screen.get_size()
+        self.camera_x = min(max(self.camera_x + cells_x, 0.0), max(0.0, self.world.grid_width - width / self.zoom))
+        self.camera_y = min(max(self.camera_y + cells_y, 0.0), max(0.0, self.world.grid_height - height / self.zoom))
+
+    def handle_camera_event(self, event) -> bool:
+        """
+        Verarbeitet Maus- und Tastatur-Events der Kamera.
+
+        Returns:
+            bool: True, wenn das Event verwendet wurde.
+        """
+        width, height = self.screen.get_size()
+        if event.type == pygame.MOUSEWHEEL:
+            self.set_zoom(self.zoom * self.ZOOM_STEP ** event.y, *pygame.mouse.get_pos())
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self.drag = True
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            self.drag = False
+        elif event.type == pygame.MOUSEMOTION and self.drag:
+            self.move_camera(-event.rel[0] / self.zoom, -event.rel[1] / self.zoom)
+        elif event.type == pygame.KEYDOWN and event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+            self.set_zoom(self.zoom * self.ZOOM_STEP)
+        elif event.type == pygame.KEYDOWN and event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.set_zoom(self.zoom / self.ZOOM_STEP)
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_0:
+            self.fit()
+        elif event.type == pygame.KEYDOWN and event.key in (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d):
+            step_x, step_y = width / 4 / self.zoom, height / 4 / self.zoom      # Viertel Fenster
+            self.move_camera({pygame.K_a: -step_x, pygame.K_d: step_x}.get(event.key, 0.0),
+                             {pygame.K_w: -step_y, pygame.K_s: step_y}.get(event.key, 0.0))
+        else:
+            return False
+        return True
+
+    def visible_cells(self):
+        """Sichtbarer Bereich in Zellen (x0, y0, x1, y1), x1/y1 exklusiv."""
+        width, height = self.screen.get_size()
+        x0, y0 = int(self.camera_x), int(self.camera_y)
+        x1 = min(self.world.grid_width, int(math.ceil(self.camera_x + width / self.zoom)))
+        y1 = min(self.world.grid_height, int(math.ceil(self.camera_y + height / self.zoom)))
+        return x0, y0, x1, y1
 
     def render(self) -> None:
         """
@@ -42,21 +168,70 @@ class PyGameWindow:
         Args:
             world: Ein Objekt, das die aktuellen Zustände von Ameisen und Nahrung enthält.
         """
-        self.screen.fill(self.world.get_screen_color())  # Bildschirm mit Hintergrundfarbe füllen
+        foods = list(self.world.foods)
+        ants = list(self.world.ants)
+        self.draw_world([f.pos_x for f in foods], [f.pos_y for f in foods], lambda i: foods[i].color,  # Nahrung
+                        [a.pos_x for a in ants], [a.pos_y for a in ants], lambda i: ants[i].color)     # Ameisen
 
-        # Nahrung zeichnen
-        for f in self.world.foods:
-            fx, fy = f.get_position()  # Koordinaten abrufen
-            color = f.color
-            self.draw_square(color, fx, fy)  # Nahrung als grünes Quadrat
+        if not self.offscreen: pygame.display.flip()  # Zeichne den neuen Frame auf den Bildschirm
 
-        # Ameisen zeichnen
-        for a in self.world.ants:
-            ax, ay = a.get_position()  # Koordinaten abrufen
-            color = a.color
-            self.draw_square(color, ax, ay)  # Ameise als buntes Quadrat
+    def render_frame(self, frame, caption=None) -> None:
+        """
+        Zeichnet einen aufgezeichneten Frame (model.TrajectoryReader.frame) statt der laufenden Welt.
 
-        pygame.display.flip()  # Zeichne den neuen Frame auf den Bildschirm
+        Args:
+            frame: (Tick, Ameisen x, y, Farbcodes, Futter x, y, Farbcodes), Farbcodes als Index in model.COLORS.
+            caption (str): Fenstertitel, z.B. Tick und Geschwindigkeit der Wiedergabe.
+        """
+        _, ant_x, ant_y, ant_colors, food_x, food_y, food_colors = frame
+        self.draw_world(food_x, food_y, lambda i: model.COLORS[food_colors[i]],
+                        ant_x, ant_y, lambda i: model.COLORS[ant_colors[i]])
+        if self.offscreen: return
+        if caption: pygame.display.set_caption(caption)
+        pygame.display.flip()
+
+    def draw_world(self, food_x, food_y, food_color, ant_x, ant_y, ant_color) -> None:
+        """
+        Zeichnet Futter und Ameisen im sichtbaren Ausschnitt, je nach Zoom einzeln oder als Dichte.
+
+        Args:
+            food_x, food_y, ant_x, ant_y: Positionen (Listen oder Arrays).
+            food_color, ant_color: Farbe zum Index einer Position.
+        """
+        self.screen.fill(self.world.get_screen_color())  # Bildschirm mit Hintergrundfarbe füllen
+        if self.zoom < self.DENSITY_ZOOM:
+            self.draw_density(np.asarray(food_x, dtype=np.int64), np.asarray(food_y, dtype=np.int64),
+                              np.asarray(ant_x, dtype=np.int64), np.asarray(ant_y, dtype=np.int64))
+            return
+        visible = self.visible_cells()
+        for xs, ys, color in ((food_x, food_y, food_color), (ant_x, ant_y, ant_color)):  # Ameisen über Futter
+            index = BucketIndex(xs, ys, self.world.grid_width, self.world.grid_height, self.BUCKET_CELLS)
+            for i in index.query(*visible).tolist():
+                self.draw_square(color(i), int(xs[i]), int(ys[i]))
+
+    def draw_density(self, food_x, food_y, ant_x, ant_y) -> None:
+        """
+        Zeichnet die Anzahl Ameisen (rot) und Futter (grün) je Block als Bild (Histogramm mit np.bincount).
+        """
+        x0, y0, x1, y1 = self.visible_cells()
+        block = max(1, math.ceil(self.DENSITY_PIXELS / self.zoom))       # Zellen je Block
+        columns, rows = -(-(x1 - x0) // block), -(-(y1 - y0) // block)
+        if columns <= 0 or rows <= 0: return
+
+        def density(xs, ys):
+            inside = (xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)
+            counts = np.bincount((xs[inside] - x0) // block * rows + (ys[inside] - y0) // block,
+                                 minlength=columns * rows).reshape(columns, rows)
+            return np.log1p(counts) / np.log1p(counts.max()) if counts.any() else counts.astype(float)
+
+        ants, foods = density(ant_x, ant_y), density(food_x, food_y)
+        image = np.empty((columns, rows, 3), dtype=np.uint8)              # surfarray: [x, y, Farbe]
+        image[..., 0] = 255 - 255 * foods                                 # Weiß -> Grün (Futter)
+        image[..., 1] = 255 - 255 * ants                                  # Weiß -> Rot (Ameisen)
+        image[..., 2] = 255 - 255 * np.maximum(ants, foods)
+        surface = pygame.transform.scale(pygame.surfarray.make_surface(image),
+                                         (math.ceil(columns * block * self.zoom), math.ceil(rows * block * self.zoom)))
+        self.screen.blit(surface, ((x0 - self.camera_x) * self.zoom, (y0 - self.camera_y) * self.zoom))
 
     def draw_square(self, color, x: int, y: int) -> None:             # Zeichne Quadrat in mehreren Farben
         """
@@ -67,14 +242,99 @@ class PyGameWindow:
             x (int): Die x-Koordinate im Gitter.
             y (int): Die y-Koordinate im Gitter.
         """
+        size = math.ceil(self.zoom)
         rect = (
-            x * self.world.grid_size,   # x-Position in Pixel
-            y * self.world.grid_size,   # y-Position in Pixel
-            self.world.grid_size,       # Breite
-            self.world.grid_size        # Höhe
+            int((x - self.camera_x) * self.zoom),   # x-Position in Pixel
+            int((y - self.camera_y) * self.zoom),   # y-Position in Pixel
+            size,                                   # Breite
+            size                                    # Höhe
         )
         pygame.draw.rect(self.screen, color, rect)
 
+class FrameExporter:
+    """
+    Speichert jedes n-te Bild eines PyGameWindow als nummerierte PNG-Datei, ohne die Simulation aufzuhalten.
+
+    `capture()` zeichnet im Simulations-Thread und kopiert die Pixel in eine begrenzte Warteschlange.
+    Ein Hintergrund-Thread schreibt die PNG-Dateien. Ist die Warteschlange voll, wird das Bild
+    verworfen (gezählt in `dropped`), statt auf den Schreib-Thread zu warten.
+    Das PNG wird mit zlib selbst erzeugt, da zlib während des Komprimierens den GIL freigibt
+    (pygame.image.save hält ihn und würde die Simulation ausbremsen).
+    """
+    QUEUE_SIZE = 32                         # Höchstens so viele wartende Bilder
+    PNG_LEVEL = 1                           # zlib-Stufe: Schnell statt klein
+
+    def __init__(self, window, folder, every=10, queue_size=QUEUE_SIZE):
+        """
+        Args:
+            window (PyGameWindow): Fenster (in der Regel offscreen), dessen Bild gespeichert wird.
+            folder (str): Zielordner für frame_<Tick>.png.
+            every (int): Nur jeden n-ten Tick speichern.
+            queue_size (int): Größe der Warteschlange zum Schreib-Thread.
+        """
+        self.window = window
+        self.folder = folder
+        self.every = max(1, int(every))
+        self.written = 0                    # Geschriebene Bilder
+        self.dropped = 0                    # Verworfene Bilder (Schreib-Thread zu langsam)
+        self._queue = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._thread = None
+
+    def start(self):
+        """Legt den Zielordner an und startet den Schreib-Thread."""
+        if self._thread: return
+        os.makedirs(self.folder, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="FrameExporter", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Schreibt die wartenden Bilder und beendet den Schreib-Thread."""
+        if not self._thread: return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        model.logger.info(f"Bilder gespeichert in {self.folder}: {self.written}, verworfen: {self.dropped}")
+
+    def capture(self, tick):
+        """Im Simulations-Thread nach jedem Tick aufrufen: Zeichnet und übergibt jedes n-te Bild."""
+        if not self._thread or tick % self.every: return
+        self.window.render()
+        pixels = pygame.image.tobytes(self.window.screen, "RGBA")      # Kopie (RGBA ohne Umrechnung, schneller als RGB)
+        try:
+            self._queue.put_nowait((tick, pixels))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        """Hintergrund-Thread: Schreibt die Bilder als PNG."""
+        size = self.window.screen.get_size()
+        while True:
+            item = self._queue.get()
+            if item is None: return
+            tick, pixels = item
+            try:
+                self.write_png(os.path.join(self.folder, f"frame_{tick:08d}.png"), pixels, size, self.PNG_LEVEL)
+                self.written += 1
+            except Exception as e:
+                model.logger.error(f"Bild {tick} konnte nicht gespeichert werden: {e}")
+
+    @staticmethod
+    def write_png(file, pixels, size, level=PNG_LEVEL):
+        """Schreibt RGBA-Pixel (Zeile für Zeile) als PNG-Datei (8 Bit je Kanal, ohne Zeilenfilter)."""
+        width, height = size
+        rows = np.zeros((height, width * 4 + 1), dtype=np.uint8)           # Je Zeile Filterbyte 0 vorne
+        rows[:, 1:] = np.frombuffer(pixels, dtype=np.uint8).reshape(height, width * 4)
+        rows[:, 4::4] = 255                                                 # Deckend: Surface ohne Alphakanal liefert 0
+
+        def chunk(kind, data):
+            return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+        with open(file, "wb") as out:
+            out.write(b"\x89PNG\r\n\x1a\n")
+            out.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)))
+            out.write(chunk(b"IDAT", zlib.compress(rows, level)))
+            out.write(chunk(b"IEND", b""))
+
 class TkSettingsWindow(tk.Tk):
     """
     Das Hauptfenster für die Steuerung(Einstellungen) der Ameisensimulation (GUI mit Tkinter).
@@ -101,6 +361,8 @@ class TkSettingsWindow(tk.Tk):
         # --- Callbacks ---
         self.ant_machine_learning_set = None
         self.selected_ant_set = None
+        self.ant_search = None          # Liefert Einträge der Ameisenauswahl zu einem Suchtext
+        self.ant_query = ""             # Getippter Suchtext seit der letzten Auswahl
 
         # --- OBERSTE REIHE: Strategiewahl ---
         self.label = tk.Label(self, text="Ant Strategie:", anchor="w", font=("Arial", 14))
@@ -180,11 +442,11 @@ class TkSettingsWindow(tk.Tk):
         self.btn_show_log = tk.Button(self, text="Show Log")
         self.btn_show_log.grid(row=8, column=2, columnspan=1, padx=5) # Zuckünftige Anwendung
 
-        btn = tk.Button(self, text="Pr(Empty)")
-        btn.grid(row=8, column=3, columnspan=1, padx=5) # Zuckünftige Anwendung
+        self.btn_profiler = tk.Button(self, text="Profiler")
+        self.btn_profiler.grid(row=8, column=3, columnspan=1, padx=5) # Laufzeit der Tick-Phasen
 
-        btn = tk.Button(self, text="Pr(Empty)")
-        btn.grid(row=8, column=4, columnspan=1, padx=5) # Zuckünftige Anwendung
+        self.btn_memory = tk.Button(self, text="Memory")
+        self.btn_memory.grid(row=8, column=4, columnspan=1, padx=5) # Speicherbericht und tracemalloc-Zuwachs
 
         self.btn_reset = tk.Button(self, text="Reset")
         self.btn_reset.grid(row=8, column=5, columnspan=1, padx=5) # Zuckünftige Anwendung
@@ -199,9 +461,11 @@ class TkSettingsWindow(tk.Tk):
         self.cmb_ant_machine_learning.grid(row=9, column=2, columnspan=2, padx=5)
         self.cmb_ant_machine_learning.bind("<<ComboboxSelected>>", lambda event: self.ant_machine_learning_set())
 
-        self.cmb_selected_ant = ttk.Combobox(self, width=12)  # Ermöglicht die Auswahl der jeweiligen Ameise
+        # Ermöglicht die Auswahl der jeweiligen Ameise: Liste erst beim Aufklappen, gefiltert nach Suchtext
+        self.cmb_selected_ant = ttk.Combobox(self, width=12, postcommand=self.fill_cmb_selected_ant)
         self.cmb_selected_ant.grid(row=9, column=5, columnspan=1, padx=5)
-        self.cmb_selected_ant.bind("<<ComboboxSelected>>", lambda event: self.selected_ant_set())
+        self.cmb_selected_ant.bind("<<ComboboxSelected>>", lambda event: self.cmb_selected_ant_chosen())
+        self.cmb_selected_ant.bind("<KeyRelease>", self.cmb_selected_ant_typed)
 
         # --- CSV Info / Platzhaltertext ---
         self.lbl_set_brain = tk.Label(self, font=("Arial", 14))
@@ -294,6 +558,18 @@ class TkSettingsWindow(tk.Tk):
         """Setzt den Callback für den 'Show Log'-Button."""
         self.btn_show_log.config(command=callback)
 
+    def set_btn_profiler_cb(self, cb):
+        """Setzt den Callback für den 'Profiler'-Button."""
+        self.btn_profiler.config(command=cb)
+
+    def set_ant_search_cb(self, cb):
+        """Setzt den Callback, der zu einem Suchtext die Einträge der Ameisenauswahl liefert."""
+        self.ant_search = cb
+
+    def set_btn_memory_cb(self, cb):
+        """Setzt den Callback für den 'Memory'-Button."""
+        self.btn_memory.config(command=cb)
+
     def set_btn_reset(self, callback):
         """Setzt den Callback für den 'Reset'-Button."""
         self.btn_reset.config(command=callback)
@@ -326,9 +602,30 @@ class TkSettingsWindow(tk.Tk):
         return self.cmb_ant_machine_learning.get()
 
     def get_cmb_selected_ant(self):
-        """Liest die Auswahl aus der Ameisenauswahl-Combobox."""
+        """Liest den Namen der gewählten Ameise (erstes Wort des Eintrags) aus der Combobox."""
         self.label.focus()          # Notlösung um den Fokus zu enfernen
-        return self.cmb_selected_ant.get()
+        words = self.cmb_selected_ant.get().split()
+        return words[0] if words else ""
+
+    def fill_cmb_selected_ant(self):
+        """Füllt die Ameisenauswahl beim Aufklappen (Suchtext oder Bestenliste)."""
+        if self.ant_search:
+            self.cmb_selected_ant['values'] = self.ant_search(self.ant_query)
+
+    def cmb_selected_ant_typed(self, event):
+        """Merkt den Suchtext, Enter übernimmt den ersten Treffer der Suche."""
+        if event.keysym == "Return":
+            entries = self.ant_search(self.ant_query) if self.ant_search and self.ant_query else []
+            if not entries: return          # Kein Treffer: Auswahl bleibt unverändert
+            self.cmb_selected_ant.set(entries[0])
+            self.cmb_selected_ant_chosen()
+        elif event.keysym not in ("Up", "Down", "Left", "Right"):
+            self.ant_query = self.cmb_selected_ant.get()
+
+    def cmb_selected_ant_chosen(self):
+        """Eine Ameise wurde gewählt: Suchtext zurücksetzen und Controller informieren."""
+        self.ant_query = ""
+        if self.selected_ant_set: self.selected_ant_set()
 
     # --- ANZEIGEN UND EINTRÄGE SETZEN ---
 
@@ -365,15 +662,14 @@ class TkSettingsWindow(tk.Tk):
         self.cmb_ant_machine_learning.set(set_value)
         self.ant_machine_learning_set = cb
 
-    def update_cmb_selected_ant(self, values: list[str], set_value: str, cb) -> None:
+    def update_cmb_selected_ant(self, set_value: str, cb) -> None:
         """
-        Setzt die Auswahlmöglichkeiten und den aktuell gewählten Wert der Ameisen auswahl-Combobox.
+        Setzt den aktuell gewählten Wert der Ameisenauswahl-Combobox. Die Auswahlliste
+        wird erst beim Aufklappen über den Such-Callback (set_ant_search_cb) gefüllt.
 
         Args:
-            values (list[str]): Liste der verfügbaren Machine-Learning-Strategien.
-            set_value (str): Vorbelegung der Combobox.
+            set_value (str): Vorbelegung der Combobox (Name der Ameise).
         """
-        self.cmb_selected_ant['values'] = values
         self.cmb_selected_ant.set(set_value)
         self.selected_ant_set = cb
 
@@ -539,30 +835,214 @@ class BrainTrainingsWindow(tk.Toplevel):
                     "ENT_EPOCHS": self.ent_epochs.get()}
         return settings
 
+class ProfilerWindow(tk.Toplevel):
+    """
+    Zeigt die rollende Tabelle des Tick-Profilers (Zeit je Phase) und aktualisiert sie laufend.
+    """
+    REFRESH_MS = 500
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.name = "Profiler"
+        self.title(self.name)
+        self.geometry("620x420")
+        self.table_cb = None
+
+        self.text_widget = tk.Text(self, width=70, height=18, font=("Courier", 12), state="disabled", bg="white")
+        self.text_widget.grid(row=0, column=0, columnspan=4, padx=10, pady=10)
+
+        self.btn_save = ttk.Button(self, text="Speichern", padding=10)      # Tabelle + Histogramme als JSON
+        self.btn_save.grid(row=1, column=0, padx=10)
+        self.btn_cprofile = ttk.Button(self, text="cProfile (F9)", padding=10)  # Nächste Ticks mit cProfile
+        self.btn_cprofile.grid(row=1, column=1, padx=10)
+        self.btn_reset = ttk.Button(self, text="Reset", padding=10)
+        self.btn_reset.grid(row=1, column=2, padx=10)
+        ttk.Button(self, text="Exit", command=self.destroy, padding=10).grid(row=1, column=3, padx=10)
+        self.after(self.REFRESH_MS, self.refresh)
+
+    def set_table_cb(self, cb):
+        """Setzt die Funktion, die den Tabellentext liefert."""
+        self.table_cb = cb
+        self.refresh(repeat=False)
+
+    def set_btn_save_cb(self, cb):
+        self.btn_save.config(command=cb)
+
+    def set_btn_cprofile_cb(self, cb):
+        self.btn_cprofile.config(command=cb)
+
+    def set_btn_reset_cb(self, cb):
+        self.btn_reset.config(command=cb)
+
+    def refresh(self, repeat=True):
+        """Holt den aktuellen Tabellentext und plant die nächste Aktualisierung."""
+        if self.table_cb:
+            self.text_widget.config(state="normal")
+            self.text_widget.delete("1.0", tk.END)
+            self.text_widget.insert(tk.END, self.table_cb())
+            self.text_widget.config(state="disabled")
+        if repeat: self.after(self.REFRESH_MS, self.refresh)
+
+class LogViewerWindow(tk.Toplevel):
+    """
+    Blättert seitenweise durch die Perioden eines LogCollectors.
+
+    Angezeigt werden nur PAGE_PERIODS Perioden, der Text wird über Callbacks
+    für genau diesen Bereich geholt (nie das gesamte Log).
+    """
+    PAGE_PERIODS = 10
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.name = "Log"
+        self.title(self.name)
+        self.geometry("800x900")
+        self.count_cb = None        # () -> Anzahl Perioden
+        self.page_cb = None         # (start, stop) -> Text der Perioden
+        self.find_cb = None         # (Text, start, rückwärts) -> Index oder None
+        self.start = 0              # Erste angezeigte Periode
+
+        nav = tk.Frame(self)
+        nav.pack(fill=tk.X)
+        ttk.Button(nav, text="<<", width=3, command=lambda: self.show_page(0)).pack(side=tk.LEFT, padx=2, pady=5)
+        ttk.Button(nav, text="<", width=3, command=lambda: self.show_page(self.start - self.PAGE_PERIODS)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(nav, text=">", width=3, command=lambda: self.show_page(self.start + self.PAGE_PERIODS)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(nav, text=">>", width=3, command=self.show_last_page).pack(side=tk.LEFT, padx=2)
+        ttk.Label(nav, text="Schritt:").pack(side=tk.LEFT, padx=(10, 2))
+        self.ent_step = ttk.Entry(nav, width=8)
+        self.ent_step.pack(side=tk.LEFT)
+        self.ent_step.bind("<Return>", lambda event: self.jump())
+        ttk.Button(nav, text="Gehe zu", command=self.jump).pack(side=tk.LEFT, padx=2)
+        ttk.Label(nav, text="Suche:").pack(side=tk.LEFT, padx=(10, 2))
+        self.ent_search = ttk.Entry(nav, width=18)
+        self.ent_search.insert(0, "Essen gefunden")
+        self.ent_search.pack(side=tk.LEFT)
+        self.ent_search.bind("<Return>", lambda event: self.search())
+        ttk.Button(nav, text="▲", width=3, command=lambda: self.search(backward=True)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(nav, text="▼", width=3, command=self.search).pack(side=tk.LEFT, padx=2)
+
+        self.lbl_status = ttk.Label(self, text="")
+        self.lbl_status.pack(fill=tk.X, padx=5)
+
+        frame = tk.Frame(self)
+        frame.pack(fill=tk.BOTH, expand=True)
+        scrollbar = tk.Scrollbar(frame)
+        scrollbar.pack(side="right", fill="y")
+        self.text_widget = tk.Text(frame, wrap="word", yscrollcommand=scrollbar.set, state="disabled")
+        self.text_widget.pack(side="left", fill="both", expand=True)
+        self.text_widget.tag_configure("match", background="yellow")
+        scrollbar.config(command=self.text_widget.yview)
+
+    def set_log_cbs(self, count_cb, page_cb, find_cb):
+        """Setzt die Funktionen zum Zählen, Holen und Durchsuchen der Perioden und zeigt die erste Seite."""
+        self.count_cb = count_cb
+        self.page_cb = page_cb
+        self.find_cb = find_cb
+        self.show_page(0)
+
+    def show_page(self, start):
+        """Zeigt die Perioden ab `start` (begrenzt auf den vorhandenen Bereich)."""
+        if not self.page_cb: return
+        count = self.count_cb()
+        self.start = max(0, min(start, count - 1))
+        stop = min(count, self.start + self.PAGE_PERIODS)
+        self.text_widget.config(state="normal")
+        self.text_widget.delete("1.0", tk.END)
+        self.text_widget.insert(tk.END, self.page_cb(self.start, stop))
+        self.text_widget.config(state="disabled")
+        self.lbl_status.config(text=f"Perioden {self.start}-{stop - 1} von {count}")
+        self.highlight()
+
+    def show_last_page(self):
+        if self.count_cb: self.show_page(self.count_cb() - self.PAGE_PERIODS)
+
+    def jump(self):
+        """Springt zur Seite, die den eingegebenen Schritt (Periode) enthält."""
+        try:
+            step = int(self.ent_step.get())
+        except ValueError:
+            return
+        self.show_page(step)
+
+    def search(self, backward=False):
+        """Springt zur nächsten Periode nach (bzw. vor) der aktuellen Seite, die den Suchtext enthält."""
+        text = self.ent_search.get()
+        if not text or not self.find_cb: return
+        start = self.start - 1 if backward else self.start + self.PAGE_PERIODS
+        index = self.find_cb(text, start, backward)
+        if index is None:
+            self.lbl_status.config(text=f"'{text}' nicht gefunden")
+            return
+        self.show_page(index)
+
+    def highlight(self):
+        """Markiert alle Vorkommen des Suchtextes auf der aktuellen Seite."""
+        self.text_widget.tag_remove("match", "1.0", tk.END)
+        text = self.ent_search.get()
+        if not text: return
+        index = "1.0"
+        while True:
+            index = self.text_widget.search(text, index, stopindex=tk.END)
+            if not index: break
+            end = f"{index}+{len(text)}c"
+            self.text_widget.tag_add("match", index, end)
+            index = end
+
 class FoodOdorPyPlot:
-    def __init__(self, world_array: np.ndarray) -> None:
+    MAX_PIXELS = 1000   # Große Welten werden für die Darstellung ausgedünnt
+
+    def __init__(self, world_array) -> None:
         """
         Initialisiert das Plot-Fenster für die Geruchsausbreitung.
 
         Args:
-            world_array (np.ndarray): 2D-Array der Geruchswerte in der Welt. (z.B. numpy-Array mit Ganzzahlen).
+            world_array: 2D-Feld der Geruchswerte in der Welt (numpy-Array oder model.TileGrid).
         """
-        plt.imshow(world_array, cmap="viridis")
+        height, width = world_array.shape
+        step = max(1, -(-max(height, width) // self.MAX_PIXELS))   # Nur jede n-te Zelle lesen
+        plt.imshow(world_array[::step, ::step], cmap="viridis", extent=(0, width, height, 0))
         plt.colorbar()
         plt.title("Geruchsausbreitung")
         plt.show()
 
 class CSVViewer(tk.Tk):
+    """
+    Zeigt eine CSV-Datei als Tabelle an, auch bei sehr vielen Zeilen.
+
+    Das Treeview enthält nur die gerade sichtbaren Zeilen, beim Scrollen werden diese neu befüllt.
+    Große Dateien werden blockweise in einem Hintergrund-Thread gelesen, die Tabelle ist schon
+    während des Ladens bedienbar; angezeigt wird bis dahin direkt aus den Blöcken, zusammengefügt
+    wird erst am Ende. Sortiert wird über eine Reihenfolge (np.argsort) auf zwischengespeicherten
+    Spalten, der DataFrame selbst bleibt unverändert.
+    """
+    CHUNK_ROWS = 50000      # Zeilen je Leseblock
+    POLL_MS = 100           # Abfrageintervall für geladene Blöcke
+    ROW_HEIGHT = 20         # Ersatzwert, falls der Stil keine Zeilenhöhe liefert
+
     def __init__(self, csv_path=None):
         super().__init__()
         self.title(csv_path)
         self.geometry("600x900")  # Fenstergröße
         self.tree = None
-        self.df = None
+        self.vsb = None
+        self.lbl_status = None
+        self.df = None              # Gesamte Tabelle, erst nach dem Laden
+        self.chunks = []            # Bisher geladene Blöcke
+        self.offsets = []           # Erste Zeile je Block
+        self.rows = 0               # Bisher geladene Zeilen
+        self.chunk_queue = queue.Queue()
+        self.loader_stop = None     # threading.Event des laufenden Ladevorgangs
+        self.loading = False
+        self.order = None           # Anzeige-Reihenfolge (Zeilenindizes), None = Dateireihenfolge
+        self.sort_state = None      # (Spalte, absteigend)
+        self.sort_keys = {}         # Spalte -> numpy-Array zum Sortieren
+        self.top = 0                # Erste sichtbare Zeile
+        self.visible_rows = 1
 
         self.setup_widgets()
         if csv_path:
             self.load_csv(csv_path)
+        self.after(self.POLL_MS, self.poll_chunks)
 
     def setup_widgets(self):
         # Button zum Laden einer neuen Datei
@@ -571,19 +1051,27 @@ class CSVViewer(tk.Tk):
 
         load_btn = tk.Button(btn_frame, text="CSV laden", command=self.browse_file)
         load_btn.pack(side=tk.LEFT, padx=10, pady=5)
+        self.lbl_status = tk.Label(btn_frame, text="")
+        self.lbl_status.pack(side=tk.LEFT, padx=10)
+
+        # Scrollbars (vertikal über die Zeilen des DataFrames, nicht über das Treeview)
+        self.vsb = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.vsb.pack(side='right', fill='y')
+        hsb = ttk.Scrollbar(self, orient="horizontal")
+        hsb.pack(side='bottom', fill='x')
 
         # Treeview
         self.tree = ttk.Treeview(self, show='headings')
         self.tree.pack(fill=tk.BOTH, expand=True)
-
-        # Scrollbars
-        vsb = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
-        vsb.pack(side='right', fill='y')
-        self.tree.configure(yscrollcommand=vsb.set)
-
-        hsb = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
-        hsb.pack(side='bottom', fill='x')
         self.tree.configure(xscrollcommand=hsb.set)
+        hsb.configure(command=self.tree.xview)
+
+        self.tree.bind("<Configure>", self.tree_resized)
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll(-1 if event.delta > 0 else 1, "units"))
+        self.tree.bind("<Button-4>", lambda event: self.scroll(-1, "units"))    # Linux
+        self.tree.bind("<Button-5>", lambda event: self.scroll(1, "units"))
+        self.tree.bind("<Prior>", lambda event: self.scroll(-1, "pages"))
+        self.tree.bind("<Next>", lambda event: self.scroll(1, "pages"))
 
     def browse_file(self):
         file_path = filedialog.askopenfilename(filetypes=[("CSV-Dateien", "*.csv")])
@@ -591,35 +1079,181 @@ class CSVViewer(tk.Tk):
             self.load_csv(file_path)
 
     def load_csv(self, path):
+        """
+        Startet das blockweise Laden der Datei im Hintergrund (ein laufender Ladevorgang wird abgebrochen).
+        """
+        if self.loader_stop: self.loader_stop.set()
+        self.chunk_queue = queue.Queue()
+        self.loader_stop = threading.Event()
+        self.df = None
+        self.chunks = []
+        self.offsets = []
+        self.rows = 0
+        self.order = None
+        self.sort_state = None
+        self.sort_keys = {}
+        self.top = 0
+        self.loading = True
+        self.title(path)
+        threading.Thread(target=self.read_chunks, args=(path, self.chunk_queue, self.loader_stop),
+                         name="CSVViewerLoader", daemon=True).start()
+
+    def read_chunks(self, path, chunk_queue, stop):
+        """
+        Liest die Datei blockweise (im Hintergrund-Thread) und legt die Blöcke in die Warteschlange.
+        Am Ende folgt None, bei einem Fehler die Ausnahme.
+        """
         try:
-            self.df = pd.read_csv(path, sep=",", on_bad_lines='skip')
-            self.display_dataframe()
+            for chunk in pd.read_csv(path, sep=",", on_bad_lines='skip', chunksize=self.CHUNK_ROWS):
+                if stop.is_set(): return
+                chunk_queue.put(chunk)
+            chunk_queue.put(None)
         except Exception as e:
-            model.logger.error(f"Fehler beim Laden der Datei({path}): {e}")
+            chunk_queue.put(e)
+
+    def poll_chunks(self):
+        """
+        Übernimmt die bisher geladenen Blöcke in die Tabelle (im Tk-Thread).
+
+        Neue Zeilen werden während des Ladens unsortiert hinten angehängt, erst am Ende wird
+        einmal zusammengefügt und (falls gewählt) über alle Zeilen sortiert.
+        """
+        old_rows, finished = self.rows, False
+        while True:
+            try:
+                item = self.chunk_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self.loading, finished = False, True
+            elif isinstance(item, Exception):
+                self.loading, finished = False, True
+                model.logger.error(f"Fehler beim Laden der Datei({self.title()}): {item}")
+            else:
+                self.chunks.append(item)
+                self.offsets.append(self.rows)
+                self.rows += len(item)
+        if finished and self.chunks:
+            self.df = pd.concat(self.chunks, ignore_index=True) if len(self.chunks) > 1 else self.chunks[0]
+            self.chunks, self.offsets = [self.df], [0]
+        if self.rows > old_rows:
+            if not old_rows: self.display_dataframe()
+            if self.order is not None:      # Bis zum Ladeende unsortiert anhängen
+                self.order = np.concatenate((self.order, np.arange(old_rows, self.rows)))
+        if finished and self.sort_state: self.sort_column(*self.sort_state)
+        elif finished or self.rows > old_rows: self.render()
+        self.after(self.POLL_MS, self.poll_chunks)
 
     def display_dataframe(self):
-        # Spalten löschen
-        for col in self.tree["columns"]:
-            self.tree.heading(col, text="")
+        """
+        Setzt die Spaltenüberschriften und zeigt die Tabelle ab der ersten Zeile.
+        """
         self.tree.delete(*self.tree.get_children())
+        columns = list(self.chunks[0].columns)
+        self.tree["columns"] = columns
 
-        self.tree["columns"] = list(self.df.columns)
-
-        for col in self.df.columns:
-            self.tree.heading(col, text=col, command=lambda _col=col: self.sort_column(_col, False))
+        for col in columns:
+            self.tree.heading(col, text=col, command=lambda _col=col: self.sort_clicked(_col))
             self.tree.column(col, width=100, anchor="center")
+        self.top = 0
+        self.render()
 
-        for _, row in self.df.iterrows():
-            self.tree.insert("", "end", values=list(row))
+    def row_count(self):
+        return self.rows
 
-    def sort_column(self, col, reverse):
-        try:
-            self.df[col] = pd.to_numeric(self.df[col])
-        except Exception as e:
-            print(f"Konnte Spalte '{col}' nicht in numerisch umwandeln: {e}")
+    def get_rows(self, index):
+        """
+        Holt die Zeilen zu den Indizes (über alle Blöcke gezählt), ohne die Blöcke zusammenzufügen.
+        """
+        if len(self.chunks) == 1:
+            return self.chunks[0].iloc[index].to_numpy(dtype=object)
+        blocks = np.searchsorted(self.offsets, index, side="right") - 1
+        return [self.chunks[block].iloc[row - self.offsets[block]].to_numpy(dtype=object)
+                for block, row in zip(blocks, index)]
+
+    def tree_resized(self, event):
+        """
+        Berechnet die Anzahl sichtbarer Zeilen aus der Höhe des Treeviews.
+        """
+        row_height = int(ttk.Style(self).lookup("Treeview", "rowheight") or self.ROW_HEIGHT)
+        heading = self.ROW_HEIGHT + 5                   # Überschriftenzeile
+        visible_rows = max(1, (event.height - heading) // row_height)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.render()
+
+    def yview(self, *args):
+        """
+        Befehl der vertikalen Scrollbar ("moveto", Anteil) bzw. ("scroll", n, "units"/"pages").
+        """
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * self.row_count())
+            self.render()
+        elif args[0] == "scroll":
+            self.scroll(int(args[1]), args[2])
+
+    def scroll(self, number, what):
+        step = self.visible_rows if what == "pages" else 3
+        self.top += number * step
+        self.render()
+
+    def render(self):
+        """
+        Befüllt das Treeview mit den sichtbaren Zeilen und stellt die Scrollbar ein.
+        """
+        rows = self.row_count()
+        self.top = max(0, min(self.top, rows - self.visible_rows))
+        stop = min(rows, self.top + self.visible_rows)
+        if rows:
+            index = self.order[self.top:stop] if self.order is not None else np.arange(self.top, stop)
+            values = self.get_rows(index)
+        else:
+            values = []
+
+        items = self.tree.get_children()
+        if len(items) > len(values):
+            self.tree.delete(*items[len(values):])
+        for i, row in enumerate(values):
+            if i < len(items): self.tree.item(items[i], values=list(row))
+            else: self.tree.insert("", "end", values=list(row))
+
+        if rows: self.vsb.set(self.top / rows, stop / rows)
+        else: self.vsb.set(0, 1)
+        self.update_status()
+
+    def update_status(self):
+        status = f"Zeilen: {self.row_count()}"
+        if self.row_count(): status += f"  ({self.top + 1}-{min(self.row_count(), self.top + self.visible_rows)})"
+        if self.loading: status += "  lädt..."
+        self.lbl_status.config(text=status)
+
+    def sort_key(self, col):
+        """
+        Gibt die Spalte als numpy-Array zum Sortieren zurück (numerisch, wenn möglich, sonst Text).
+        Zwischengespeichert wird erst nach dem Laden, vorher kommen noch Zeilen hinzu.
+        """
+        if col in self.sort_keys: return self.sort_keys[col]
+        if len(self.chunks) == 1: column = self.chunks[0][col]
+        else: column = pd.concat([chunk[col] for chunk in self.chunks], ignore_index=True)
+        numeric = pd.to_numeric(column, errors="coerce")
+        if numeric.notna().sum() == column.notna().sum():
+            key = numeric.to_numpy(dtype=float)     # NaN landet am Ende
+        else:
+            key = column.astype(str).to_numpy()
+        if not self.loading: self.sort_keys[col] = key
+        return key
+
+    def sort_clicked(self, col):
+        """Erster Klick sortiert aufsteigend, jeder weitere Klick dreht die Richtung um."""
+        reverse = self.sort_state == (col, False)
+        self.sort_column(col, reverse)
 
-        self.df.sort_values(by=col, ascending=not reverse, inplace=True)
-        self.display_dataframe()
+    def sort_column(self, col, reverse):
+        if not self.rows: return
+        self.order = np.argsort(self.sort_key(col), kind="stable")
+        if reverse: self.order = self.order[::-1]
+        self.sort_state = (col, reverse)
+        self.render()
 
 class TextEditor(tk.Tk):
     def __init__(self, inhalt="Inhalt", txt_path=None):
@@ -683,4 +1317,5 @@ class TextEditor(tk.Tk):
 
 # === Testpoint ===
 if __name__ == "__main__":
+    import main
     main.main()